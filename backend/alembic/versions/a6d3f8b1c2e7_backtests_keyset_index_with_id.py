@@ -0,0 +1,41 @@
+"""backtests_keyset_index_with_id
+
+Revision ID: a6d3f8b1c2e7
+Revises: f3c9a1d7b2e4
+Create Date: 2026-10-16 09:21:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d3f8b1c2e7'
+down_revision: Union[str, Sequence[str], None] = 'f3c9a1d7b2e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # created_at이 같은 행(일괄 생성)도 id로 순서가 정해지도록 keyset 인덱스에 id 추가
+    op.drop_index('ix_backtests_created_at_desc', table_name='backtests')
+    op.create_index(
+        'ix_backtests_created_at_desc',
+        'backtests',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_backtests_created_at_desc', table_name='backtests')
+    op.create_index(
+        'ix_backtests_created_at_desc',
+        'backtests',
+        [sa.text('created_at DESC')],
+        unique=False,
+    )
@@ -0,0 +1,33 @@
+"""add_backtests_created_at_index
+
+Revision ID: b3f1c2d4e5a6
+Revises: 70ebbf42a214
+Create Date: 2026-10-15 10:12:41.215734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f1c2d4e5a6'
+down_revision: Union[str, Sequence[str], None] = '70ebbf42a214'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_backtests_created_at_desc',
+        'backtests',
+        [sa.text('created_at DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_backtests_created_at_desc', table_name='backtests')
@@ -0,0 +1,41 @@
+"""cover_market_data_lookup_index
+
+Revision ID: c7d2e9f1a3b4
+Revises: b3f1c2d4e5a6
+Create Date: 2026-10-15 14:03:27.518902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2e9f1a3b4'
+down_revision: Union[str, Sequence[str], None] = 'b3f1c2d4e5a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 기존 인덱스는 uq_market_data_identity의 인덱스와 키가 같아 중복 → INCLUDE 컬럼을 더해 교체
+    op.drop_index('ix_market_data_lookup', table_name='market_data')
+    op.create_index(
+        'ix_market_data_lookup',
+        'market_data',
+        ['symbol', 'market', 'timeframe', 'timestamp'],
+        unique=False,
+        postgresql_include=['fetched_at', 'open', 'high', 'low', 'close', 'volume'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_market_data_lookup', table_name='market_data')
+    op.create_index(
+        'ix_market_data_lookup',
+        'market_data',
+        ['symbol', 'market', 'timeframe', 'timestamp'],
+        unique=False,
+    )
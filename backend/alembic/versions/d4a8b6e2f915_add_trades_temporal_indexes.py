@@ -0,0 +1,39 @@
+"""add_trades_temporal_indexes
+
+Revision ID: d4a8b6e2f915
+Revises: c7d2e9f1a3b4
+Create Date: 2026-10-15 23:31:08.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8b6e2f915'
+down_revision: Union[str, Sequence[str], None] = 'c7d2e9f1a3b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_trades_backtest_fill_date',
+        'trades',
+        ['backtest_id', 'fill_date'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_trades_backtest_exit_date',
+        'trades',
+        ['backtest_id', 'exit_date'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_trades_backtest_exit_date', table_name='trades')
+    op.drop_index('ix_trades_backtest_fill_date', table_name='trades')
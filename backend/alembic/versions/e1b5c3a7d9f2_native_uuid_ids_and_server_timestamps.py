@@ -0,0 +1,72 @@
+"""native_uuid_ids_and_server_timestamps
+
+Revision ID: e1b5c3a7d9f2
+Revises: d4a8b6e2f915
+Create Date: 2026-10-15 23:44:52.731460
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1b5c3a7d9f2'
+down_revision: Union[str, Sequence[str], None] = 'd4a8b6e2f915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UTC_NOW = sa.text("TIMEZONE('utc', CURRENT_TIMESTAMP)")
+
+# UUID 문자열 PK → 네이티브 UUID (market_data는 별도 마이그레이션에서 처리)
+UUID_TABLES = [
+    'backtests',
+    'trades',
+    'strategy_templates',
+    'optimization_results',
+    'strategy_comparisons',
+]
+
+TIMESTAMP_COLUMNS = [
+    ('backtests', 'created_at'),
+    ('backtests', 'updated_at'),
+    ('trades', 'created_at'),
+    ('strategy_templates', 'created_at'),
+    ('strategy_templates', 'updated_at'),
+    ('market_data', 'fetched_at'),
+    ('optimization_results', 'created_at'),
+    ('strategy_comparisons', 'created_at'),
+]
+
+
+def _alter_ids(type_, using: str) -> None:
+    op.drop_constraint('trades_backtest_id_fkey', 'trades', type_='foreignkey')
+    for table in UUID_TABLES:
+        op.alter_column(table, 'id', type_=type_, postgresql_using=f'id::{using}')
+    op.alter_column(
+        'trades', 'backtest_id', type_=type_, postgresql_using=f'backtest_id::{using}'
+    )
+    op.create_foreign_key(
+        'trades_backtest_id_fkey',
+        'trades',
+        'backtests',
+        ['backtest_id'],
+        ['id'],
+        ondelete='CASCADE',
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _alter_ids(postgresql.UUID(as_uuid=False), 'uuid')
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(table, column, server_default=UTC_NOW)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(table, column, server_default=None)
+    _alter_ids(sa.String(), 'varchar')
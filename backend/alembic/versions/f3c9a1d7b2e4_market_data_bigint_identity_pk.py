@@ -0,0 +1,47 @@
+"""market_data_bigint_identity_pk
+
+Revision ID: f3c9a1d7b2e4
+Revises: e1b5c3a7d9f2
+Create Date: 2026-10-15 23:58:13.402987
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c9a1d7b2e4'
+down_revision: Union[str, Sequence[str], None] = 'e1b5c3a7d9f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 캐시 행은 (symbol, market, timeframe, timestamp)로 식별되므로 기존 UUID 값은 보존하지 않음
+    op.drop_constraint('market_data_pkey', 'market_data', type_='primary')
+    op.drop_column('market_data', 'id')
+    op.add_column(
+        'market_data',
+        sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+    )
+    op.create_primary_key('market_data_pkey', 'market_data', ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('market_data_pkey', 'market_data', type_='primary')
+    op.drop_column('market_data', 'id')
+    op.add_column(
+        'market_data',
+        sa.Column(
+            'id',
+            sa.String(),
+            server_default=sa.text('gen_random_uuid()::varchar'),
+            nullable=False,
+        ),
+    )
+    op.alter_column('market_data', 'id', server_default=None)
+    op.create_primary_key('market_data_pkey', 'market_data', ['id'])
@@ -1,6 +1,139 @@
+from typing import Dict, Optional, Union
+
 import numpy as np
 import pandas as pd
 
+from app.utils.njit import NUMBA_AVAILABLE, njit, readonly_array
+
+
+@njit([(readonly_array(np.bool_, 1),)], cache=True)
+def _max_streak_loop(arr: np.ndarray) -> int:
+    """bool 배열에서 True가 연속되는 최대 길이"""
+    max_streak = 0
+    current = 0
+    for i in range(arr.shape[0]):
+        if arr[i]:
+            current += 1
+            if current > max_streak:
+                max_streak = current
+        else:
+            current = 0
+    return max_streak
+
+
+def _max_streak_vectorized(arr: np.ndarray) -> int:
+    """numba 미설치 환경용: np.diff 기반 run-length 인코딩으로 최대 연속 길이 계산"""
+    padded = np.concatenate(([0], arr.astype(np.int8), [0]))
+    changes = np.flatnonzero(np.diff(padded))
+    # changes는 (run 시작, run 끝) 쌍으로 나열됨 → True 구간의 길이만 남음
+    run_lengths = changes[1::2] - changes[::2]
+    return int(run_lengths.max(initial=0))
+
+
+def _max_streak(results: np.ndarray) -> int:
+    """numba가 있으면 루프 커널, 없으면 run-length 벡터 연산으로 최대 연속 길이 계산"""
+    results = np.ascontiguousarray(results, dtype=np.bool_)
+    if NUMBA_AVAILABLE:
+        return int(_max_streak_loop(results))
+    return _max_streak_vectorized(results)
+
+
+def _profit_factor(gross_profit: float, gross_loss: float) -> float:
+    if gross_loss == 0:
+        return float("inf") if gross_profit > 0 else 0
+    return gross_profit / gross_loss
+
+
+def _std(arr: np.ndarray) -> float:
+    """표본 표준편차 (pandas.Series.std와 동일하게 ddof=1, 표본 2개 미만이면 NaN)"""
+    if arr.size < 2:
+        return np.nan
+    return float(arr.std(ddof=1))
+
+
+def _sharpe_from_returns(returns: np.ndarray, risk_free_rate: float, trading_days: int) -> float:
+    std = _std(returns)
+    if std == 0:
+        return 0
+    excess_mean = returns.mean() - risk_free_rate / trading_days
+    return np.sqrt(trading_days) * excess_mean / std
+
+
+def _sortino_from_returns(returns: np.ndarray, risk_free_rate: float, trading_days: int) -> float:
+    # 하방 편차 = sqrt(mean(min(r, 0)^2)) — 마스크 gather 없이 ufunc로 계산
+    neg = np.minimum(returns, 0.0)
+    down_std = np.sqrt(np.mean(neg * neg)) if returns.size else 0.0
+    if not down_std:
+        return 0
+    excess_mean = returns.mean() - risk_free_rate / trading_days
+    return np.sqrt(trading_days) * excess_mean / down_std
+
+
+@njit([(readonly_array(np.float64, 1),)], cache=True)
+def _metrics_kernel(eq: np.ndarray):
+    """
+    자산 곡선을 한 번만 순회하며 수익률 통계와 최대 낙폭을 함께 계산.
+    평균/분산은 Welford 방식으로 누적한다 (수익률이 일정하면 분산이 정확히 0).
+
+    Returns:
+        (n, mean, m2, down_sq, max_dd)
+        - n, mean, m2: 전체 수익률(첫 값 0 포함)의 개수/평균/편차제곱합
+        - down_sq: min(r, 0)^2의 합 (하방 편차 계산용)
+        - max_dd: 최대 낙폭 (0 이상)
+    """
+    n = eq.shape[0]
+    mean = 0.0
+    m2 = 0.0
+    down_sq = 0.0
+    max_dd = 0.0
+    peak = eq[0] if n > 0 else 0.0
+    for i in range(n):
+        r = 0.0 if i == 0 else eq[i] / eq[i - 1] - 1.0
+        delta = r - mean
+        mean += delta / (i + 1)
+        m2 += delta * (r - mean)
+        if r < 0:
+            down_sq += r * r
+        if eq[i] > peak:
+            peak = eq[i]
+        dd = (peak - eq[i]) / peak
+        if dd > max_dd:
+            max_dd = dd
+    return n, mean, m2, down_sq, max_dd
+
+
+def _ratio_metrics(equity_curve: pd.Series, risk_free_rate: float, trading_days: int):
+    """(sharpe, sortino, max_drawdown). numba가 있으면 단일 패스 커널, 없으면 NumPy 벡터 연산"""
+    if not NUMBA_AVAILABLE:
+        returns = PerformanceMetrics.calculate_returns_array(equity_curve)
+        return (
+            _sharpe_from_returns(returns, risk_free_rate, trading_days),
+            _sortino_from_returns(returns, risk_free_rate, trading_days),
+            _max_drawdown_array(np.asarray(equity_curve, dtype=np.float64)),
+        )
+
+    eq = np.ascontiguousarray(equity_curve, dtype=np.float64)
+    n, mean, m2, down_sq, max_dd = _metrics_kernel(eq)
+    excess_mean = mean - risk_free_rate / trading_days
+
+    # 표본 표준편차(ddof=1) — 표본 2개 미만이면 NaN (pandas와 동일)
+    std = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+    sharpe = 0 if std == 0 else np.sqrt(trading_days) * excess_mean / std
+
+    down_std = np.sqrt(down_sq / n) if n > 0 else 0.0
+    sortino = 0 if not down_std else np.sqrt(trading_days) * excess_mean / down_std
+
+    return sharpe, sortino, float(max_dd)
+
+
+def _max_drawdown_array(eq: np.ndarray) -> float:
+    if eq.size == 0:
+        return 0.0
+    cummax = np.maximum.accumulate(eq)
+    dd = (eq - cummax) / cummax
+    # dd는 항상 0 이하 (-0.0 방지를 위해 abs 사용)
+    return float(abs(dd.min()))
+
 
 class PerformanceMetrics:
     """성과 지표 계산 (벡터화 연산)"""
@@ -9,6 +142,37 @@ class PerformanceMetrics:
     def calculate_returns(equity_curve: pd.Series) -> pd.Series:
         return equity_curve.pct_change().fillna(0)
 
+    @staticmethod
+    def calculate_returns_array(equity_curve: pd.Series) -> np.ndarray:
+        """calculate_returns와 동일한 값을 ndarray로 반환 (pandas 중간 객체 생성 없음)"""
+        eq = np.asarray(equity_curve, dtype=np.float64)
+        returns = np.zeros(eq.shape[0])
+        if eq.shape[0] > 1:
+            returns[1:] = eq[1:] / eq[:-1] - 1
+        return returns
+
+    @staticmethod
+    def summary(
+        equity_curve: pd.Series,
+        risk_free_rate: float = 0.02,
+        trading_days: int = 252,
+    ) -> Dict[str, float]:
+        """
+        자산 곡선 기반 지표를 한 번에 계산.
+        Sharpe/Sortino/MDD는 자산 곡선 단일 패스(_metrics_kernel)로 함께 구한다.
+
+        Returns:
+            {"total_return", "annual_return", "sharpe_ratio", "sortino_ratio", "max_drawdown"}
+        """
+        sharpe, sortino, mdd = _ratio_metrics(equity_curve, risk_free_rate, trading_days)
+        return {
+            "total_return": PerformanceMetrics.total_return(equity_curve),
+            "annual_return": PerformanceMetrics.annual_return(equity_curve, trading_days),
+            "sharpe_ratio": sharpe,
+            "sortino_ratio": sortino,
+            "max_drawdown": mdd,
+        }
+
     @staticmethod
     def total_return(equity_curve: pd.Series) -> float:
         return (equity_curve.iloc[-1] / equity_curve.iloc[0]) - 1
@@ -28,11 +192,7 @@ class PerformanceMetrics:
         risk_free_rate: float = 0.02,
         trading_days: int = 252,
     ) -> float:
-        returns = PerformanceMetrics.calculate_returns(equity_curve)
-        excess = returns - risk_free_rate / trading_days
-        if returns.std() == 0:
-            return 0
-        return np.sqrt(trading_days) * excess.mean() / returns.std()
+        return _ratio_metrics(equity_curve, risk_free_rate, trading_days)[0]
 
     @staticmethod
     def sortino_ratio(
@@ -40,46 +200,74 @@ class PerformanceMetrics:
         risk_free_rate: float = 0.02,
         trading_days: int = 252,
     ) -> float:
-        returns = PerformanceMetrics.calculate_returns(equity_curve)
-        excess = returns - risk_free_rate / trading_days
-        downside = returns[returns < 0]
-        if len(downside) == 0 or downside.std() == 0:
-            return 0
-        return np.sqrt(trading_days) * excess.mean() / downside.std()
+        return _ratio_metrics(equity_curve, risk_free_rate, trading_days)[1]
 
     @staticmethod
     def max_drawdown(equity_curve: pd.Series) -> float:
-        cummax = equity_curve.expanding().max()
-        dd = (equity_curve - cummax) / cummax
-        return abs(dd.min())
+        eq = np.asarray(equity_curve, dtype=np.float64)
+        if NUMBA_AVAILABLE and eq.size > 0:
+            return float(_metrics_kernel(np.ascontiguousarray(eq))[4])
+        return _max_drawdown_array(eq)
+
+    @staticmethod
+    def trade_stats(trades: Union[pd.DataFrame, np.ndarray]) -> Dict[str, Optional[float]]:
+        """
+        거래 기반 지표를 pnl 배열 한 번 변환으로 함께 계산.
+        trades는 pnl 열이 있는 DataFrame 또는 pnl 1차원 배열 (DataFrame을 만들 필요 없음).
+
+        Returns:
+            {"win_rate", "profit_factor", "avg_win", "avg_loss",
+             "max_consecutive_wins", "max_consecutive_losses"}
+            avg_win/avg_loss는 해당 거래가 없으면 None (avg_loss는 pnl <= 0 기준)
+        """
+        if isinstance(trades, pd.DataFrame):
+            trades = trades["pnl"].to_numpy()
+        pnl = np.ascontiguousarray(trades, dtype=np.float64)
+        if pnl.size == 0:
+            return {
+                "win_rate": 0,
+                "profit_factor": 0,
+                "avg_win": None,
+                "avg_loss": None,
+                "max_consecutive_wins": 0,
+                "max_consecutive_losses": 0,
+            }
+
+        win = pnl > 0
+        n_win = int(np.count_nonzero(win))
+        n_loss = pnl.size - n_win
+        gross_profit = float(np.where(win, pnl, 0.0).sum())
+        # 손실 합계에 pnl == 0은 영향이 없으므로 ~win 마스크를 그대로 사용
+        loss_sum = float(np.where(win, 0.0, pnl).sum())
+        return {
+            "win_rate": n_win / pnl.size,
+            "profit_factor": _profit_factor(gross_profit, -loss_sum),
+            "avg_win": gross_profit / n_win if n_win else None,
+            "avg_loss": loss_sum / n_loss if n_loss else None,
+            "max_consecutive_wins": _max_streak(win),
+            "max_consecutive_losses": _max_streak(~win),
+        }
 
     @staticmethod
     def win_rate(trades: pd.DataFrame) -> float:
         if len(trades) == 0:
             return 0
-        return (trades["pnl"] > 0).sum() / len(trades)
+        pnl = trades["pnl"].to_numpy()
+        return np.count_nonzero(pnl > 0) / pnl.size
 
     @staticmethod
     def profit_factor(trades: pd.DataFrame) -> float:
         if len(trades) == 0:
             return 0
-        gross_profit = trades[trades["pnl"] > 0]["pnl"].sum()
-        gross_loss = abs(trades[trades["pnl"] < 0]["pnl"].sum())
-        if gross_loss == 0:
-            return float("inf") if gross_profit > 0 else 0
-        return gross_profit / gross_loss
+        pnl = trades["pnl"].to_numpy()
+        gross_profit = np.where(pnl > 0, pnl, 0).sum()
+        gross_loss = -np.where(pnl < 0, pnl, 0).sum()
+        return _profit_factor(gross_profit, gross_loss)
 
     @staticmethod
     def max_consecutive(trades: pd.DataFrame, win: bool = True) -> int:
         """최대 연속 승/패"""
         if len(trades) == 0:
             return 0
-        results = (trades["pnl"] > 0) if win else (trades["pnl"] <= 0)
-        max_streak = current = 0
-        for r in results:
-            if r:
-                current += 1
-                max_streak = max(max_streak, current)
-            else:
-                current = 0
-        return max_streak
+        pnl = trades["pnl"].to_numpy()
+        return _max_streak((pnl > 0) if win else (pnl <= 0))
@@ -19,8 +19,14 @@ class RiskMetrics:
     @staticmethod
     def value_at_risk(equity_curve: pd.Series, confidence: float = 0.95) -> float:
         """일별 VaR (Value at Risk). 양수로 반환 (손실 크기)."""
-        returns = PerformanceMetrics.calculate_returns(equity_curve)
-        if len(returns) == 0 or returns.std() == 0:
+        returns = PerformanceMetrics.calculate_returns_array(equity_curve)
+        if len(returns) < 2 or returns.std(ddof=1) == 0:
             return 0
-        var = np.percentile(returns, (1 - confidence) * 100)
-        return abs(var)
+        # np.percentile(linear)과 같은 값을 전체 정렬 없이 계산:
+        # 필요한 두 순서 통계량만 np.partition(introselect, O(N))으로 구해 보간
+        pos = (1 - confidence) * (len(returns) - 1)
+        lo = int(np.floor(pos))
+        hi = min(lo + 1, len(returns) - 1)
+        part = np.partition(returns, (lo, hi))
+        var = part[lo] + (part[hi] - part[lo]) * (pos - lo)
+        return float(abs(var))
@@ -1,15 +1,23 @@
 """백테스팅 API 엔드포인트"""
 
 import csv
-import io
-from typing import Optional
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
 
 from fastapi import APIRouter, Depends, Query
 from fastapi.responses import StreamingResponse
+from sqlalchemy import func, text, tuple_
 from sqlalchemy.orm import Session
 
-from app.api.schemas import BacktestCreate, BacktestDetail, BacktestSummary, JobResponse
-from app.db.models import Backtest, JobStatus
+from app.api.schemas import (
+    BacktestCreate,
+    BacktestDetail,
+    BacktestSummary,
+    JobResponse,
+    dump_orm_list,
+)
+from app.db import repository
+from app.db.models import Backtest, JobStatus, Trade
 from app.db.session import get_db
 from app.strategies import STRATEGY_REGISTRY
 from app.utils.exceptions import (
@@ -70,35 +78,70 @@ def create_backtest(body: BacktestCreate, db: Session = Depends(get_db)):
     )
 
 
+# 이 행 수 이상이면 전체 COUNT 대신 PostgreSQL 통계(reltuples) 추정치를 사용
+_APPROX_COUNT_THRESHOLD = 10_000
+
+
+def _count_backtests(db: Session) -> int:
+    """백테스트 총 개수. 대용량 PostgreSQL 테이블은 풀 스캔 없이 추정치 반환"""
+    if db.get_bind().dialect.name == "postgresql":
+        estimate = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE relname = 'backtests'")
+        ).scalar()
+        if estimate is not None and estimate >= _APPROX_COUNT_THRESHOLD:
+            return int(estimate)
+    return db.query(func.count(Backtest.id)).scalar()
+
+
 @router.get("")
 def list_backtests(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    before: Optional[datetime] = Query(
+        None, description="이 시각 이전에 생성된 항목부터 조회 (keyset)"
+    ),
+    before_id: Optional[str] = Query(
+        None, description="before와 같은 시각인 항목의 ID 기준 (keyset)"
+    ),
     db: Session = Depends(get_db),
 ):
-    """백테스팅 목록 조회"""
-    offset = (page - 1) * limit
-    total = db.query(Backtest).count()
-    backtests = (
-        db.query(Backtest)
-        .order_by(Backtest.created_at.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
-    )
-
-    items = [BacktestSummary.model_validate(b).model_dump() for b in backtests]
+    """
+    백테스팅 목록 조회 (before 지정 시 OFFSET 없이 keyset 페이지네이션).
+    created_at은 한 트랜잭션에서 일괄 생성된 행끼리 같을 수 있으므로
+    (created_at, id) 쌍을 커서로 쓴다.
+    """
+    query = db.query(Backtest).order_by(Backtest.created_at.desc(), Backtest.id.desc())
+    if before is not None:
+        if before_id is not None:
+            query = query.filter(tuple_(Backtest.created_at, Backtest.id) < (before, before_id))
+        else:
+            query = query.filter(Backtest.created_at < before)
+    else:
+        query = query.offset((page - 1) * limit)
+    backtests = query.limit(limit).all()
+
+    items = dump_orm_list(BacktestSummary, backtests)
+    next_before = next_before_id = None
+    if len(backtests) == limit:
+        next_before = backtests[-1].created_at.isoformat()
+        next_before_id = backtests[-1].id
 
     return success_response(
         data=items,
-        meta={"page": page, "limit": limit, "total": total},
+        meta={
+            "page": page,
+            "limit": limit,
+            "total": _count_backtests(db),
+            "next_before": next_before,
+            "next_before_id": next_before_id,
+        },
     )
 
 
 @router.get("/{backtest_id}")
 def get_backtest(backtest_id: str, db: Session = Depends(get_db)):
     """백테스팅 상세 조회"""
-    backtest = db.query(Backtest).filter(Backtest.id == backtest_id).first()
+    backtest = repository.get_backtest_with_trades(db, backtest_id)
     if not backtest:
         raise BacktestNotFoundError(backtest_id)
 
@@ -109,7 +152,7 @@ def get_backtest(backtest_id: str, db: Session = Depends(get_db)):
 @router.get("/{backtest_id}/status")
 def get_backtest_status(backtest_id: str, db: Session = Depends(get_db)):
     """백테스팅 작업 상태 폴링"""
-    backtest = db.query(Backtest).filter(Backtest.id == backtest_id).first()
+    backtest = repository.get_backtest(db, backtest_id)
     if not backtest:
         raise BacktestNotFoundError(backtest_id)
 
@@ -121,7 +164,7 @@ def get_backtest_status(backtest_id: str, db: Session = Depends(get_db)):
 @router.delete("/{backtest_id}")
 def delete_backtest(backtest_id: str, db: Session = Depends(get_db)):
     """백테스팅 삭제"""
-    backtest = db.query(Backtest).filter(Backtest.id == backtest_id).first()
+    backtest = repository.get_backtest(db, backtest_id)
     if not backtest:
         raise BacktestNotFoundError(backtest_id)
 
@@ -130,38 +173,37 @@ def delete_backtest(backtest_id: str, db: Session = Depends(get_db)):
     return success_response(data={"message": "삭제되었습니다"})
 
 
-@router.get("/{backtest_id}/export")
-def export_backtest_csv(backtest_id: str, db: Session = Depends(get_db)):
-    """백테스팅 결과 CSV 다운로드"""
-    backtest = db.query(Backtest).filter(Backtest.id == backtest_id).first()
-    if not backtest:
-        raise BacktestNotFoundError(backtest_id)
-
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    # 헤더
-    writer.writerow(
-        [
-            "symbol",
-            "side",
-            "quantity",
-            "signal_price",
-            "signal_date",
-            "fill_price",
-            "fill_date",
-            "commission",
-            "exit_fill_price",
-            "exit_date",
-            "exit_commission",
-            "pnl",
-            "pnl_percent",
-            "holding_days",
-        ]
-    )
-
-    for trade in backtest.trades:
-        writer.writerow(
+class _Echo:
+    """csv.writer가 쓴 행 문자열을 그대로 반환하는 writable (버퍼 없이 스트리밍용)"""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+_CSV_HEADER = [
+    "symbol",
+    "side",
+    "quantity",
+    "signal_price",
+    "signal_date",
+    "fill_price",
+    "fill_date",
+    "commission",
+    "exit_fill_price",
+    "exit_date",
+    "exit_commission",
+    "pnl",
+    "pnl_percent",
+    "holding_days",
+]
+
+
+def _iter_csv(trades: Iterable[Trade]) -> Iterator[str]:
+    """거래 내역을 CSV 한 줄씩 생성 (전체 CSV를 메모리에 만들지 않음)"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(_CSV_HEADER)
+    for trade in trades:
+        yield writer.writerow(
             [
                 trade.symbol,
                 trade.side.value if hasattr(trade.side, "value") else trade.side,
@@ -180,9 +222,24 @@ def export_backtest_csv(backtest_id: str, db: Session = Depends(get_db)):
             ]
         )
 
-    output.seek(0)
+
+@router.get("/{backtest_id}/export")
+def export_backtest_csv(backtest_id: str, db: Session = Depends(get_db)):
+    """백테스팅 결과 CSV 다운로드"""
+    exists = db.query(Backtest.id).filter(Backtest.id == backtest_id).first()
+    if not exists:
+        raise BacktestNotFoundError(backtest_id)
+
+    # 서버 사이드 커서로 500건씩 가져와 DB 쪽 메모리도 일정하게 유지
+    # (backtest_id, fill_date) 인덱스 순서대로 읽어 정렬 없이 스트리밍
+    trades = (
+        db.query(Trade)
+        .filter(Trade.backtest_id == backtest_id)
+        .order_by(Trade.backtest_id, Trade.fill_date)
+        .yield_per(500)
+    )
     return StreamingResponse(
-        iter([output.getvalue()]),
+        _iter_csv(trades),
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename=backtest_{backtest_id}.csv"},
     )
@@ -1,13 +1,21 @@
 """다중 전략 비교 API 엔드포인트"""
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+import uuid
+from collections import Counter
+from typing import Optional, Tuple
+
+from celery import group
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session, load_only
 
 from app.api.schemas import (
     CompareBacktestResult,
+    CompareBacktestSummary,
     CompareCreate,
     CompareResponse,
     JobResponse,
+    dump_orm_list,
 )
 from app.db.models import Backtest, JobStatus, StrategyComparison
 from app.db.session import get_db
@@ -23,6 +31,36 @@ from app.worker.tasks import run_backtest_task
 
 router = APIRouter(prefix="/api/backtest/compare", tags=["compare"])
 
+# CompareBacktestSummary 직렬화에 필요한 컬럼만 로드 (equity_curve_data는 요청 시에만)
+_SUMMARY_COLUMNS = (
+    Backtest.id,
+    Backtest.strategy_name,
+    Backtest.parameters,
+    Backtest.job_status,
+    Backtest.total_return,
+    Backtest.annual_return,
+    Backtest.sharpe_ratio,
+    Backtest.sortino_ratio,
+    Backtest.max_drawdown,
+    Backtest.win_rate,
+    Backtest.profit_factor,
+    Backtest.total_trades,
+)
+
+
+def _count_status(status: JobStatus):
+    """SUM(CASE WHEN job_status = :status THEN 1 ELSE 0 END) (행이 없으면 0)"""
+    return func.coalesce(func.sum(case((Backtest.job_status == status, 1), else_=0)), 0)
+
+
+def _overall_status(total: int, completed: int, failed: int) -> Tuple[JobStatus, int]:
+    """개별 백테스트 전체/완료/실패 개수로 비교 작업 전체 상태/진행률 계산"""
+    if completed == total:
+        return JobStatus.COMPLETED, 100
+    if failed > 0:
+        return JobStatus.FAILED, 0
+    return JobStatus.RUNNING, int(completed / total * 100)
+
 
 @router.post("")
 def create_comparison(body: CompareCreate, db: Session = Depends(get_db)):
@@ -41,25 +79,28 @@ def create_comparison(body: CompareCreate, db: Session = Depends(get_db)):
             f"최소 자본금: {min_capital} ({body.market.value})"
         )
 
-    # 각 전략별 Backtest 레코드 생성 + Celery 태스크 발행
-    backtest_ids = []
-    for item in body.strategies:
-        backtest = Backtest(
-            name=f"[비교] {body.name} - {item.strategy_name}",
-            description=f"전략 비교 '{body.name}'의 일부",
-            strategy_name=item.strategy_name,
-            parameters=item.parameters,
-            market=body.market,
-            symbols=body.symbols,
-            timeframe=body.timeframe,
-            start_date=body.start_date,
-            end_date=body.end_date,
-            initial_capital=body.initial_capital,
-            job_status=JobStatus.PENDING,
-        )
-        db.add(backtest)
-        db.flush()
-        backtest_ids.append(backtest.id)
+    # 각 전략별 Backtest 레코드 일괄 생성 (id를 미리 발급해 전략마다 flush하지 않음)
+    backtest_ids = [str(uuid.uuid4()) for _ in body.strategies]
+    db.bulk_insert_mappings(
+        Backtest,
+        [
+            {
+                "id": bid,
+                "name": f"[비교] {body.name} - {item.strategy_name}",
+                "description": f"전략 비교 '{body.name}'의 일부",
+                "strategy_name": item.strategy_name,
+                "parameters": item.parameters,
+                "market": body.market,
+                "symbols": body.symbols,
+                "timeframe": body.timeframe,
+                "start_date": body.start_date,
+                "end_date": body.end_date,
+                "initial_capital": body.initial_capital,
+                "job_status": JobStatus.PENDING,
+            }
+            for bid, item in zip(backtest_ids, body.strategies)
+        ],
+    )
 
     # StrategyComparison 레코드 생성
     comparison = StrategyComparison(
@@ -77,9 +118,8 @@ def create_comparison(body: CompareCreate, db: Session = Depends(get_db)):
     db.add(comparison)
     db.commit()
 
-    # Celery 태스크 발행 (커밋 후)
-    for bid in backtest_ids:
-        run_backtest_task.delay(bid)
+    # Celery 태스크 발행 (커밋 후, 하나의 group으로 묶어 한 번에 전송)
+    group([run_backtest_task.s(bid) for bid in backtest_ids]).apply_async()
 
     return success_response(
         data=JobResponse(
@@ -91,8 +131,12 @@ def create_comparison(body: CompareCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/{comparison_id}")
-def get_comparison(comparison_id: str, db: Session = Depends(get_db)):
-    """전략 비교 상세 조회"""
+def get_comparison(
+    comparison_id: str,
+    include: Optional[str] = Query(None, description="추가 포함 항목 (equity_curve)"),
+    db: Session = Depends(get_db),
+):
+    """전략 비교 상세 조회 (자산 곡선은 ?include=equity_curve 지정 시에만 포함)"""
     comparison = (
         db.query(StrategyComparison)
         .filter(StrategyComparison.id == comparison_id)
@@ -101,26 +145,26 @@ def get_comparison(comparison_id: str, db: Session = Depends(get_db)):
     if not comparison:
         raise BacktestNotFoundError(comparison_id)
 
-    # 각 백테스트 결과 수집
+    include_equity = include is not None and "equity_curve" in include.split(",")
+    columns = _SUMMARY_COLUMNS + ((Backtest.equity_curve_data,) if include_equity else ())
+    result_model = CompareBacktestResult if include_equity else CompareBacktestSummary
+
+    # 각 백테스트 결과 수집 (응답에 필요한 컬럼만, trades 관계는 lazy="raise"라 로드되지 않음)
     backtests = (
         db.query(Backtest)
+        .options(load_only(*columns))
         .filter(Backtest.id.in_(comparison.backtest_ids))
         .all()
     )
-    results = [CompareBacktestResult.model_validate(b).model_dump() for b in backtests]
+    results = dump_orm_list(result_model, backtests)
 
     # 전체 상태 계산
-    statuses = [b.job_status for b in backtests]
-    if all(s == JobStatus.COMPLETED for s in statuses):
-        overall_status = JobStatus.COMPLETED
-        overall_progress = 100
-    elif any(s == JobStatus.FAILED for s in statuses):
-        overall_status = JobStatus.FAILED
-        overall_progress = 0
-    else:
-        overall_status = JobStatus.RUNNING
-        completed = sum(1 for s in statuses if s == JobStatus.COMPLETED)
-        overall_progress = int(completed / len(statuses) * 100) if statuses else 0
+    status_counts = Counter(b.job_status for b in backtests)
+    overall_status, overall_progress = _overall_status(
+        len(backtests),
+        status_counts[JobStatus.COMPLETED],
+        status_counts[JobStatus.FAILED],
+    )
 
     # 비교 레코드 상태 업데이트
     if comparison.job_status != overall_status:
@@ -158,24 +202,17 @@ def get_comparison_status(comparison_id: str, db: Session = Depends(get_db)):
     if not comparison:
         raise BacktestNotFoundError(comparison_id)
 
-    # 각 백테스트 상태 확인
-    backtests = (
-        db.query(Backtest)
+    # 전체/완료/실패 개수를 한 번의 집계 쿼리로 계산 (행 데이터 전송 없음)
+    total, completed, failed = (
+        db.query(
+            func.count(),
+            _count_status(JobStatus.COMPLETED),
+            _count_status(JobStatus.FAILED),
+        )
         .filter(Backtest.id.in_(comparison.backtest_ids))
-        .all()
+        .one()
     )
-    statuses = [b.job_status for b in backtests]
-
-    if all(s == JobStatus.COMPLETED for s in statuses):
-        status = JobStatus.COMPLETED
-        progress = 100
-    elif any(s == JobStatus.FAILED for s in statuses):
-        status = JobStatus.FAILED
-        progress = 0
-    else:
-        status = JobStatus.RUNNING
-        completed = sum(1 for s in statuses if s == JobStatus.COMPLETED)
-        progress = int(completed / len(statuses) * 100) if statuses else 0
+    status, progress = _overall_status(total, completed, failed)
 
     if comparison.job_status != status:
         comparison.job_status = status
@@ -1,13 +1,13 @@
 """데이터 API 엔드포인트"""
 
-import asyncio
 from datetime import datetime
 
+import pandas as pd
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.data.cache import CachedDataProvider
-from app.data.kis_api import KISDataProvider
+from app.data.providers import kis_provider
 from app.db.models import MarketType, TimeframeType
 from app.db.session import get_db
 from app.utils.response import success_response
@@ -16,20 +16,15 @@ router = APIRouter(prefix="/api/data", tags=["data"])
 
 
 @router.get("/symbols")
-def search_symbols(
+async def search_symbols(
     market: MarketType = Query(...),
     query: str = Query(..., min_length=1),
     db: Session = Depends(get_db),
 ):
     """종목 검색"""
-    kis_client = KISDataProvider()
-    cached = CachedDataProvider(kis_client, db)
+    cached = CachedDataProvider(kis_provider, db)
 
-    loop = asyncio.new_event_loop()
-    try:
-        results = loop.run_until_complete(cached.search_symbols(market, query))
-    finally:
-        loop.close()
+    results = await cached.search_symbols(market, query)
 
     items = [
         {
@@ -45,7 +40,7 @@ def search_symbols(
 
 
 @router.get("/ohlcv")
-def get_ohlcv(
+async def get_ohlcv(
     symbol: str = Query(...),
     market: MarketType = Query(...),
     timeframe: TimeframeType = Query(TimeframeType.D1),
@@ -54,25 +49,15 @@ def get_ohlcv(
     db: Session = Depends(get_db),
 ):
     """과거 시세 조회"""
-    kis_client = KISDataProvider()
-    cached = CachedDataProvider(kis_client, db)
+    cached = CachedDataProvider(kis_provider, db)
 
-    loop = asyncio.new_event_loop()
-    try:
-        df = loop.run_until_complete(
-            cached.fetch_ohlcv(symbol, market, timeframe, start, end)
-        )
-    finally:
-        loop.close()
+    df = await cached.fetch_ohlcv(symbol, market, timeframe, start, end)
 
     if df.empty:
         return success_response(data=[])
 
-    records = df.to_dict(orient="records")
-    # datetime → ISO string 변환
-    for r in records:
-        for key in ("timestamp",):
-            if key in r and hasattr(r[key], "isoformat"):
-                r[key] = r[key].isoformat()
+    # datetime → ISO string 변환 (행 단위 루프 대신 컬럼 단위 벡터 연산)
+    if "timestamp" in df.columns:
+        df["timestamp"] = pd.to_datetime(df["timestamp"]).dt.strftime("%Y-%m-%dT%H:%M:%S")
 
-    return success_response(data=records)
+    return success_response(data=df.to_dict(orient="records"))
@@ -1,8 +1,9 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Type
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 from app.db.models import JobStatus, MarketType, TimeframeType
 
@@ -165,8 +166,8 @@ class CompareCreate(BaseModel):
     initial_capital: Decimal = Field(..., gt=0)
 
 
-class CompareBacktestResult(BaseModel):
-    """비교 내 개별 백테스트 요약"""
+class CompareBacktestSummary(BaseModel):
+    """비교 내 개별 백테스트 요약 (자산 곡선 제외)"""
 
     id: str
     strategy_name: str
@@ -180,11 +181,16 @@ class CompareBacktestResult(BaseModel):
     win_rate: Optional[Decimal] = None
     profit_factor: Optional[Decimal] = None
     total_trades: int = 0
-    equity_curve_data: Optional[List[Dict[str, Any]]] = None
 
     model_config = {"from_attributes": True}
 
 
+class CompareBacktestResult(CompareBacktestSummary):
+    """비교 내 개별 백테스트 요약 + 자산 곡선"""
+
+    equity_curve_data: Optional[List[Dict[str, Any]]] = None
+
+
 class CompareResponse(BaseModel):
     id: str
     name: str
@@ -225,3 +231,20 @@ class StrategyTemplateResponse(BaseModel):
     created_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+# ── 목록 직렬화 ──
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def dump_orm_list(model: Type[BaseModel], rows: Iterable[Any]) -> List[Dict[str, Any]]:
+    """
+    ORM 객체 목록을 스키마 dict 목록으로 변환.
+    행마다 model_validate().model_dump()를 호출하지 않고 리스트 단위로 한 번에 검증/직렬화한다.
+    """
+    adapter = _list_adapter(model)
+    return adapter.dump_python(adapter.validate_python(rows, from_attributes=True))
@@ -3,10 +3,14 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from app.api.schemas import StrategyTemplateCreate, StrategyTemplateResponse
+from app.api.schemas import (
+    StrategyTemplateCreate,
+    StrategyTemplateResponse,
+    dump_orm_list,
+)
 from app.db.models import StrategyTemplate
 from app.db.session import get_db
-from app.strategies import STRATEGY_REGISTRY
+from app.strategies import STRATEGY_LIST
 from app.utils.response import success_response
 
 router = APIRouter(prefix="/api/strategies", tags=["strategies"])
@@ -15,18 +19,14 @@ router = APIRouter(prefix="/api/strategies", tags=["strategies"])
 @router.get("")
 def list_strategies():
     """사용 가능한 전략 목록"""
-    strategies = [
-        {"name": name, "class": cls.__name__}
-        for name, cls in STRATEGY_REGISTRY.items()
-    ]
-    return success_response(data=strategies)
+    return success_response(data=STRATEGY_LIST)
 
 
 @router.get("/templates")
 def list_templates(db: Session = Depends(get_db)):
     """저장된 전략 템플릿 목록"""
     templates = db.query(StrategyTemplate).all()
-    items = [StrategyTemplateResponse.model_validate(t).model_dump() for t in templates]
+    items = dump_orm_list(StrategyTemplateResponse, templates)
     return success_response(data=items)
 
 
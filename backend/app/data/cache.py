@@ -1,30 +1,111 @@
 """데이터 캐싱 레이어 (PostgreSQL MarketData 테이블 기반)"""
 
-import uuid
+import asyncio
+import io
 from datetime import datetime, timedelta
-from typing import List
+from typing import Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
-from sqlalchemy import and_
+from sqlalchemy import and_, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from app.config import settings
+from app.data.kis_api import KR_PRICE_DTYPE, US_PRICE_DTYPE
 from app.data.provider import DataProvider, SymbolInfo
 from app.db.models import MarketData, MarketType, TimeframeType
 from app.utils.logger import logger
 
+# upsert 1회 실행당 최대 행 수 (11컬럼 × 1000행 = 11000 파라미터)
+UPSERT_CHUNK_SIZE = 1000
+
+# 캐시 조회 결과 컬럼 타입 (가격은 KISDataProvider와 같은 시장별 dtype)
+_CACHED_DTYPES = {
+    market: {
+        "open": price_dtype,
+        "high": price_dtype,
+        "low": price_dtype,
+        "close": price_dtype,
+        "volume": np.int64,
+    }
+    for market, price_dtype in (
+        (MarketType.KR, KR_PRICE_DTYPE),
+        (MarketType.US, US_PRICE_DTYPE),
+    )
+}
+
+# 이 일수보다 과거의 봉은 확정된 값으로 보고 TTL 없이 캐시를 신뢰
+HISTORICAL_GRACE_DAYS = 2
+
+# bulk_backfill COPY 대상 컬럼 (market_data 컬럼 순서와 무관하게 명시)
+_COPY_COLUMNS = (
+    "symbol",
+    "market",
+    "timeframe",
+    "timestamp",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "fetched_at",
+)
+
+# ON CONFLICT를 지원하는 dialect별 insert (uq_market_data_identity 기준)
+_DIALECT_INSERT = {
+    "postgresql": pg_insert,
+    "sqlite": sqlite_insert,
+}
+
 
 class CachedDataProvider(DataProvider):
     """DB 캐시를 앞에 두고, 미스 시 실제 프로바이더를 호출하는 래퍼"""
 
+    # 타임프레임별 캐시 TTL (초)
+    _TTL = {
+        TimeframeType.D1: settings.cache_ttl_daily,
+        TimeframeType.H1: settings.cache_ttl_hourly,
+    }
+
+    # 타임프레임별 봉 간격
+    _BAR_INTERVAL = {
+        TimeframeType.D1: timedelta(days=1),
+        TimeframeType.H1: timedelta(hours=1),
+    }
+
     def __init__(self, provider: DataProvider, db: Session):
         self._provider = provider
         self._db = db
+        # Session은 스레드 안전하지 않으므로 동시 조회(fetch_many) 시 DB 작업을 직렬화
+        self._db_lock = asyncio.Lock()
+
+    @staticmethod
+    def _historical_edge() -> datetime:
+        """이 시각 이전의 봉은 더 이상 바뀌지 않는 과거 데이터로 취급"""
+        edge = datetime.utcnow() - timedelta(days=HISTORICAL_GRACE_DAYS)
+        return edge.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def _freshness_bounds(self, timeframe: TimeframeType) -> Tuple[datetime, datetime]:
+        """(TTL cutoff, 과거 구간 경계)"""
+        cutoff = datetime.utcnow() - timedelta(seconds=self._TTL[timeframe])
+        return cutoff, self._historical_edge()
 
-    def _get_ttl(self, timeframe: TimeframeType) -> int:
-        if timeframe == TimeframeType.D1:
-            return settings.cache_ttl_daily
-        return settings.cache_ttl_hourly
+    @classmethod
+    def _gap_start(
+        cls, timeframe: TimeframeType, last_cached: datetime, edge: datetime
+    ) -> datetime:
+        """
+        부분 히트 시 API 보충 시작 시각.
+        캐시가 edge까지 닿지 않았으면 마지막 캐시 봉 다음부터 받아 중간 공백을 남기지 않는다.
+        """
+        return min(edge, pd.Timestamp(last_cached).to_pydatetime() + cls._BAR_INTERVAL[timeframe])
+
+    async def _run_db(self, func, *args):
+        # 동기 Session 호출은 워커 스레드에서 실행해 이벤트 루프(동시 HTTP 요청 등)를 막지 않음
+        async with self._db_lock:
+            return await asyncio.to_thread(func, *args)
 
     async def fetch_ohlcv(
         self,
@@ -34,40 +115,147 @@ class CachedDataProvider(DataProvider):
         start: datetime,
         end: datetime,
     ) -> pd.DataFrame:
-        ttl = self._get_ttl(timeframe)
-        cutoff = datetime.utcnow() - timedelta(seconds=ttl)
+        cutoff, edge = self._freshness_bounds(timeframe)
+        cached = await self._run_db(
+            self._load_cached, [symbol], market, timeframe, start, end, cutoff, edge
+        )
+        return await self._complete(symbol, market, timeframe, start, end, cached, edge)
 
-        # 캐시에서 유효한 데이터 조회
-        cached = (
-            self._db.query(MarketData)
-            .filter(
-                and_(
-                    MarketData.symbol == symbol,
-                    MarketData.market == market,
-                    MarketData.timeframe == timeframe,
-                    MarketData.timestamp >= start,
-                    MarketData.timestamp <= end,
-                    MarketData.fetched_at >= cutoff,
-                )
-            )
-            .order_by(MarketData.timestamp)
-            .all()
+    async def fetch_many(
+        self,
+        symbols: List[str],
+        market: MarketType,
+        timeframe: TimeframeType,
+        start: datetime,
+        end: datetime,
+        max_concurrency: int = 10,
+    ) -> Dict[str, pd.DataFrame]:
+        """캐시는 한 번의 쿼리로 전 종목을 조회하고, 미스 종목만 동시에 API 호출"""
+        if len(symbols) <= 1:
+            return await super().fetch_many(symbols, market, timeframe, start, end)
+        cutoff, edge = self._freshness_bounds(timeframe)
+        cached = await self._run_db(
+            self._load_cached, symbols, market, timeframe, start, end, cutoff, edge
         )
+        by_symbol = {
+            sym: group.drop(columns="symbol").reset_index(drop=True)
+            for sym, group in cached.groupby("symbol", sort=False)
+        }
+        empty = cached.drop(columns="symbol").iloc[:0]
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def one(symbol: str):
+            async with semaphore:
+                df = await self._complete(
+                    symbol,
+                    market,
+                    timeframe,
+                    start,
+                    end,
+                    by_symbol.get(symbol, empty),
+                    edge,
+                )
+                return symbol, df
+
+        return dict(await asyncio.gather(*(one(s) for s in symbols)))
 
-        if cached:
+    async def _complete(
+        self,
+        symbol: str,
+        market: MarketType,
+        timeframe: TimeframeType,
+        start: datetime,
+        end: datetime,
+        cached: pd.DataFrame,
+        edge: datetime,
+    ) -> pd.DataFrame:
+        """캐시 조회 결과로 히트 여부를 판단하고, 부족한 구간만 API로 보충"""
+        # 전체가 과거 구간이거나 최근 구간에 유효한 행이 있으면 캐시 히트
+        if not cached.empty and (end < edge or cached["timestamp"].iloc[-1] >= edge):
             logger.info(
                 "캐시 히트: %s %s %s (%d건)", symbol, market.value, timeframe.value, len(cached)
             )
-            return self._rows_to_dataframe(cached)
+            return cached
+
+        if cached.empty:
+            # 캐시 미스 → 실제 프로바이더 호출
+            logger.info("캐시 미스: %s %s %s → API 호출", symbol, market.value, timeframe.value)
+            fetch_start = start
+        else:
+            # 과거 구간은 캐시 사용, 마지막 캐시 봉 이후만 API로 보충
+            fetch_start = self._gap_start(timeframe, cached["timestamp"].iloc[-1], edge)
+            logger.info(
+                "부분 캐시 히트: %s %s %s (%d건) → %s 이후만 API 호출",
+                symbol,
+                market.value,
+                timeframe.value,
+                len(cached),
+                fetch_start.date(),
+            )
 
-        # 캐시 미스 → 실제 프로바이더 호출
-        logger.info("캐시 미스: %s %s %s → API 호출", symbol, market.value, timeframe.value)
-        df = await self._provider.fetch_ohlcv(symbol, market, timeframe, start, end)
+        df = await self._provider.fetch_ohlcv(symbol, market, timeframe, fetch_start, end)
 
         if not df.empty:
-            self._upsert_cache(df, symbol, market, timeframe)
+            await self._run_db(self._upsert_cache, df, symbol, market, timeframe)
+
+        if cached.empty:
+            return df
+        if df.empty:
+            return cached
+        return pd.concat([cached, df], ignore_index=True)
+
+    def _load_cached(
+        self,
+        symbols: List[str],
+        market: MarketType,
+        timeframe: TimeframeType,
+        start: datetime,
+        end: datetime,
+        cutoff: datetime,
+        edge: datetime,
+    ) -> pd.DataFrame:
+        """
+        캐시에서 유효한 데이터 조회 (ORM 객체 없이 컬럼 배열로 바로 로드).
+        edge 이전의 과거 구간은 fetched_at과 무관하게 신뢰하고, 최근 구간만 TTL을 적용한다.
+        여러 종목을 조회하면 symbol 컬럼이 추가된다.
+        """
+        columns = [
+            MarketData.timestamp,
+            MarketData.open,
+            MarketData.high,
+            MarketData.low,
+            MarketData.close,
+            MarketData.volume,
+        ]
+        if len(symbols) == 1:
+            symbol_filter = MarketData.symbol == symbols[0]
+            order_by = [MarketData.timestamp]
+        else:
+            columns.insert(0, MarketData.symbol)
+            symbol_filter = MarketData.symbol.in_(symbols)
+            order_by = [MarketData.symbol, MarketData.timestamp]
 
-        return df
+        query = (
+            self._db.query(*columns)
+            .filter(
+                and_(
+                    symbol_filter,
+                    MarketData.market == market,
+                    MarketData.timeframe == timeframe,
+                    MarketData.timestamp >= start,
+                    MarketData.timestamp <= end,
+                    or_(MarketData.timestamp < edge, MarketData.fetched_at >= cutoff),
+                )
+            )
+            .order_by(*order_by)
+        )
+        cached = pd.read_sql(
+            query.statement,
+            self._db.connection(),
+            parse_dates=["timestamp"],
+            coerce_float=True,
+        )
+        return cached.astype(_CACHED_DTYPES[market])
 
     def _upsert_cache(
         self,
@@ -76,62 +264,132 @@ class CachedDataProvider(DataProvider):
         market: MarketType,
         timeframe: TimeframeType,
     ) -> None:
-        """DataFrame을 MarketData 테이블에 upsert"""
+        """DataFrame을 MarketData 테이블에 upsert (INSERT … ON CONFLICT DO UPDATE)"""
         now = datetime.utcnow()
+        ohlcv = df[["timestamp", "open", "high", "low", "close", "volume"]]
+        # itertuples(name=None): 행마다 Series를 만들지 않고 Python 스칼라 튜플로 순회
+        records = [
+            {
+                "symbol": symbol,
+                "market": market,
+                "timeframe": timeframe,
+                "timestamp": pd.Timestamp(ts).to_pydatetime(),
+                "open": o,
+                "high": h,
+                "low": lo,
+                "close": c,
+                "volume": int(v),
+                "fetched_at": now,
+            }
+            for ts, o, h, lo, c, v in ohlcv.itertuples(index=False, name=None)
+        ]
 
-        for _, row in df.iterrows():
-            existing = (
-                self._db.query(MarketData)
-                .filter(
-                    and_(
-                        MarketData.symbol == symbol,
-                        MarketData.market == market,
-                        MarketData.timeframe == timeframe,
-                        MarketData.timestamp == row["timestamp"],
-                    )
-                )
-                .first()
+        insert = _DIALECT_INSERT[self._db.get_bind().dialect.name]
+        # 바인드 파라미터 한도(PostgreSQL 65535 등)를 넘지 않도록 청크 단위로 실행
+        for i in range(0, len(records), UPSERT_CHUNK_SIZE):
+            stmt = insert(MarketData).values(records[i : i + UPSERT_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["symbol", "market", "timeframe", "timestamp"],
+                set_={
+                    "open": stmt.excluded.open,
+                    "high": stmt.excluded.high,
+                    "low": stmt.excluded.low,
+                    "close": stmt.excluded.close,
+                    "volume": stmt.excluded.volume,
+                    "fetched_at": stmt.excluded.fetched_at,
+                },
             )
-
-            if existing:
-                existing.open = row["open"]
-                existing.high = row["high"]
-                existing.low = row["low"]
-                existing.close = row["close"]
-                existing.volume = int(row["volume"])
-                existing.fetched_at = now
-            else:
-                record = MarketData(
-                    id=str(uuid.uuid4()),
-                    symbol=symbol,
-                    market=market,
-                    timeframe=timeframe,
-                    timestamp=row["timestamp"],
-                    open=row["open"],
-                    high=row["high"],
-                    low=row["low"],
-                    close=row["close"],
-                    volume=int(row["volume"]),
-                    fetched_at=now,
-                )
-                self._db.add(record)
+            self._db.execute(stmt)
 
         self._db.commit()
         logger.info("캐시 저장 완료: %s %d건", symbol, len(df))
 
-    def _rows_to_dataframe(self, rows: List[MarketData]) -> pd.DataFrame:
-        data = [
+    async def bulk_backfill(
+        self,
+        df: pd.DataFrame,
+        symbol: str,
+        market: MarketType,
+        timeframe: TimeframeType,
+    ) -> int:
+        """
+        대량 초기 적재용 저장 경로.
+        PostgreSQL에서는 COPY로 임시 테이블에 적재한 뒤 INSERT … SELECT … ON CONFLICT 한 번으로
+        병합하고, 그 외 dialect는 _upsert_cache로 처리한다.
+
+        Returns:
+            저장한 행 수
+        """
+        if df.empty:
+            return 0
+        if self._db.get_bind().dialect.name == "postgresql":
+            await self._run_db(self._copy_upsert, df, symbol, market, timeframe)
+        else:
+            await self._run_db(self._upsert_cache, df, symbol, market, timeframe)
+        return len(df)
+
+    @staticmethod
+    def _copy_buffer(
+        df: pd.DataFrame,
+        symbol: str,
+        market: MarketType,
+        timeframe: TimeframeType,
+        fetched_at: datetime,
+    ) -> io.StringIO:
+        """_COPY_COLUMNS 순서의 CSV 버퍼 (Enum 컬럼은 SAEnum 저장 형식인 멤버 이름)"""
+        staging = pd.DataFrame(
             {
-                "timestamp": r.timestamp,
-                "open": float(r.open),
-                "high": float(r.high),
-                "low": float(r.low),
-                "close": float(r.close),
-                "volume": int(r.volume),
-            }
-            for r in rows
-        ]
-        return pd.DataFrame(data)
+                "symbol": symbol,
+                "market": market.name,
+                "timeframe": timeframe.name,
+                "timestamp": pd.to_datetime(df["timestamp"]).to_numpy(),
+                "open": df["open"].to_numpy(),
+                "high": df["high"].to_numpy(),
+                "low": df["low"].to_numpy(),
+                "close": df["close"].to_numpy(),
+                "volume": df["volume"].to_numpy(dtype=np.int64),
+                "fetched_at": fetched_at,
+            },
+            columns=list(_COPY_COLUMNS),
+        )
+        buf = io.StringIO()
+        staging.to_csv(buf, index=False, header=False, date_format="%Y-%m-%d %H:%M:%S.%f")
+        buf.seek(0)
+        return buf
+
+    def _copy_upsert(
+        self,
+        df: pd.DataFrame,
+        symbol: str,
+        market: MarketType,
+        timeframe: TimeframeType,
+    ) -> None:
+        """psycopg2 COPY → 임시 테이블 → ON CONFLICT 병합 (PostgreSQL 전용)"""
+        buf = self._copy_buffer(df, symbol, market, timeframe, datetime.utcnow())
+        columns = ", ".join(_COPY_COLUMNS)
+        updates = ", ".join(
+            f"{col} = EXCLUDED.{col}"
+            for col in ("open", "high", "low", "close", "volume", "fetched_at")
+        )
+        cursor = self._db.connection().connection.cursor()
+        try:
+            # id(IDENTITY)는 본 테이블에서 채번하므로 적재 컬럼만 가진 임시 테이블 생성
+            cursor.execute(
+                "CREATE TEMP TABLE market_data_staging ON COMMIT DROP AS "
+                f"SELECT {columns} FROM market_data WITH NO DATA"
+            )
+            cursor.copy_expert(
+                f"COPY market_data_staging ({columns}) FROM STDIN WITH (FORMAT csv)", buf
+            )
+            cursor.execute(
+                f"INSERT INTO market_data ({columns}) "
+                f"SELECT {columns} FROM market_data_staging "
+                "ON CONFLICT (symbol, market, timeframe, timestamp) "
+                f"DO UPDATE SET {updates}"
+            )
+        finally:
+            cursor.close()
+        self._db.commit()
+        logger.info("캐시 COPY 적재 완료: %s %d건", symbol, len(df))
 
     async def search_symbols(
         self,
@@ -4,17 +4,19 @@ import asyncio
 import json
 import os
 from datetime import datetime, timedelta
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
+import numpy as np
 import pandas as pd
+from redis.asyncio import Redis
 
 from app.config import settings
 from app.data.provider import DataProvider, SymbolInfo
 from app.db.models import MarketType, TimeframeType
 from app.utils.exceptions import KISAPIUnavailableError, KISRateLimitError
 from app.utils.logger import logger
+from app.utils.rate_limiter import AsyncRateLimiter
 
 # KIS API 기본 URL
 KIS_BASE_URL = "https://openapi.koreainvestment.com:9443"
@@ -46,10 +48,68 @@ US_EXCHANGE_CODE = "NAS"  # 기본값: 나스닥 (TODO: 종목별 거래소 자
 # Rate Limit
 MAX_REQUESTS_PER_SECOND = 20
 MAX_RETRIES = 3
+# 일봉 동시 조회 구간 길이 (100 달력일 < 응답 최대 100건이므로 구간당 요청 1회)
+DAILY_WINDOW_DAYS = 100
 BACKOFF_BASE = 1  # seconds
 
-# 토큰 캐시 파일 경로
-TOKEN_CACHE_FILE = Path(__file__).parent.parent.parent / ".kis_token_cache.json"
+# HTTP 커넥션 풀 (동시 구간 조회 시 연결 재사용)
+HTTP_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=100,
+    keepalive_expiry=300.0,
+)
+
+# 토큰 공유 캐시 (Redis) — 프로세스 재시작/다중 워커 간 토큰 재사용
+TOKEN_CACHE_KEY = "kis_token"
+TOKEN_EXPIRY_MARGIN = timedelta(minutes=5)
+
+
+_OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+# 원화 가격은 정수이고 2^24 미만이므로 float32로 손실 없이 표현 → 메모리 절반
+# 달러 가격은 소수점 이하 자릿수가 있어 float64 유지
+KR_PRICE_DTYPE = np.float32
+US_PRICE_DTYPE = np.float64
+
+
+def _new_columns() -> Dict[str, List[Any]]:
+    """API 응답 원본 값을 컬럼별로 모으는 버퍼 (변환은 _to_dataframe에서 일괄 처리)"""
+    return {col: [] for col in _OHLCV_COLUMNS}
+
+
+def _append_row(
+    cols: Dict[str, List[Any]], ts: str, open_, high, low, close, volume
+) -> None:
+    cols["timestamp"].append(ts)
+    cols["open"].append(open_)
+    cols["high"].append(high)
+    cols["low"].append(low)
+    cols["close"].append(close)
+    cols["volume"].append(volume)
+
+
+def _date_windows(start: datetime, end: datetime) -> List[Tuple[str, str]]:
+    """
+    [start, end]를 DAILY_WINDOW_DAYS일 단위의 겹치지 않는 구간으로 분할.
+    각 구간은 ("YYYYMMDD", "YYYYMMDD") 형태이며, 한 번의 요청(최대 100건)으로 모두 조회된다.
+    """
+    windows = []
+    # 루프 불변값은 미리 계산 (구간 끝은 시작 + step - 1일)
+    step = timedelta(days=DAILY_WINDOW_DAYS)
+    span = step - timedelta(days=1)
+    last_day = end.date()
+    end_ymd = end.strftime("%Y%m%d")
+    w_start = start
+    while w_start.date() <= last_day:
+        w_end = w_start + span
+        w_end_ymd = end_ymd if w_end >= end else w_end.strftime("%Y%m%d")
+        windows.append((w_start.strftime("%Y%m%d"), w_end_ymd))
+        w_start += step
+    return windows
+
+
+def _empty_ohlcv() -> pd.DataFrame:
+    return pd.DataFrame(columns=_OHLCV_COLUMNS)
 
 
 class KISDataProvider(DataProvider):
@@ -60,92 +120,131 @@ class KISDataProvider(DataProvider):
         app_key: Optional[str] = None,
         app_secret: Optional[str] = None,
         base_url: str = KIS_BASE_URL,
+        token_cache_url: Optional[str] = None,
+        use_token_cache: bool = True,
     ):
         self._app_key = app_key or settings.kis_app_key
         self._app_secret = app_secret or settings.kis_app_secret
         self._base_url = base_url
         self._access_token: Optional[str] = None
         self._token_expires_at: Optional[datetime] = None
-        self._semaphore = asyncio.Semaphore(MAX_REQUESTS_PER_SECOND)
+        # 동시 첫 호출 시 토큰 발급 요청이 한 번만 나가도록 직렬화
+        self._token_lock = asyncio.Lock()
+        self._token_cache_url = token_cache_url or settings.redis_url
+        self._use_token_cache = use_token_cache
+        self._redis: Optional[Redis] = None
+        self._rate_limiter = AsyncRateLimiter(MAX_REQUESTS_PER_SECOND, 1.0)
         self._client: Optional[httpx.AsyncClient] = None
 
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
+            # HTTP/2로 동시 요청을 하나의 TLS 연결에 다중화하고, keep-alive 연결을 오래 유지
             self._client = httpx.AsyncClient(
                 base_url=self._base_url,
                 timeout=30.0,
+                http2=True,
+                limits=HTTP_LIMITS,
             )
         return self._client
 
     async def close(self) -> None:
         if self._client and not self._client.is_closed:
             await self._client.aclose()
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
 
     # ── 토큰 관리 ──
 
-    def _load_cached_token(self) -> bool:
-        """파일에 캐싱된 토큰을 로드한다. 유효하면 True."""
+    def _get_redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = Redis.from_url(
+                self._token_cache_url,
+                socket_timeout=1.0,
+                socket_connect_timeout=1.0,
+            )
+        return self._redis
+
+    def _token_valid(self) -> bool:
+        return bool(
+            self._access_token
+            and self._token_expires_at
+            and datetime.now() < self._token_expires_at - TOKEN_EXPIRY_MARGIN
+        )
+
+    async def _load_cached_token(self) -> bool:
+        """Redis에 캐싱된 토큰을 로드한다. 유효하면 True."""
+        if not self._use_token_cache:
+            return False
         try:
-            if not TOKEN_CACHE_FILE.exists():
+            raw = await self._get_redis().get(TOKEN_CACHE_KEY)
+            if raw is None:
                 return False
-            cache = json.loads(TOKEN_CACHE_FILE.read_text())
-            expires_at = datetime.fromisoformat(cache["expires_at"])
-            if datetime.now() < expires_at - timedelta(minutes=5):
-                self._access_token = cache["access_token"]
-                self._token_expires_at = expires_at
-                logger.info("캐시된 KIS 토큰 로드 (만료: %s)", expires_at)
-                return True
-        except Exception:
-            pass
-        return False
-
-    def _save_token_cache(self) -> None:
-        """토큰을 파일에 캐싱한다."""
+            cache = json.loads(raw)
+            self._access_token = cache["access_token"]
+            self._token_expires_at = datetime.fromisoformat(cache["expires_at"])
+        except Exception as e:
+            logger.debug("토큰 캐시 조회 실패: %s", e)
+            return False
+        if not self._token_valid():
+            return False
+        logger.info("캐시된 KIS 토큰 로드 (만료: %s)", self._token_expires_at)
+        return True
+
+    async def _save_token_cache(self, expires_in: int) -> None:
+        """토큰을 만료 5분 전까지 유지되도록 Redis에 캐싱한다."""
+        if not self._use_token_cache:
+            return
+        ttl = expires_in - int(TOKEN_EXPIRY_MARGIN.total_seconds())
+        if ttl <= 0:
+            return
+        cache = {
+            "access_token": self._access_token,
+            "expires_at": self._token_expires_at.isoformat(),
+        }
         try:
-            cache = {
-                "access_token": self._access_token,
-                "expires_at": self._token_expires_at.isoformat(),
-            }
-            TOKEN_CACHE_FILE.write_text(json.dumps(cache))
-            # 파일 권한을 owner만 읽기/쓰기로 제한
-            TOKEN_CACHE_FILE.chmod(0o600)
+            await self._get_redis().setex(TOKEN_CACHE_KEY, ttl, json.dumps(cache))
         except Exception as e:
             logger.warning("토큰 캐시 저장 실패: %s", e)
 
     async def _ensure_token(self) -> str:
         """액세스 토큰을 발급하거나, 유효하면 기존 토큰을 반환한다."""
         # 1) 메모리 캐시 확인
-        if self._access_token and self._token_expires_at:
-            if datetime.now() < self._token_expires_at - timedelta(minutes=5):
+        if self._token_valid():
+            return self._access_token
+
+        async with self._token_lock:
+            # 락 대기 중 다른 코루틴이 이미 발급했을 수 있음
+            if self._token_valid():
                 return self._access_token
 
-        # 2) 파일 캐시 확인
-        if self._load_cached_token():
-            return self._access_token
+            # 2) Redis 캐시 확인
+            if await self._load_cached_token():
+                return self._access_token
 
-        # 3) 새로 발급
-        client = await self._get_client()
-        body = {
-            "grant_type": "client_credentials",
-            "appkey": self._app_key,
-            "appsecret": self._app_secret,
-        }
+            # 3) 새로 발급
+            client = await self._get_client()
+            body = {
+                "grant_type": "client_credentials",
+                "appkey": self._app_key,
+                "appsecret": self._app_secret,
+            }
 
-        resp = await client.post(TOKEN_URL, json=body)
-        if resp.status_code != 200:
-            raise KISAPIUnavailableError(f"토큰 발급 실패: {resp.status_code} {resp.text}")
+            resp = await client.post(TOKEN_URL, json=body)
+            if resp.status_code != 200:
+                raise KISAPIUnavailableError(f"토큰 발급 실패: {resp.status_code} {resp.text}")
 
-        data = resp.json()
-        self._access_token = data["access_token"]
-        # KIS 토큰은 보통 24시간 유효
-        expires_in = int(data.get("expires_in", 86400))
-        self._token_expires_at = datetime.now() + timedelta(seconds=expires_in)
+            data = resp.json()
+            self._access_token = data["access_token"]
+            # KIS 토큰은 보통 24시간 유효
+            expires_in = int(data.get("expires_in", 86400))
+            self._token_expires_at = datetime.now() + timedelta(seconds=expires_in)
 
-        # 파일에 캐싱
-        self._save_token_cache()
+            # Redis에 캐싱
+            await self._save_token_cache(expires_in)
 
-        logger.info("KIS API 토큰 신규 발급 (만료: %s)", self._token_expires_at)
-        return self._access_token
+            logger.info("KIS API 토큰 신규 발급 (만료: %s)", self._token_expires_at)
+            return self._access_token
 
     def _common_headers(self, token: str, tr_id: str) -> Dict[str, str]:
         return {
@@ -165,14 +264,14 @@ class KISDataProvider(DataProvider):
         tr_id: str,
         params: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
-        """Rate Limit 세마포어 + exponential backoff 재시도"""
+        """초당 요청 수 제한 + exponential backoff 재시도"""
         token = await self._ensure_token()
         headers = self._common_headers(token, tr_id)
         client = await self._get_client()
 
         last_error: Optional[Exception] = None
         for attempt in range(MAX_RETRIES):
-            async with self._semaphore:
+            async with self._rate_limiter:
                 try:
                     resp = await client.request(method, url, headers=headers, params=params)
 
@@ -255,63 +354,54 @@ class KISDataProvider(DataProvider):
     async def _fetch_daily(
         self, symbol: str, start: datetime, end: datetime
     ) -> pd.DataFrame:
-        """국내 주식 일봉 조회"""
-        all_rows: List[Dict[str, Any]] = []
-        current_end = end
-
-        while current_end >= start:
-            params = {
-                "FID_COND_MRKT_DIV_CODE": "J",  # 주식
-                "FID_INPUT_ISCD": symbol,
-                "FID_INPUT_DATE_1": start.strftime("%Y%m%d"),
-                "FID_INPUT_DATE_2": current_end.strftime("%Y%m%d"),
-                "FID_PERIOD_DIV_CODE": "D",  # 일봉
-                "FID_ORG_ADJ_PRC": "0",  # 수정주가
-            }
-
-            data = await self._request_with_retry(
-                "GET", KR_DAILY_PRICE_URL, TR_ID_KR_DAILY, params
+        """국내 주식 일봉 조회 (기간을 구간으로 나눠 동시 요청)"""
+        windows = _date_windows(start, end)
+        responses = await asyncio.gather(
+            *(
+                self._request_with_retry(
+                    "GET",
+                    KR_DAILY_PRICE_URL,
+                    TR_ID_KR_DAILY,
+                    {
+                        "FID_COND_MRKT_DIV_CODE": "J",  # 주식
+                        "FID_INPUT_ISCD": symbol,
+                        "FID_INPUT_DATE_1": w_start,
+                        "FID_INPUT_DATE_2": w_end,
+                        "FID_PERIOD_DIV_CODE": "D",  # 일봉
+                        "FID_ORG_ADJ_PRC": "0",  # 수정주가
+                    },
+                )
+                for w_start, w_end in windows
             )
+        )
 
-            output2 = data.get("output2", [])
-            if not output2:
-                break
-
-            for item in output2:
+        cols = _new_columns()
+        for (w_start, w_end), data in zip(windows, responses):
+            # 응답은 최신순 → 뒤집어 담으면 구간 순서와 합쳐 전체가 오름차순 (정렬 생략)
+            for item in reversed(data.get("output2", [])):
                 stck_bsop_date = item.get("stck_bsop_date", "")
-                if not stck_bsop_date:
-                    continue
-                row_date = datetime.strptime(stck_bsop_date, "%Y%m%d")
-                if row_date < start:
+                # 구간 밖 날짜는 인접 구간 응답과 중복되므로 제외
+                if not stck_bsop_date or not w_start <= stck_bsop_date <= w_end:
                     continue
-
-                all_rows.append(
-                    {
-                        "timestamp": row_date,
-                        "open": float(item["stck_oprc"]),
-                        "high": float(item["stck_hgpr"]),
-                        "low": float(item["stck_lwpr"]),
-                        "close": float(item["stck_clpr"]),
-                        "volume": int(item["acml_vol"]),
-                    }
+                _append_row(
+                    cols,
+                    stck_bsop_date,
+                    item["stck_oprc"],
+                    item["stck_hgpr"],
+                    item["stck_lwpr"],
+                    item["stck_clpr"],
+                    item["acml_vol"],
                 )
 
-            # 마지막 날짜 이전으로 페이징
-            last_date_str = output2[-1].get("stck_bsop_date", "")
-            if not last_date_str:
-                break
-            last_date = datetime.strptime(last_date_str, "%Y%m%d")
-            if last_date >= current_end:
-                break
-            current_end = last_date - timedelta(days=1)
-
-        return self._to_dataframe(all_rows)
+        return self._to_dataframe(cols, "%Y%m%d", start, end, KR_PRICE_DTYPE)
 
     async def _fetch_hourly(
         self, symbol: str, start: datetime, end: datetime
     ) -> pd.DataFrame:
         """국내 주식 시간봉 조회"""
-        all_rows: List[Dict[str, Any]] = []
+        cols = _new_columns()
+        # 일자가 없는 행은 조회 기준일(end)의 시각으로 간주
+        end_ymd = end.strftime("%Y%m%d")
 
         params = {
             "FID_COND_MRKT_DIV_CODE": "J",
@@ -331,93 +421,70 @@ class KISDataProvider(DataProvider):
             if not stck_cntg_hour:
                 continue
 
-            if stck_bsop_date:
-                ts = datetime.strptime(
-                    f"{stck_bsop_date}{stck_cntg_hour}", "%Y%m%d%H%M%S"
-                )
-            else:
-                ts = datetime.strptime(stck_cntg_hour, "%H%M%S").replace(
-                    year=end.year, month=end.month, day=end.day
-                )
-
-            if ts < start or ts > end:
-                continue
-
-            all_rows.append(
-                {
-                    "timestamp": ts,
-                    "open": float(item.get("stck_oprc", 0)),
-                    "high": float(item.get("stck_hgpr", 0)),
-                    "low": float(item.get("stck_lwpr", 0)),
-                    "close": float(item.get("stck_prpr", 0)),
-                    "volume": int(item.get("cntg_vol", 0)),
-                }
+            _append_row(
+                cols,
+                (stck_bsop_date or end_ymd) + stck_cntg_hour,
+                item.get("stck_oprc", 0),
+                item.get("stck_hgpr", 0),
+                item.get("stck_lwpr", 0),
+                item.get("stck_prpr", 0),
+                item.get("cntg_vol", 0),
             )
 
-        return self._to_dataframe(all_rows)
+        return self._to_dataframe(cols, "%Y%m%d%H%M%S", start, end, KR_PRICE_DTYPE)
 
     # ── 미국 주식 OHLCV 조회 ──
 
     async def _fetch_us_daily(
         self, symbol: str, start: datetime, end: datetime
     ) -> pd.DataFrame:
-        """미국 주식 일봉 조회 (해외주식 기간별 시세 API)"""
-        all_rows: List[Dict[str, Any]] = []
-        current_end = end
-
-        while current_end >= start:
-            params = {
-                "AUTH": "",
-                "EXCD": US_EXCHANGE_CODE,
-                "SYMB": symbol,
-                "GUBN": "0",  # 0: 일, 1: 주, 2: 월
-                "BYMD": current_end.strftime("%Y%m%d"),
-                "MODP": "1",  # 수정주가
-            }
-
-            data = await self._request_with_retry(
-                "GET", US_DAILY_PRICE_URL, TR_ID_US_DAILY, params
+        """미국 주식 일봉 조회 (해외주식 기간별 시세 API, 구간별 동시 요청)"""
+        windows = _date_windows(start, end)
+        # BYMD 기준일부터 과거 방향으로 최대 100건 반환 → 구간 끝 날짜를 기준일로 요청
+        responses = await asyncio.gather(
+            *(
+                self._request_with_retry(
+                    "GET",
+                    US_DAILY_PRICE_URL,
+                    TR_ID_US_DAILY,
+                    {
+                        "AUTH": "",
+                        "EXCD": US_EXCHANGE_CODE,
+                        "SYMB": symbol,
+                        "GUBN": "0",  # 0: 일, 1: 주, 2: 월
+                        "BYMD": w_end,
+                        "MODP": "1",  # 수정주가
+                    },
+                )
+                for _, w_end in windows
             )
+        )
 
-            output2 = data.get("output2", [])
-            if not output2:
-                break
-
-            for item in output2:
+        cols = _new_columns()
+        for (w_start, w_end), data in zip(windows, responses):
+            # 응답은 최신순 → 뒤집어 담으면 구간 순서와 합쳐 전체가 오름차순 (정렬 생략)
+            for item in reversed(data.get("output2", [])):
                 xymd = item.get("xymd", "")
-                if not xymd:
-                    continue
-                row_date = datetime.strptime(xymd, "%Y%m%d")
-                if row_date < start or row_date > end:
+                # 구간 밖 날짜는 인접 구간 응답과 중복되므로 제외
+                if not xymd or not w_start <= xymd <= w_end:
                     continue
-
-                all_rows.append(
-                    {
-                        "timestamp": row_date,
-                        "open": float(item.get("open", 0)),
-                        "high": float(item.get("high", 0)),
-                        "low": float(item.get("low", 0)),
-                        "close": float(item.get("clos", 0)),
-                        "volume": int(item.get("tvol", 0)),
-                    }
+                _append_row(
+                    cols,
+                    xymd,
+                    item.get("open", 0),
+                    item.get("high", 0),
+                    item.get("low", 0),
+                    item.get("clos", 0),
+                    item.get("tvol", 0),
                 )
 
-            # 페이징: 마지막 날짜 이전으로
-            last_date_str = output2[-1].get("xymd", "")
-            if not last_date_str:
-                break
-            last_date = datetime.strptime(last_date_str, "%Y%m%d")
-            if last_date >= current_end:
-                break
-            current_end = last_date - timedelta(days=1)
-
-        return self._to_dataframe(all_rows)
+        return self._to_dataframe(cols, "%Y%m%d", start, end, US_PRICE_DTYPE)
 
     async def _fetch_us_hourly(
         self, symbol: str, start: datetime, end: datetime
     ) -> pd.DataFrame:
         """미국 주식 시간봉 조회 (해외주식 분봉 API)"""
-        all_rows: List[Dict[str, Any]] = []
+        cols = _new_columns()
 
         # TODO: KIS 해외주식 분봉 API의 정확한 파라미터는 공식 문서 확인 필요
         params = {
@@ -443,31 +510,51 @@ class KISDataProvider(DataProvider):
             if not xymd or not xhms:
                 continue
 
-            ts = datetime.strptime(f"{xymd}{xhms}", "%Y%m%d%H%M%S")
-            if ts < start or ts > end:
-                continue
-
-            all_rows.append(
-                {
-                    "timestamp": ts,
-                    "open": float(item.get("open", 0)),
-                    "high": float(item.get("high", 0)),
-                    "low": float(item.get("low", 0)),
-                    "close": float(item.get("clos", 0)),
-                    "volume": int(item.get("tvol", 0)),
-                }
+            _append_row(
+                cols,
+                xymd + xhms,
+                item.get("open", 0),
+                item.get("high", 0),
+                item.get("low", 0),
+                item.get("clos", 0),
+                item.get("tvol", 0),
             )
 
-        return self._to_dataframe(all_rows)
+        return self._to_dataframe(cols, "%Y%m%d%H%M%S", start, end, US_PRICE_DTYPE)
 
-    def _to_dataframe(self, rows: List[Dict[str, Any]]) -> pd.DataFrame:
-        if not rows:
-            return pd.DataFrame(
-                columns=["timestamp", "open", "high", "low", "close", "volume"]
-            )
-        df = pd.DataFrame(rows)
-        df = df.sort_values("timestamp").reset_index(drop=True)
-        return df
+    def _to_dataframe(
+        self,
+        cols: Dict[str, List[Any]],
+        ts_format: str,
+        start: datetime,
+        end: datetime,
+        price_dtype=np.float64,
+    ) -> pd.DataFrame:
+        """원본 문자열 컬럼을 일괄 변환하고 [start, end] 구간만 timestamp 순으로 반환"""
+        if not cols["timestamp"]:
+            return _empty_ohlcv()
+
+        # 행마다 strptime 대신 C 레벨 일괄 파싱 (중복 날짜 문자열은 cache로 재사용)
+        ts = pd.to_datetime(cols["timestamp"], format=ts_format, cache=True).to_numpy(
+            dtype="datetime64[ns]"
+        )
+        mask = (ts >= np.datetime64(start, "ns")) & (ts <= np.datetime64(end, "ns"))
+        idx = np.flatnonzero(mask)
+        if idx.size == 0:
+            return _empty_ohlcv()
+        # 이미 오름차순이면 그대로, 엄격한 내림차순이면 뒤집기만 하고(O(N)),
+        # 그 외에만 timestamp 기준 정렬 순서를 계산해 모든 컬럼을 한 번에 재배치
+        step = np.diff(ts[idx])
+        if (step < np.timedelta64(0)).all():
+            idx = idx[::-1]
+        elif not (step >= np.timedelta64(0)).all():
+            idx = idx[np.argsort(ts[idx], kind="stable")]
+
+        columns = {"timestamp": ts[idx]}
+        for col in ("open", "high", "low", "close"):
+            columns[col] = np.asarray(cols[col], dtype=price_dtype)[idx]
+        columns["volume"] = np.asarray(cols["volume"], dtype=np.int64)[idx]
+        return pd.DataFrame(columns, copy=False)
 
     # ── 종목 검색 ──
 
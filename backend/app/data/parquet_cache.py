@@ -0,0 +1,132 @@
+"""Parquet 파일 기반 OHLCV 캐시 (종목/타임프레임별 컬럼형 저장)
+
+`pyarrow`가 필요하다 (`poetry install -E parquet`).
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+from app.data.cache import CachedDataProvider
+from app.data.provider import DataProvider, SymbolInfo
+from app.db.models import MarketType, TimeframeType
+from app.utils.logger import logger
+
+# 캐시 파일 루트: {root}/{market}/{symbol}/{timeframe}.parquet
+PARQUET_CACHE_DIR = Path(__file__).parent.parent.parent / "cache"
+
+_OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+
+class ParquetCache(DataProvider):
+    """
+    Parquet 파일을 앞에 두고, 미스 시 실제 프로바이더를 호출하는 래퍼.
+
+    CachedDataProvider와 같은 신선도 규칙을 따르되, 행 단위 fetched_at 대신
+    파일 수정 시각을 기준으로 TTL을 판단한다. 구간 필터는 Arrow로 푸시다운된다.
+    """
+
+    def __init__(self, provider: DataProvider, root: Optional[Path] = None):
+        self._provider = provider
+        self._root = Path(root) if root is not None else PARQUET_CACHE_DIR
+
+    def _path(self, symbol: str, market: MarketType, timeframe: TimeframeType) -> Path:
+        return self._root / market.value / symbol / f"{timeframe.value}.parquet"
+
+    async def fetch_ohlcv(
+        self,
+        symbol: str,
+        market: MarketType,
+        timeframe: TimeframeType,
+        start: datetime,
+        end: datetime,
+    ) -> pd.DataFrame:
+        path = self._path(symbol, market, timeframe)
+        edge = CachedDataProvider._historical_edge()
+        cached = await asyncio.to_thread(self._read, path, start, end)
+
+        fresh = False
+        if path.exists():
+            ttl = CachedDataProvider._TTL[timeframe]
+            fresh = time.time() - path.stat().st_mtime < ttl
+
+        # 전체가 과거 구간이거나 파일이 TTL 이내면 캐시 히트
+        if not cached.empty and (end < edge or fresh):
+            logger.info(
+                "Parquet 캐시 히트: %s %s %s (%d건)",
+                symbol,
+                market.value,
+                timeframe.value,
+                len(cached),
+            )
+            return cached
+
+        # 과거 구간 행이 있으면 마지막 과거 봉 이후만 API로 보충
+        historical = cached[cached["timestamp"] < edge] if not cached.empty else cached
+        if historical.empty:
+            fetch_start = start
+        else:
+            fetch_start = CachedDataProvider._gap_start(
+                timeframe, historical["timestamp"].iloc[-1], edge
+            )
+        logger.info(
+            "Parquet 캐시 미스: %s %s %s → %s 이후 API 호출",
+            symbol,
+            market.value,
+            timeframe.value,
+            fetch_start.date(),
+        )
+        df = await self._provider.fetch_ohlcv(symbol, market, timeframe, fetch_start, end)
+
+        if not df.empty:
+            await asyncio.to_thread(self._merge, path, df)
+
+        if historical.empty:
+            return df
+        if df.empty:
+            return historical.reset_index(drop=True)
+        return pd.concat([historical, df], ignore_index=True)
+
+    @staticmethod
+    def _read(path: Path, start: datetime, end: datetime) -> pd.DataFrame:
+        if not path.exists():
+            return pd.DataFrame(columns=_OHLCV_COLUMNS)
+        df = pd.read_parquet(
+            path,
+            engine="pyarrow",
+            columns=_OHLCV_COLUMNS,
+            filters=[
+                ("timestamp", ">=", pd.Timestamp(start)),
+                ("timestamp", "<=", pd.Timestamp(end)),
+            ],
+        )
+        return df.reset_index(drop=True)
+
+    @staticmethod
+    def _merge(path: Path, df: pd.DataFrame) -> None:
+        """기존 파일과 병합(같은 timestamp는 새 값 우선)한 뒤 원자적으로 교체"""
+        df = df[_OHLCV_COLUMNS]
+        if path.exists():
+            existing = pd.read_parquet(path, engine="pyarrow", columns=_OHLCV_COLUMNS)
+            df = pd.concat([existing, df], ignore_index=True)
+            df = df.drop_duplicates(subset="timestamp", keep="last")
+        df = df.sort_values("timestamp", kind="stable").reset_index(drop=True)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".parquet.tmp")
+        df.to_parquet(tmp, engine="pyarrow", compression="zstd", index=False)
+        os.replace(tmp, path)
+        logger.info("Parquet 캐시 저장 완료: %s (%d건)", path, len(df))
+
+    async def search_symbols(
+        self,
+        market: MarketType,
+        query: str,
+    ) -> List[SymbolInfo]:
+        # 종목 검색은 캐시하지 않고 직접 호출
+        return await self._provider.search_symbols(market, query)
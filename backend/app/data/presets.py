@@ -1,7 +1,8 @@
 """종목 프리셋 모듈."""
 
 from dataclasses import dataclass, field
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Tuple
 
 
 @dataclass
@@ -74,10 +75,15 @@ PRESETS: Dict[str, SymbolPreset] = {
 }
 
 
+# 조회용 인덱스는 모듈 로드 시 한 번만 구성
+_PRESETS_LOWER: Dict[str, SymbolPreset] = {k.lower(): v for k, v in PRESETS.items()}
+_PRESETS_LIST: Tuple[SymbolPreset, ...] = tuple(PRESETS.values())
+
+
+@lru_cache(maxsize=128)
 def get_preset(name: str) -> SymbolPreset:
     """프리셋 이름으로 조회. case-insensitive."""
-    key = name.lower()
-    preset = PRESETS.get(key)
+    preset = _PRESETS_LOWER.get(name.lower())
     if preset is None:
         available = ", ".join(PRESETS.keys())
         raise ValueError(f"Unknown preset: '{name}'. Available: {available}")
@@ -86,4 +92,4 @@ def get_preset(name: str) -> SymbolPreset:
 
 def list_presets() -> List[SymbolPreset]:
     """등록된 모든 프리셋 목록 반환."""
-    return list(PRESETS.values())
+    return list(_PRESETS_LIST)
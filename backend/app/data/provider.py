@@ -1,9 +1,10 @@
 """데이터 프로바이더 인터페이스 (ABC)"""
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import pandas as pd
 
@@ -41,6 +42,28 @@ class DataProvider(ABC):
         """
         ...
 
+    async def fetch_many(
+        self,
+        symbols: List[str],
+        market: MarketType,
+        timeframe: TimeframeType,
+        start: datetime,
+        end: datetime,
+        max_concurrency: int = 10,
+    ) -> Dict[str, pd.DataFrame]:
+        """여러 종목의 OHLCV를 최대 max_concurrency개씩 동시에 조회한다.
+
+        Returns:
+            {symbol: DataFrame} (symbols 순서 유지, 데이터가 없으면 빈 DataFrame)
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def one(symbol: str):
+            async with semaphore:
+                return symbol, await self.fetch_ohlcv(symbol, market, timeframe, start, end)
+
+        return dict(await asyncio.gather(*(one(s) for s in symbols)))
+
     @abstractmethod
     async def search_symbols(
         self,
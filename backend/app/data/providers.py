@@ -0,0 +1,7 @@
+"""프로세스 단위로 공유하는 데이터 프로바이더 인스턴스"""
+
+from app.data.kis_api import KISDataProvider
+
+# 요청마다 새로 만들지 않고 공유 → httpx 커넥션 풀(TCP/TLS)과 발급된 토큰을 재사용.
+# DB 세션에 묶인 CachedDataProvider는 요청 단위로 감싸서 사용한다.
+kis_provider = KISDataProvider()
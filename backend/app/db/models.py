@@ -1,5 +1,4 @@
 import uuid
-from datetime import datetime
 from enum import Enum
 
 from sqlalchemy import (
@@ -7,21 +6,93 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Identity,
     Index,
     Integer,
     JSON,
     Numeric,
     String,
+    TypeDecorator,
     UniqueConstraint,
+    Uuid,
 )
 from sqlalchemy import Enum as SAEnum
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase, relationship
+from sqlalchemy.sql.expression import FunctionElement
 
 
 class Base(DeclarativeBase):
     pass
 
 
+# ── 공통 컬럼 타입 ──
+
+
+class UtcNow(FunctionElement):
+    """DB 서버 시각(UTC, tz 없는 TIMESTAMP). created_at 등의 server_default로 사용"""
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(UtcNow, "postgresql")
+def _pg_utcnow(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(UtcNow, "sqlite")
+def _sqlite_utcnow(element, compiler, **kw):
+    # CURRENT_TIMESTAMP는 초 단위라 정렬/페이지네이션 키로 쓰기엔 부족 → 밀리초까지
+    return "STRFTIME('%Y-%m-%d %H:%M:%f', 'now')"
+
+
+@compiles(UtcNow)
+def _default_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+class UUIDString(TypeDecorator):
+    """
+    PostgreSQL에서는 네이티브 UUID(16바이트), 그 밖의 DB에서는 CHAR(32)로 저장하고
+    Python에서는 기존과 같이 문자열로 다루는 ID 타입.
+    UUID 형식이 아닌 값은 NULL로 바인딩되어 어떤 행과도 일치하지 않는다 (조회 시 404).
+    """
+
+    impl = Uuid(as_uuid=False)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return str(uuid.UUID(str(value)))
+        except ValueError:
+            return None
+
+
+def _new_id() -> str:
+    return str(uuid.uuid4())
+
+
+class FloatNumeric(TypeDecorator):
+    """
+    NUMERIC으로 저장하되 조회 결과는 항상 float로 돌려주는 타입.
+    엔진/분석 코드가 읽는 가격·금액 컬럼(시세, 체결, 초기 자본)에 사용해 Decimal이 계산 경로로
+    새어 들어가지 않게 한다. Decimal은 API 응답 스키마에서만 사용한다.
+    """
+
+    impl = Numeric
+    cache_ok = True
+
+    def __init__(self, precision: int, scale: int):
+        # asdecimal=False: 드라이버가 지원하면 Decimal 생성 자체를 건너뜀
+        super().__init__(precision, scale, asdecimal=False)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else float(value)
+
+
 # ── Enums ──
 
 
@@ -53,7 +124,7 @@ class JobStatus(str, Enum):
 class Backtest(Base):
     __tablename__ = "backtests"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUIDString, primary_key=True, default=_new_id)
     name = Column(String(200), nullable=False)
     description = Column(String(1000), nullable=True)
 
@@ -67,7 +138,7 @@ class Backtest(Base):
     timeframe = Column(SAEnum(TimeframeType), nullable=False)
     start_date = Column(DateTime, nullable=False)
     end_date = Column(DateTime, nullable=False)
-    initial_capital = Column(Numeric(15, 2), nullable=False)
+    initial_capital = Column(FloatNumeric(15, 2), nullable=False)
 
     # 비동기 작업 상태
     job_status = Column(SAEnum(JobStatus), nullable=False, default=JobStatus.PENDING)
@@ -92,18 +163,32 @@ class Backtest(Base):
     equity_curve_data = Column(JSON, nullable=True)
 
     # 관계
-    trades = relationship("Trade", back_populates="backtest", cascade="all, delete-orphan")
+    # 지연 로딩 금지: 거래 내역이 필요하면 selectinload(Backtest.trades)로 명시적으로 로드.
+    # 삭제 시 자식 행은 FK ON DELETE CASCADE에 맡긴다 (컬렉션을 읽지 않음)
+    trades = relationship(
+        "Trade",
+        back_populates="backtest",
+        cascade="all, delete-orphan",
+        lazy="raise",
+        order_by="Trade.fill_date",
+        passive_deletes=True,
+    )
+
+    created_at = Column(DateTime, server_default=UtcNow())
+    updated_at = Column(DateTime, server_default=UtcNow(), onupdate=UtcNow())
 
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    __table_args__ = (
+        # 목록 조회((created_at, id) DESC 정렬 + keyset 페이지네이션)용
+        Index("ix_backtests_created_at_desc", created_at.desc(), id.desc()),
+    )
 
 
 class Trade(Base):
     __tablename__ = "trades"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUIDString, primary_key=True, default=_new_id)
     backtest_id = Column(
-        String, ForeignKey("backtests.id", ondelete="CASCADE"), nullable=False
+        UUIDString, ForeignKey("backtests.id", ondelete="CASCADE"), nullable=False
     )
 
     symbol = Column(String(20), nullable=False)
@@ -111,47 +196,50 @@ class Trade(Base):
     quantity = Column(Integer, nullable=False)
 
     # 시그널 시점
-    signal_price = Column(Numeric(15, 4), nullable=False)
+    signal_price = Column(FloatNumeric(15, 4), nullable=False)
     signal_date = Column(DateTime, nullable=False)
 
     # 실제 체결
-    fill_price = Column(Numeric(15, 4), nullable=False)
+    fill_price = Column(FloatNumeric(15, 4), nullable=False)
     fill_date = Column(DateTime, nullable=False)
 
     # 수수료
-    commission = Column(Numeric(15, 4), nullable=False, default=0)
+    commission = Column(FloatNumeric(15, 4), nullable=False, default=0)
 
     # 청산 정보
-    exit_signal_price = Column(Numeric(15, 4), nullable=True)
-    exit_fill_price = Column(Numeric(15, 4), nullable=True)
+    exit_signal_price = Column(FloatNumeric(15, 4), nullable=True)
+    exit_fill_price = Column(FloatNumeric(15, 4), nullable=True)
     exit_date = Column(DateTime, nullable=True)
-    exit_commission = Column(Numeric(15, 4), nullable=True)
+    exit_commission = Column(FloatNumeric(15, 4), nullable=True)
 
     # 손익
-    pnl = Column(Numeric(15, 4), nullable=True)
-    pnl_percent = Column(Numeric(10, 4), nullable=True)
+    pnl = Column(FloatNumeric(15, 4), nullable=True)
+    pnl_percent = Column(FloatNumeric(10, 4), nullable=True)
     holding_days = Column(Integer, nullable=True)
 
-    backtest = relationship("Backtest", back_populates="trades")
-    created_at = Column(DateTime, default=datetime.utcnow)
+    backtest = relationship("Backtest", back_populates="trades", lazy="raise")
+    created_at = Column(DateTime, server_default=UtcNow())
 
     __table_args__ = (
         Index("ix_trades_backtest_symbol", "backtest_id", "symbol"),
+        # 리포트(거래 목록/CSV)는 backtest_id로 거르고 체결·청산 시각 순으로 정렬
+        Index("ix_trades_backtest_fill_date", "backtest_id", "fill_date"),
+        Index("ix_trades_backtest_exit_date", "backtest_id", "exit_date"),
     )
 
 
 class StrategyTemplate(Base):
     __tablename__ = "strategy_templates"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUIDString, primary_key=True, default=_new_id)
     name = Column(String(100), unique=True, nullable=False)
     description = Column(String(1000), nullable=True)
     strategy_type = Column(String(100), nullable=False)
     default_parameters = Column(JSON, nullable=False)
     parameter_schema = Column(JSON, nullable=True)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UtcNow())
+    updated_at = Column(DateTime, server_default=UtcNow(), onupdate=UtcNow())
 
 
 class MarketData(Base):
@@ -159,19 +247,24 @@ class MarketData(Base):
 
     __tablename__ = "market_data"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    # 대량 적재 테이블이라 8바이트 IDENTITY 키 사용 (논리적 식별자는 uq_market_data_identity)
+    id = Column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        Identity(always=False),
+        primary_key=True,
+    )
     symbol = Column(String(20), nullable=False)
     market = Column(SAEnum(MarketType), nullable=False)
     timeframe = Column(SAEnum(TimeframeType), nullable=False)
     timestamp = Column(DateTime, nullable=False)
 
-    open = Column(Numeric(15, 4), nullable=False)
-    high = Column(Numeric(15, 4), nullable=False)
-    low = Column(Numeric(15, 4), nullable=False)
-    close = Column(Numeric(15, 4), nullable=False)
+    open = Column(FloatNumeric(15, 4), nullable=False)
+    high = Column(FloatNumeric(15, 4), nullable=False)
+    low = Column(FloatNumeric(15, 4), nullable=False)
+    close = Column(FloatNumeric(15, 4), nullable=False)
     volume = Column(BigInteger, nullable=False)
 
-    fetched_at = Column(DateTime, default=datetime.utcnow)
+    fetched_at = Column(DateTime, server_default=UtcNow())
 
     __table_args__ = (
         UniqueConstraint(
@@ -181,7 +274,16 @@ class MarketData(Base):
             "timestamp",
             name="uq_market_data_identity",
         ),
-        Index("ix_market_data_lookup", "symbol", "market", "timeframe", "timestamp"),
+        # 캐시 조회용 커버링 인덱스: 키 컬럼은 유니크 제약과 같고, 조회/TTL 필터 컬럼을
+        # INCLUDE 해 PostgreSQL에서 index-only scan이 가능하도록 함
+        Index(
+            "ix_market_data_lookup",
+            "symbol",
+            "market",
+            "timeframe",
+            "timestamp",
+            postgresql_include=["fetched_at", "open", "high", "low", "close", "volume"],
+        ),
     )
 
 
@@ -190,14 +292,14 @@ class OptimizationResult(Base):
 
     __tablename__ = "optimization_results"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUIDString, primary_key=True, default=_new_id)
     strategy_name = Column(String(100), nullable=False)
     market = Column(SAEnum(MarketType), nullable=False)
     symbols = Column(JSON, nullable=False)
     timeframe = Column(SAEnum(TimeframeType), nullable=False)
     start_date = Column(DateTime, nullable=False)
     end_date = Column(DateTime, nullable=False)
-    initial_capital = Column(Numeric(15, 2), nullable=False)
+    initial_capital = Column(FloatNumeric(15, 2), nullable=False)
 
     optimization_metric = Column(String(50), nullable=False)
     total_combinations = Column(Integer, nullable=False)
@@ -209,7 +311,7 @@ class OptimizationResult(Base):
     job_error = Column(String, nullable=True)
     progress = Column(Integer, default=0)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UtcNow())
 
 
 class StrategyComparison(Base):
@@ -217,7 +319,7 @@ class StrategyComparison(Base):
 
     __tablename__ = "strategy_comparisons"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUIDString, primary_key=True, default=_new_id)
     name = Column(String(200), nullable=False)
 
     # 공통 설정
@@ -226,7 +328,7 @@ class StrategyComparison(Base):
     timeframe = Column(SAEnum(TimeframeType), nullable=False)
     start_date = Column(DateTime, nullable=False)
     end_date = Column(DateTime, nullable=False)
-    initial_capital = Column(Numeric(15, 2), nullable=False)
+    initial_capital = Column(FloatNumeric(15, 2), nullable=False)
 
     # 전략 목록: [{strategy_name, parameters}, ...]
     strategies = Column(JSON, nullable=False)
@@ -239,4 +341,4 @@ class StrategyComparison(Base):
     job_error = Column(String, nullable=True)
     progress = Column(Integer, default=0)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UtcNow())
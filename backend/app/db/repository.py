@@ -0,0 +1,123 @@
+"""자주 쓰는 ORM 조회/저장 헬퍼 (관계 로딩 전략과 대량 쓰기를 한곳에서 관리)"""
+
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session, selectinload
+
+from app.db.models import Backtest, OrderSide, Trade
+from app.engine.order import FilledOrder
+from app.engine.order import OrderSide as EngineOrderSide
+
+# bulk_insert_mappings 한 번에 넘기는 행 수 (메모리 상한 유지용)
+TRADE_INSERT_CHUNK = 1000
+
+
+def get_backtest(db: Session, backtest_id: str) -> Optional[Backtest]:
+    """거래 내역 없이 백테스트 한 건 조회"""
+    return db.query(Backtest).filter(Backtest.id == backtest_id).first()
+
+
+def get_backtest_with_trades(db: Session, backtest_id: str) -> Optional[Backtest]:
+    """
+    백테스트와 거래 내역을 함께 조회.
+
+    Backtest.trades는 lazy="raise"이므로 거래 내역이 필요한 경로는 이 함수를 사용한다.
+    selectinload로 backtests 1회 + trades(WHERE backtest_id IN ...) 1회, 총 2회 쿼리.
+    """
+    return (
+        db.query(Backtest)
+        .options(selectinload(Backtest.trades))
+        .filter(Backtest.id == backtest_id)
+        .first()
+    )
+
+
+def _to_python_datetime(val):
+    """pandas Timestamp / numpy datetime64 → Python datetime"""
+    if val is None:
+        return None
+    if hasattr(val, "to_pydatetime"):
+        return val.to_pydatetime()
+    return val
+
+
+def _entry_row(backtest_id: str, filled: FilledOrder, side: OrderSide) -> Dict:
+    # render_nulls=True로 한 배치에 묶이도록 모든 행이 같은 키 집합을 갖는다
+    return {
+        "backtest_id": backtest_id,
+        "symbol": filled.symbol,
+        "side": side,
+        "quantity": int(filled.quantity),
+        "signal_price": float(filled.signal_price),
+        "signal_date": _to_python_datetime(filled.signal_date),
+        "fill_price": float(filled.fill_price),
+        "fill_date": _to_python_datetime(filled.fill_date),
+        "commission": float(filled.commission),
+        "exit_signal_price": None,
+        "exit_fill_price": None,
+        "exit_date": None,
+        "exit_commission": None,
+        "pnl": None,
+        "pnl_percent": None,
+        "holding_days": None,
+    }
+
+
+def _close_row(row: Dict, filled: FilledOrder) -> None:
+    """매수 행에 매도(청산) 정보와 손익을 기록"""
+    exit_date = _to_python_datetime(filled.fill_date)
+    row["exit_signal_price"] = float(filled.signal_price)
+    row["exit_fill_price"] = float(filled.fill_price)
+    row["exit_date"] = exit_date
+    row["exit_commission"] = float(filled.commission)
+
+    buy_cost = row["fill_price"] * row["quantity"] + row["commission"]
+    sell_revenue = float(filled.fill_price) * filled.quantity - float(filled.commission)
+    pnl = float(sell_revenue - buy_cost)
+    row["pnl"] = pnl
+    row["pnl_percent"] = float(pnl / buy_cost) if buy_cost > 0 else 0.0
+    if row["fill_date"] and exit_date:
+        row["holding_days"] = (exit_date - row["fill_date"]).days
+
+
+def trade_rows(backtest_id: str, engine_trades: Iterable[FilledOrder]) -> List[Dict]:
+    """
+    엔진 체결 목록을 Trade 행 딕셔너리로 변환.
+    BUY/SELL을 종목별로 짝지어 매도 정보는 매수 행의 청산 컬럼에 기록한다.
+    """
+    rows: List[Dict] = []
+    open_positions: Dict[str, Dict] = {}  # symbol → 매수 행
+
+    for filled in engine_trades:
+        if filled.side == EngineOrderSide.BUY:
+            row = _entry_row(backtest_id, filled, OrderSide.BUY)
+            rows.append(row)
+            open_positions[filled.symbol] = row
+        elif filled.side == EngineOrderSide.SELL:
+            buy_row = open_positions.pop(filled.symbol, None)
+            if buy_row is not None:
+                _close_row(buy_row, filled)
+            else:
+                # 매수 없이 매도만 있는 경우 (비정상)
+                rows.append(_entry_row(backtest_id, filled, OrderSide.SELL))
+
+    return rows
+
+
+def write_trades(
+    db: Session,
+    backtest_id: str,
+    engine_trades: Iterable[FilledOrder],
+    chunk_size: int = TRADE_INSERT_CHUNK,
+) -> List[Dict]:
+    """
+    체결 목록을 Trade 테이블에 청크 단위 bulk insert.
+
+    ORM 객체를 만들지 않고 bulk_insert_mappings로 바로 INSERT하며, 커밋은 호출자의
+    트랜잭션에 맡긴다. 저장한 행 딕셔너리를 반환한다 (재조회 없이 지표 계산에 사용).
+    """
+    rows = trade_rows(backtest_id, engine_trades)
+    for i in range(0, len(rows), chunk_size):
+        db.bulk_insert_mappings(Trade, rows[i : i + chunk_size], render_nulls=True)
+        db.flush()
+    return rows
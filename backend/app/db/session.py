@@ -1,9 +1,37 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
+from app.utils.logger import setup_sql_logger
 
-engine = create_engine(settings.database_url, echo=settings.debug, pool_pre_ping=True)
+
+def _engine_options(database_url: str) -> dict:
+    """
+    서버형 DB(QueuePool)용 풀 설정.
+    병렬 최적화 워커 수만큼 커넥션을 유지하고, LIFO로 최근 커넥션을 재사용해
+    유휴 커넥션이 자연스럽게 정리되도록 한다. SQLite는 기본 풀을 그대로 쓰되,
+    FastAPI 스레드풀에서 세션이 만들어진 스레드와 다른 스레드가 쓸 수 있으므로
+    check_same_thread 검사를 끈다.
+    """
+    if make_url(database_url).get_backend_name() == "sqlite":
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_pool_overflow,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_use_lifo": True,
+    }
+
+
+# SQL 로그는 echo 대신 표준 logging 설정으로 켠다 (settings.sql_echo)
+setup_sql_logger()
+
+engine = create_engine(
+    settings.database_url,
+    pool_pre_ping=True,
+    **_engine_options(settings.database_url),
+)
 
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
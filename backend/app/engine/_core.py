@@ -0,0 +1,210 @@
+"""
+벡터 신호 기반 백테스트 커널 (numba `njit`, 미설치 시 순수 Python으로 동작).
+
+BacktestEngine의 이벤트 루프(_fill_orders/_fill_buy/_fill_sell + Portfolio + Broker)와 같은 규칙을
+(봉 T, 종목 N) 행렬 위에서 그대로 수행한다. 전략이 on_bar 대신 진입/청산 신호 행렬을 미리 계산할 수
+있을 때(Strategy.generate_signals)만 사용한다.
+"""
+
+import math
+
+import numpy as np
+
+from app.utils.njit import njit, readonly_array, scalar_type
+
+SIDE_BUY = 1
+SIDE_SELL = -1
+
+# run_bars_core 시그니처: 가격 행렬 정밀도(fp64/fp32)별로 하나씩, 나머지 인자는 고정
+_CORE_SIGNATURES = [
+    (
+        readonly_array(price_dtype, 2),
+        readonly_array(price_dtype, 2),
+        readonly_array(np.bool_, 2),
+        readonly_array(np.bool_, 2),
+        readonly_array(np.float64, 2),
+    )
+    + (scalar_type(np.float64),) * 8
+    for price_dtype in (np.float64, np.float32)
+]
+
+
+@njit(cache=True)
+def _grow(arr: np.ndarray) -> np.ndarray:
+    out = np.empty(arr.shape[0] * 2, dtype=arr.dtype)
+    out[: arr.shape[0]] = arr
+    return out
+
+
+@njit(cache=True)
+def _positions_value(qty: np.ndarray, price: np.ndarray) -> float:
+    total = 0.0
+    for j in range(qty.shape[0]):
+        if qty[j] > 0:
+            total += qty[j] * price[j]
+    return total
+
+
+@njit(_CORE_SIGNATURES, cache=True)
+def run_bars_core(
+    open_: np.ndarray,
+    close: np.ndarray,
+    entries: np.ndarray,
+    exits: np.ndarray,
+    weights: np.ndarray,
+    buy_mult: float,
+    sell_mult: float,
+    commission_rate: float,
+    min_commission: float,
+    min_order_amount: float,
+    max_position_weight: float,
+    min_cash_reserve_ratio: float,
+    initial_capital: float,
+):
+    """
+    봉 루프 커널.
+
+    봉 i에서: (1) 직전 봉 신호로 만든 주문을 open_[i] 기준으로 종목 순서대로 체결
+    (2) close[i]로 시가평가 (3) 자산/현금 기록 (4) 마지막 봉이 아니면 신호로 다음 주문 생성.
+    주문 생성 규칙은 기존 전략과 같다:
+    미보유 + entries → 매수(weights 비중), 보유 + exits → 전량 매도.
+
+    Returns:
+        (equity[T], cash[T],
+         trade_bar[K], trade_sym[K], trade_side[K],
+         trade_qty[K], trade_price[K], trade_commission[K],
+         final_cash, qty[N], avg_price[N], price[N])
+    """
+    n_bars, n_symbols = close.shape
+
+    equity_curve = np.empty(n_bars)
+    cash_curve = np.empty(n_bars)
+
+    capacity = 64
+    trade_bar = np.empty(capacity, dtype=np.int64)
+    trade_sym = np.empty(capacity, dtype=np.int64)
+    trade_side = np.empty(capacity, dtype=np.int8)
+    trade_qty = np.empty(capacity, dtype=np.int64)
+    trade_price = np.empty(capacity)
+    trade_commission = np.empty(capacity)
+    n_trades = 0
+
+    qty = np.zeros(n_symbols, dtype=np.int64)
+    avg_price = np.zeros(n_symbols)
+    price = np.zeros(n_symbols)
+    pending_side = np.zeros(n_symbols, dtype=np.int8)
+    pending_weight = np.zeros(n_symbols)
+    has_pending = False
+
+    cash = initial_capital
+    positions_value = 0.0
+
+    for i in range(n_bars):
+        # 1) 이전 봉 주문 체결
+        if has_pending:
+            has_pending = False
+            for j in range(n_symbols):
+                side = pending_side[j]
+                if side == 0:
+                    continue
+                pending_side[j] = 0
+                next_open = float(open_[i, j])
+
+                if side == SIDE_SELL:
+                    if qty[j] == 0:
+                        continue
+                    fill_price = next_open * sell_mult
+                    quantity = qty[j]
+                    commission = max(fill_price * quantity * commission_rate, min_commission)
+                    cash += fill_price * quantity - commission
+                    qty[j] = 0
+                    avg_price[j] = 0.0
+                else:
+                    fill_price = next_open * buy_mult
+                    equity = cash + positions_value
+                    current_value = qty[j] * price[j] if qty[j] > 0 else 0.0
+
+                    target_value = equity * pending_weight[j]
+                    allowed_value = equity * max_position_weight - current_value
+                    target_value = min(target_value, allowed_value)
+                    if target_value < min_order_amount:
+                        continue
+                    quantity = max(math.floor(target_value / fill_price), 0)
+                    if quantity == 0:
+                        continue
+
+                    order_value = fill_price * quantity
+                    commission = max(fill_price * quantity * commission_rate, min_commission)
+                    total_cost = order_value + commission
+                    if total_cost > cash:
+                        continue
+                    if cash - total_cost < equity * min_cash_reserve_ratio:
+                        continue
+                    if order_value < min_order_amount:
+                        continue
+
+                    cash -= fill_price * quantity + commission
+                    if qty[j] > 0:
+                        cost = avg_price[j] * qty[j] + fill_price * quantity
+                        qty[j] += quantity
+                        avg_price[j] = cost / qty[j]
+                    else:
+                        qty[j] = quantity
+                        avg_price[j] = fill_price
+                    price[j] = fill_price
+
+                if n_trades == trade_bar.shape[0]:
+                    trade_bar = _grow(trade_bar)
+                    trade_sym = _grow(trade_sym)
+                    trade_side = _grow(trade_side)
+                    trade_qty = _grow(trade_qty)
+                    trade_price = _grow(trade_price)
+                    trade_commission = _grow(trade_commission)
+                trade_bar[n_trades] = i
+                trade_sym[n_trades] = j
+                trade_side[n_trades] = side
+                trade_qty[n_trades] = quantity
+                trade_price[n_trades] = fill_price
+                trade_commission[n_trades] = commission
+                n_trades += 1
+
+                # 체결 시에는 전체를 다시 합산 (Portfolio._revalue와 동일)
+                positions_value = _positions_value(qty, price)
+
+        # 2) 시가평가 (변동분만 반영, Portfolio.mark_to_market과 동일)
+        for j in range(n_symbols):
+            if qty[j] > 0:
+                before = qty[j] * price[j]
+                price[j] = float(close[i, j])
+                positions_value += qty[j] * price[j] - before
+
+        # 3) 자산 곡선 기록
+        equity_curve[i] = cash + positions_value
+        cash_curve[i] = cash
+
+        # 4) 다음 봉 주문 생성
+        if i >= n_bars - 1:
+            break
+        for j in range(n_symbols):
+            if entries[i, j] and qty[j] == 0:
+                pending_side[j] = SIDE_BUY
+                pending_weight[j] = weights[i, j]
+                has_pending = True
+            elif qty[j] > 0 and exits[i, j]:
+                pending_side[j] = SIDE_SELL
+                has_pending = True
+
+    return (
+        equity_curve,
+        cash_curve,
+        trade_bar[:n_trades],
+        trade_sym[:n_trades],
+        trade_side[:n_trades],
+        trade_qty[:n_trades],
+        trade_price[:n_trades],
+        trade_commission[:n_trades],
+        cash,
+        qty,
+        avg_price,
+        price,
+    )
@@ -1,13 +1,129 @@
+from dataclasses import dataclass
 from typing import Callable, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
+from app.engine._core import SIDE_BUY, run_bars_core
 from app.engine.broker import Broker
 from app.engine.order import FilledOrder, OrderSide, PendingOrder
 from app.engine.portfolio import Portfolio
-from app.strategies.base import Strategy
+from app.engine.position import Position
+from app.strategies.base import Strategy, VectorSignals
 from app.utils.logger import logger
 
+_PRICE_COLUMNS = ("open", "high", "low", "close")
+
+# AlignedBars 행렬 정밀도. fp32는 행렬 메모리를 절반으로 줄이지만 가격이 float32로 반올림되므로
+# (예: 70123.45 → 70123.453125) 결과 재현성을 위해 기본값은 fp64
+PRECISION_DTYPES = {"fp64": np.float64, "fp32": np.float32}
+
+
+def _upcast_prices(df: pd.DataFrame) -> pd.DataFrame:
+    """float32로 저장된 가격(원화)을 float64로 올려 현금/수수료 계산 정밀도를 유지"""
+    float32_cols = {
+        col: np.float64
+        for col in _PRICE_COLUMNS
+        if col in df.columns and df[col].dtype == np.float32
+    }
+    return df.astype(float32_cols) if float32_cols else df
+
+
+class Bar:
+    """
+    한 종목의 한 봉. 엔진이 전략에 넘기는 경량 뷰 (pd.Series 행 대신 사용).
+    pd.Series와 같이 bar["close"] / bar.close 형태로 접근하며, name은 봉 시각.
+    """
+
+    __slots__ = ("name", "open", "high", "low", "close", "volume")
+
+    def __init__(self, name, open_, high, low, close, volume):
+        self.name = name
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __repr__(self) -> str:
+        return (
+            f"Bar({self.name}, open={self.open}, high={self.high}, low={self.low}, "
+            f"close={self.close}, volume={self.volume})"
+        )
+
+
+@dataclass(frozen=True)
+class AlignedBars:
+    """
+    모든 종목에 공통으로 존재하는 봉(index)에 맞춰 정렬한 OHLCV 행렬.
+    각 행렬은 (봉 T, 종목 N) 모양의 float64(또는 float32) 배열이며 열 순서는 symbols와 같다.
+
+    prev_close/prev_time은 각 종목(prev_time은 첫 종목) 원본 데이터 기준 직전 봉의
+    종가/시각이다 (첫 봉은 자기 자신). 체결 시 시그널 가격/시각 조회에 사용한다.
+
+    불변 객체이므로 같은 데이터로 여러 번 백테스트할 때(Grid Search 등) 한 번만 만들어
+    BacktestEngine(prepared=...)로 공유한다.
+    """
+
+    symbols: List[str]
+    index: pd.Index
+    times: List[pd.Timestamp]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    prev_close: np.ndarray
+    prev_time: pd.Index
+
+    @classmethod
+    def from_frames(
+        cls, data: Dict[str, pd.DataFrame], dtype: np.dtype = np.float64
+    ) -> "AlignedBars":
+        symbols = list(data.keys())
+        index = None
+        for df in data.values():
+            index = df.index if index is None else index.intersection(df.index)
+        index = pd.Index([]) if index is None else index.sort_values()
+
+        positions = [df.index.get_indexer(index) for df in data.values()]
+        prev_positions = [np.maximum(pos - 1, 0) for pos in positions]
+
+        def stack(column: str, prev: bool = False) -> np.ndarray:
+            cols = [
+                df[column].to_numpy(dtype=dtype)[prev_pos if prev else pos]
+                if column in df.columns
+                else np.full(len(index), np.nan, dtype=dtype)
+                for df, pos, prev_pos in zip(data.values(), positions, prev_positions)
+            ]
+            if not cols:
+                return np.empty((len(index), 0), dtype=dtype)
+            return np.stack(cols, axis=1)
+
+        if data:
+            prev_time = next(iter(data.values())).index[prev_positions[0]]
+        else:
+            prev_time = index
+
+        return cls(
+            symbols=symbols,
+            index=index,
+            times=list(index),
+            open=stack("open"),
+            high=stack("high"),
+            low=stack("low"),
+            close=stack("close"),
+            volume=stack("volume"),
+            prev_close=stack("close", prev=True),
+            prev_time=prev_time,
+        )
+
 
 class BacktestEngine:
     """
@@ -26,6 +142,8 @@ class BacktestEngine:
         broker: Broker,
         initial_capital: float,
         on_progress: Optional[Callable[[int], None]] = None,
+        prepared: Optional[AlignedBars] = None,
+        precision: str = "fp64",
     ):
         """
         Args:
@@ -34,15 +152,30 @@ class BacktestEngine:
             broker: Broker 인스턴스
             initial_capital: 초기 자본금
             on_progress: 진행률 콜백 (0~100)
+            prepared: data로 미리 만든 AlignedBars (주면 정렬/행렬 변환을 건너뜀)
+            precision: prepared가 없을 때 만들 행렬 정밀도 ("fp64" | "fp32").
+                어느 쪽이든 체결가/현금 계산은 Python float(float64)로 수행한다.
         """
+        if precision not in PRECISION_DTYPES:
+            raise ValueError(f"지원하지 않는 precision: {precision}")
         self.strategy = strategy
-        self.data = data
+        if prepared is None:
+            self.data = {symbol: _upcast_prices(df) for symbol, df in data.items()}
+            # 봉 단위 루프에서 pandas 라벨 조회 대신 정수 인덱스로 접근할 행렬
+            prepared = AlignedBars.from_frames(self.data, PRECISION_DTYPES[precision])
+        else:
+            self.data = data
+        self._bars = prepared
+        self._times = prepared.times
+        self._symbol_index = {symbol: j for j, symbol in enumerate(self._bars.symbols)}
         self.broker = broker
         self.portfolio = Portfolio(initial_capital)
         self.on_progress = on_progress
 
         self.trades: List[FilledOrder] = []
-        self.equity_curve: List[Dict] = []
+        # 봉별 자산/현금 (run()에서 봉 수만큼 미리 할당해 인덱스로 기록)
+        self.equity_arr = np.empty(0)
+        self.cash_arr = np.empty(0)
 
     def run(self) -> Dict:
         """
@@ -51,13 +184,10 @@ class BacktestEngine:
         Returns:
             {"trades": [...], "equity_curve": DataFrame, "final_equity": float}
         """
-        # 공통 인덱스 구하기 (모든 종목에 존재하는 날짜)
-        indices = None
-        for df in self.data.values():
-            idx = df.index
-            indices = idx if indices is None else indices.intersection(idx)
+        aligned = self._bars
+        total_bars = len(aligned.index)
 
-        if indices is None or len(indices) < 2:
+        if total_bars < 2:
             logger.warning("데이터가 2봉 미만이어서 백테스트를 실행할 수 없습니다.")
             return {
                 "trades": [],
@@ -65,83 +195,180 @@ class BacktestEngine:
                 "final_equity": self.portfolio.equity,
             }
 
-        indices = indices.sort_values()
-        total_bars = len(indices)
+        # 신호 행렬을 미리 계산할 수 있는 전략은 봉 루프 전체를 커널로 실행
+        # (Broker를 상속해 체결 규칙을 바꾼 경우는 커널이 알 수 없으므로 기존 경로)
+        if type(self.broker) is Broker:
+            signals = self.strategy.generate_signals(aligned)
+            if signals is not None:
+                return self._run_vectorized(signals)
+
+        symbols = aligned.symbols
         pending_orders: List[PendingOrder] = []
+        self.equity_arr = np.empty(total_bars)
+        self.cash_arr = np.empty(total_bars)
+        last_pct = -1
 
-        for i, current_time in enumerate(indices):
+        for i, current_time in enumerate(self._times):
             # 1) 이전 봉에서 발생한 주문을 현재 봉의 시가로 체결
             if pending_orders:
-                self._fill_orders(pending_orders, current_time)
+                self._fill_orders(pending_orders, i)
                 pending_orders = []
 
             # 2) 시가평가 갱신 (현재 봉의 종가)
-            prices = {}
-            bars = {}
-            for symbol, df in self.data.items():
-                if current_time in df.index:
-                    row = df.loc[current_time]
-                    prices[symbol] = row["close"]
-                    bars[symbol] = row
-            self.portfolio.update_market_prices(prices)
+            closes = aligned.close[i].tolist()
+            self.portfolio.mark_to_market(closes, self._symbol_index)
 
             # 3) equity_curve 기록
-            self.equity_curve.append(
-                {
-                    "timestamp": current_time,
-                    "equity": self.portfolio.equity,
-                    "cash": self.portfolio.cash,
-                }
-            )
+            self.equity_arr[i] = self.portfolio.equity
+            self.cash_arr[i] = self.portfolio.cash
 
             # 4) 마지막 봉이면 새 주문 생성하지 않음 (체결할 다음 봉 없음)
             if i >= total_bars - 1:
                 break
 
             # 5) 전략 호출 → PendingOrder 수집
+            bars = {
+                symbol: Bar(current_time, o, h, lo, c, v)
+                for symbol, o, h, lo, c, v in zip(
+                    symbols,
+                    aligned.open[i].tolist(),
+                    aligned.high[i].tolist(),
+                    aligned.low[i].tolist(),
+                    closes,
+                    aligned.volume[i].tolist(),
+                )
+            }
             pending_orders = self.strategy.on_bar(bars, self.portfolio)
 
-            # 6) 진행률 콜백
+            # 6) 진행률 콜백 (퍼센트 값이 바뀔 때만 → 최대 100회)
             if self.on_progress:
-                pct = int((i + 1) / total_bars * 100)
-                self.on_progress(pct)
+                pct = (i + 1) * 100 // total_bars
+                if pct != last_pct:
+                    last_pct = pct
+                    self.on_progress(pct)
 
         if self.on_progress:
             self.on_progress(100)
 
         return {
             "trades": self.trades,
-            "equity_curve": pd.DataFrame(self.equity_curve),
+            "equity_curve": self._equity_frame(),
             "final_equity": self.portfolio.equity,
         }
 
-    def _fill_orders(self, orders: List[PendingOrder], current_time) -> None:
-        """주문 체결 처리 (현재 봉의 시가 기준)"""
+    def _equity_frame(self) -> pd.DataFrame:
+        """봉별 자산/현금 버퍼를 equity_curve DataFrame으로 변환 (run 종료 시 1회)"""
+        return pd.DataFrame(
+            {"timestamp": self._bars.index, "equity": self.equity_arr, "cash": self.cash_arr}
+        )
+
+    def _run_vectorized(self, signals: VectorSignals) -> Dict:
+        """run_bars_core로 전 구간을 실행하고 결과를 run()과 같은 형태로 재구성"""
+        aligned = self._bars
+        broker = self.broker
+        (
+            equity,
+            cash,
+            trade_bar,
+            trade_sym,
+            trade_side,
+            trade_qty,
+            trade_price,
+            trade_commission,
+            final_cash,
+            qty,
+            avg_price,
+            price,
+        ) = run_bars_core(
+            aligned.open,
+            aligned.close,
+            np.ascontiguousarray(signals.entries, dtype=np.bool_),
+            np.ascontiguousarray(signals.exits, dtype=np.bool_),
+            np.ascontiguousarray(signals.weights, dtype=np.float64),
+            broker.side_multiplier("BUY"),
+            broker.side_multiplier("SELL"),
+            broker.config.commission_rate,
+            broker.config.min_commission,
+            broker.config.min_order_amount,
+            broker.MAX_POSITION_WEIGHT,
+            broker.MIN_CASH_RESERVE_RATIO,
+            float(self.portfolio.cash),
+        )
+
+        symbols = aligned.symbols
+        self.trades = [
+            FilledOrder(
+                symbol=symbols[j],
+                side=OrderSide.BUY if side == SIDE_BUY else OrderSide.SELL,
+                signal_price=float(aligned.prev_close[i, j]),
+                signal_date=aligned.prev_time[i],
+                fill_price=fill_price,
+                fill_date=self._times[i],
+                quantity=quantity,
+                commission=commission,
+            )
+            for i, j, side, quantity, fill_price, commission in zip(
+                trade_bar.tolist(),
+                trade_sym.tolist(),
+                trade_side.tolist(),
+                trade_qty.tolist(),
+                trade_price.tolist(),
+                trade_commission.tolist(),
+            )
+        ]
+        self.portfolio.reset(
+            float(final_cash),
+            {
+                symbols[j]: Position(
+                    symbol=symbols[j],
+                    quantity=int(qty[j]),
+                    avg_price=float(avg_price[j]),
+                    current_price=float(price[j]),
+                )
+                for j in np.flatnonzero(qty > 0).tolist()
+            },
+        )
+
+        self.equity_arr = equity
+        self.cash_arr = cash
+        logger.info("벡터 커널 실행 완료: %d봉, 체결 %d건", len(self._times), len(self.trades))
+
+        if self.on_progress:
+            self.on_progress(100)
+
+        return {
+            "trades": self.trades,
+            "equity_curve": self._equity_frame(),
+            "final_equity": float(equity[-1]),
+        }
+
+    def _fill_orders(self, orders: List[PendingOrder], i: int) -> None:
+        """주문 체결 처리 (i번째 봉의 시가 기준)"""
         for order in orders:
-            df = self.data.get(order.symbol)
-            if df is None or current_time not in df.index:
-                logger.warning(f"종목 {order.symbol}의 데이터가 없어 주문 취소")
+            j = self._symbol_index.get(order.symbol)
+            if j is None:
+                logger.warning("종목 %s의 데이터가 없어 주문 취소", order.symbol)
                 continue
 
-            row = df.loc[current_time]
-            next_open = row["open"]
+            # NumPy 스칼라(float32일 수 있음)를 Python float로 바꿔 현금 계산 정밀도 유지
+            next_open = float(self._bars.open[i, j])
 
             # 매도: 포지션 없으면 스킵
             if order.side == OrderSide.SELL:
                 pos = self.portfolio.get_position(order.symbol)
                 if pos is None:
-                    logger.warning(f"{order.symbol} 포지션 없음 → 매도 주문 취소")
+                    logger.warning("%s 포지션 없음 → 매도 주문 취소", order.symbol)
                     continue
 
             # 체결가 결정
             fill_price = self.broker.calculate_fill_price(next_open, order.side.value)
 
             if order.side == OrderSide.BUY:
-                self._fill_buy(order, fill_price, current_time)
+                self._fill_buy(order, fill_price, i, j)
             else:
-                self._fill_sell(order, fill_price, current_time)
+                self._fill_sell(order, fill_price, i, j)
 
-    def _fill_buy(self, order: PendingOrder, fill_price: float, fill_time) -> None:
+    def _fill_buy(self, order: PendingOrder, fill_price: float, i: int, j: int) -> None:
         """매수 주문 체결"""
         pos = self.portfolio.get_position(order.symbol)
         current_value = pos.market_value if pos else 0
@@ -150,39 +377,40 @@ class BacktestEngine:
             self.portfolio.equity, order.weight, fill_price, current_value
         )
         if quantity == 0:
-            logger.info(f"{order.symbol} 매수 수량 0 → 주문 취소")
+            logger.info("%s 매수 수량 0 → 주문 취소", order.symbol)
             return
 
         valid, reason = self.broker.validate_order(
             self.portfolio.equity, self.portfolio.cash, fill_price, quantity
         )
         if not valid:
-            logger.info(f"{order.symbol} 매수 주문 거부: {reason}")
+            logger.info("%s 매수 주문 거부: %s", order.symbol, reason)
             return
 
         commission = self.broker.calculate_commission(fill_price, quantity)
         self.portfolio.execute_buy(order.symbol, quantity, fill_price, commission)
 
-        # 시그널 가격: 이전 봉의 종가 (주문 생성 시점)
-        signal_price = self._get_prev_close(order.symbol, fill_time)
-
+        # 시그널 가격/시각: 이전 봉의 종가 (주문 생성 시점)
         filled = FilledOrder(
             symbol=order.symbol,
             side=OrderSide.BUY,
-            signal_price=signal_price,
-            signal_date=self._get_prev_time(fill_time),
+            signal_price=float(self._bars.prev_close[i, j]),
+            signal_date=self._bars.prev_time[i],
             fill_price=fill_price,
-            fill_date=fill_time,
+            fill_date=self._times[i],
             quantity=quantity,
             commission=commission,
         )
         self.trades.append(filled)
         logger.info(
-            f"매수 체결: {order.symbol} {quantity}주 @ {fill_price:.2f} "
-            f"(수수료: {commission:.2f})"
+            "매수 체결: %s %d주 @ %.2f (수수료: %.2f)",
+            order.symbol,
+            quantity,
+            fill_price,
+            commission,
         )
 
-    def _fill_sell(self, order: PendingOrder, fill_price: float, fill_time) -> None:
+    def _fill_sell(self, order: PendingOrder, fill_price: float, i: int, j: int) -> None:
         """매도 주문 체결"""
         pos = self.portfolio.get_position(order.symbol)
         quantity = pos.quantity  # 전량 매도
@@ -190,37 +418,21 @@ class BacktestEngine:
         commission = self.broker.calculate_commission(fill_price, quantity)
         self.portfolio.execute_sell(order.symbol, quantity, fill_price, commission)
 
-        signal_price = self._get_prev_close(order.symbol, fill_time)
-
         filled = FilledOrder(
             symbol=order.symbol,
             side=OrderSide.SELL,
-            signal_price=signal_price,
-            signal_date=self._get_prev_time(fill_time),
+            signal_price=float(self._bars.prev_close[i, j]),
+            signal_date=self._bars.prev_time[i],
             fill_price=fill_price,
-            fill_date=fill_time,
+            fill_date=self._times[i],
             quantity=quantity,
             commission=commission,
         )
         self.trades.append(filled)
         logger.info(
-            f"매도 체결: {order.symbol} {quantity}주 @ {fill_price:.2f} "
-            f"(수수료: {commission:.2f})"
+            "매도 체결: %s %d주 @ %.2f (수수료: %.2f)",
+            order.symbol,
+            quantity,
+            fill_price,
+            commission,
         )
-
-    def _get_prev_close(self, symbol: str, current_time) -> float:
-        """현재 봉 기준 이전 봉의 종가 반환"""
-        df = self.data[symbol]
-        idx = df.index.get_loc(current_time)
-        if idx > 0:
-            return df.iloc[idx - 1]["close"]
-        return df.iloc[0]["close"]
-
-    def _get_prev_time(self, current_time):
-        """현재 봉 기준 이전 봉의 시간 반환"""
-        # 첫 번째 데이터의 인덱스를 기준으로
-        first_df = next(iter(self.data.values()))
-        idx = first_df.index.get_loc(current_time)
-        if idx > 0:
-            return first_df.index[idx - 1]
-        return first_df.index[0]
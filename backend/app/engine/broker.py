@@ -1,5 +1,7 @@
 import math
-from typing import Optional, Tuple
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
 
 from app.config import MARKET_CONFIGS, MarketConfig
 from app.db.models import TimeframeType
@@ -20,23 +22,42 @@ class Broker:
         self.config: MarketConfig = MARKET_CONFIGS[market]
         self.timeframe = timeframe
 
+        # 체결마다 분기하지 않도록 슬리피지와 매수/매도 배수를 미리 계산
+        if timeframe == TimeframeType.D1:
+            self._slippage = self.config.slippage_daily
+        else:
+            self._slippage = self.config.slippage_hourly
+        self._side_mult = {
+            "BUY": 1 + self._slippage,  # 매수: 불리하게 (시가보다 높게)
+            "SELL": 1 - self._slippage,  # 매도: 불리하게 (시가보다 낮게)
+        }
+
     def get_slippage(self) -> float:
-        if self.timeframe == TimeframeType.D1:
-            return self.config.slippage_daily
-        return self.config.slippage_hourly
+        return self._slippage
+
+    def side_multiplier(self, side: str) -> float:
+        """체결가 = 다음 봉 시가 × side_multiplier(side)"""
+        return self._side_mult[side]
 
     def calculate_fill_price(self, next_open: float, side: str) -> float:
-        """다음 봉 시가 + 슬리피지로 체결가 결정"""
-        slippage = self.get_slippage()
-        if side == "BUY":
-            return next_open * (1 + slippage)  # 매수: 불리하게
-        return next_open * (1 - slippage)  # 매도: 불리하게
+        """다음 봉 시가 + 슬리피지로 체결가 결정 (side: "BUY" | "SELL")"""
+        return next_open * self._side_mult[side]
 
     def calculate_commission(self, fill_price: float, quantity: int) -> float:
         """수수료 계산"""
         raw = fill_price * quantity * self.config.commission_rate
         return max(raw, self.config.min_commission)
 
+    def calculate_fill_prices(self, next_opens: np.ndarray, sides: Sequence[str]) -> np.ndarray:
+        """calculate_fill_price의 배열 버전 (주문 K건의 체결가를 한 번의 곱셈으로 계산)"""
+        mults = np.fromiter((self._side_mult[side] for side in sides), np.float64, len(sides))
+        return np.asarray(next_opens, dtype=np.float64) * mults
+
+    def calculate_commissions(self, fill_prices: np.ndarray, quantities: np.ndarray) -> np.ndarray:
+        """calculate_commission의 배열 버전 (스칼라 버전과 같은 연산 순서 → 같은 값)"""
+        raw = np.asarray(fill_prices, dtype=np.float64) * quantities * self.config.commission_rate
+        return np.maximum(raw, self.config.min_commission)
+
     def calculate_quantity(
         self,
         portfolio_equity: float,
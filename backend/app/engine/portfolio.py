@@ -1,20 +1,36 @@
-from typing import Dict, Optional
+from typing import Dict, Optional, Sequence
 
 from app.engine.position import Position
 
 
 class Portfolio:
-    """포트폴리오 관리"""
+    """
+    포트폴리오 관리.
+
+    포지션 평가액 합계는 매 조회마다 다시 더하지 않고 `_positions_value`에 유지한다.
+    시가평가 갱신은 변동분만 반영하고, 체결 시에는 전체를 다시 합산해 오차 누적을 막는다.
+    따라서 positions는 execute_buy/execute_sell/update_market_prices로만 변경해야 한다.
+    """
 
     def __init__(self, initial_capital: float):
         self.cash: float = initial_capital
         self.positions: Dict[str, Position] = {}
+        self._positions_value: float = 0.0
 
     @property
     def equity(self) -> float:
         """총 평가액 = 현금 + 모든 포지션 시가평가"""
-        position_value = sum(p.market_value for p in self.positions.values())
-        return self.cash + position_value
+        return self.cash + self._positions_value
+
+    def _revalue(self) -> None:
+        """포지션 평가액 합계를 처음부터 다시 계산"""
+        self._positions_value = sum(p.market_value for p in self.positions.values())
+
+    def reset(self, cash: float, positions: Dict[str, Position]) -> None:
+        """현금/포지션을 통째로 교체 (벡터 커널 실행 결과 반영용)"""
+        self.cash = cash
+        self.positions = positions
+        self._revalue()
 
     def get_position(self, symbol: str) -> Optional[Position]:
         return self.positions.get(symbol)
@@ -27,10 +43,25 @@ class Portfolio:
         return pos.market_value / self.equity
 
     def update_market_prices(self, prices: Dict[str, float]) -> None:
-        """시가평가 갱신"""
+        """시가평가 갱신 (보유 종목의 평가액 변동분만 합계에 반영)"""
         for symbol, price in prices.items():
-            if symbol in self.positions:
-                self.positions[symbol].current_price = price
+            pos = self.positions.get(symbol)
+            if pos is not None:
+                before = pos.market_value
+                pos.current_price = price
+                self._positions_value += pos.market_value - before
+
+    def mark_to_market(self, closes: Sequence[float], symbol_index: Dict[str, int]) -> None:
+        """
+        종목 순서대로 정렬된 종가 행(closes[symbol_index[symbol]])으로 시가평가 갱신.
+        가격 딕셔너리를 만들지 않고 보유 종목만 순회한다.
+        """
+        for symbol, pos in self.positions.items():
+            j = symbol_index.get(symbol)
+            if j is not None:
+                before = pos.market_value
+                pos.current_price = closes[j]
+                self._positions_value += pos.market_value - before
 
     def execute_buy(
         self, symbol: str, quantity: int, fill_price: float, commission: float
@@ -51,6 +82,7 @@ class Portfolio:
                 avg_price=fill_price,
                 current_price=fill_price,
             )
+        self._revalue()
 
     def execute_sell(
         self, symbol: str, quantity: int, fill_price: float, commission: float
@@ -68,3 +100,4 @@ class Portfolio:
             del self.positions[symbol]
         else:
             pos.current_price = fill_price
+        self._revalue()
@@ -1,17 +1,29 @@
 """FastAPI 앱 엔트리포인트"""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.api.router import api_router
+from app.data.providers import kis_provider
 from app.utils.exceptions import BacktestError
 from app.utils.response import error_response
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # 공유 KIS 클라이언트의 커넥션 풀 정리
+    await kis_provider.close()
+
+
 app = FastAPI(
     title="Quant Backtest API",
     description="퀀트 기반 주식 투자 전략 백테스팅 시스템",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS (개발용)
@@ -1,15 +1,16 @@
 """Grid Search 기반 파라미터 최적화"""
 
 import itertools
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Type
 
 import numpy as np
 
 from app.analytics.performance import PerformanceMetrics
 from app.config import MARKET_CONFIGS
-from app.engine.backtest import BacktestEngine
+from app.engine.backtest import AlignedBars, BacktestEngine
 from app.engine.broker import Broker
-from app.strategies import get_strategy
+from app.strategies import get_strategy_cls
+from app.strategies.base import Strategy
 from app.utils.exceptions import TooManyCombinationsError
 from app.utils.logger import logger
 
@@ -58,6 +59,57 @@ def count_combinations(parameter_ranges: Dict[str, Dict[str, float]]) -> int:
     return count
 
 
+def evaluate_combination(
+    strategy_cls: Type[Strategy],
+    params: Dict[str, float],
+    data: Dict,
+    prepared: AlignedBars,
+    broker: Broker,
+    initial_capital: float,
+    trading_days: int,
+) -> Dict[str, Any]:
+    """
+    파라미터 조합 하나로 백테스트를 실행하고 성과 지표를 반환.
+    전략 클래스와 Broker(설정만 보관하는 무상태 객체)는 호출 측에서 한 번만 만들어 공유한다.
+    """
+    engine = BacktestEngine(
+        strategy=strategy_cls(params),
+        data=data,
+        broker=broker,
+        initial_capital=initial_capital,
+        prepared=prepared,
+    )
+    result = engine.run()
+
+    equity_curve_df = result["equity_curve"]
+    metrics: Dict[str, Any] = {"parameters": params}
+
+    if not equity_curve_df.empty:
+        equity_series = equity_curve_df["equity"]
+        metrics.update(PerformanceMetrics.summary(equity_series, trading_days=trading_days))
+        metrics["total_trades"] = len(result["trades"])
+        metrics["final_equity"] = result["final_equity"]
+    else:
+        metrics["total_return"] = 0
+        metrics["annual_return"] = 0
+        metrics["sharpe_ratio"] = 0
+        metrics["sortino_ratio"] = 0
+        metrics["max_drawdown"] = 0
+        metrics["total_trades"] = 0
+        metrics["final_equity"] = initial_capital
+
+    return metrics
+
+
+def select_top(
+    results: List[Dict[str, Any]], optimization_metric: str, top_n: int
+) -> List[Dict[str, Any]]:
+    """optimization_metric 기준 상위 top_n개 (max_drawdown은 절대값이 작을수록 좋으므로 오름차순)"""
+    reverse = optimization_metric != "max_drawdown"
+    ranked = sorted(results, key=lambda r: r.get(optimization_metric, 0) or 0, reverse=reverse)
+    return ranked[:top_n]
+
+
 def run_grid_search(
     strategy_name: str,
     combinations: List[Dict[str, float]],
@@ -73,63 +125,38 @@ def run_grid_search(
     Grid Search 실행.
 
     각 파라미터 조합으로 백테스트를 돌리고, optimization_metric 기준 상위 top_n개 반환.
+    데이터 정렬/행렬 변환(AlignedBars), 전략 클래스 조회, Broker 생성은 루프 밖에서 한 번만
+    수행해 모든 조합이 공유한다.
     """
     results = []
     total = len(combinations)
-    market_config = MARKET_CONFIGS[market]
-    trading_days = market_config.trading_days_per_year
+    trading_days = MARKET_CONFIGS[market].trading_days_per_year
+    prepared = AlignedBars.from_frames(data)
+    strategy_cls = get_strategy_cls(strategy_name)
+    broker = Broker(market, timeframe)
+    last_pct = -1
 
     for i, params in enumerate(combinations):
         try:
-            strategy = get_strategy(strategy_name, params)
-            broker = Broker(market, timeframe)
-            engine = BacktestEngine(
-                strategy=strategy,
-                data=data,
-                broker=broker,
-                initial_capital=initial_capital,
-            )
-            result = engine.run()
-
-            equity_curve_df = result["equity_curve"]
-            metrics: Dict[str, Any] = {"parameters": params}
-
-            if not equity_curve_df.empty:
-                equity_series = equity_curve_df["equity"]
-                metrics["total_return"] = PerformanceMetrics.total_return(equity_series)
-                metrics["annual_return"] = PerformanceMetrics.annual_return(
-                    equity_series, trading_days
-                )
-                metrics["sharpe_ratio"] = PerformanceMetrics.sharpe_ratio(
-                    equity_series, trading_days=trading_days
-                )
-                metrics["sortino_ratio"] = PerformanceMetrics.sortino_ratio(
-                    equity_series, trading_days=trading_days
+            results.append(
+                evaluate_combination(
+                    strategy_cls,
+                    params,
+                    data,
+                    prepared,
+                    broker,
+                    initial_capital,
+                    trading_days,
                 )
-                metrics["max_drawdown"] = PerformanceMetrics.max_drawdown(equity_series)
-                metrics["total_trades"] = len(result["trades"])
-                metrics["final_equity"] = result["final_equity"]
-            else:
-                metrics["total_return"] = 0
-                metrics["annual_return"] = 0
-                metrics["sharpe_ratio"] = 0
-                metrics["sortino_ratio"] = 0
-                metrics["max_drawdown"] = 0
-                metrics["total_trades"] = 0
-                metrics["final_equity"] = initial_capital
-
-            results.append(metrics)
-
+            )
         except Exception as e:
             logger.warning("조합 %d/%d 실패 (params=%s): %s", i + 1, total, params, e)
             continue
 
         if on_progress:
-            pct = int((i + 1) / total * 100)
-            on_progress(pct)
-
-    # optimization_metric 기준 내림차순 정렬 (max_drawdown은 절대값이 작을수록 좋으므로 오름차순)
-    reverse = optimization_metric != "max_drawdown"
-    results.sort(key=lambda r: r.get(optimization_metric, 0) or 0, reverse=reverse)
+            pct = (i + 1) * 100 // total
+            if pct != last_pct:
+                last_pct = pct
+                on_progress(pct)
 
-    return results[:top_n]
+    return select_top(results, optimization_metric, top_n)
@@ -0,0 +1,180 @@
+"""
+Grid Search 병렬 실행 (프로세스 풀 + 공유 메모리 OHLCV)
+
+풀은 Celery와 함께 설치되는 billiard로 만든다. Celery prefork 워커의 자식 프로세스는
+daemonic이라 표준 multiprocessing/ProcessPoolExecutor로는 자식을 만들 수 없지만,
+billiard는 daemonic 프로세스 안에서도 풀을 띄울 수 있다.
+"""
+
+import os
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import billiard
+import numpy as np
+
+from app.config import MARKET_CONFIGS
+from app.engine.backtest import AlignedBars
+from app.engine.broker import Broker
+from app.optimizer.grid_search import evaluate_combination, run_grid_search, select_top
+from app.strategies import get_strategy_cls
+from app.utils.logger import logger
+
+# 공유 메모리로 넘기는 AlignedBars 행렬 필드 (나머지 필드는 워커 초기화 시 1회 피클링)
+_SHARED_FIELDS = ("open", "high", "low", "close", "volume", "prev_close")
+
+# 워커 프로세스 전역 상태 (_init_worker에서 설정)
+_worker: Dict[str, Any] = {}
+
+
+class _SharedBars:
+    """AlignedBars 행렬을 공유 메모리 블록에 복사하고, 워커가 붙을 수 있는 명세를 보관"""
+
+    def __init__(self, bars: AlignedBars):
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self.spec: Dict[str, tuple] = {}
+        try:
+            for field in _SHARED_FIELDS:
+                arr = np.ascontiguousarray(getattr(bars, field))
+                shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+                self._blocks.append(shm)
+                np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+                self.spec[field] = (shm.name, arr.shape, arr.dtype.str)
+        except Exception:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    부모가 만든 블록에 연결. 해제(unlink)는 부모 책임이므로 워커의 resource_tracker에는
+    등록하지 않는다 (워커 종료 시 블록이 먼저 지워지거나 누수 경고가 나는 것 방지).
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13: track 인자가 없어 연결만 해도 등록되므로 잠시 막는다
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def _init_worker(spec: Dict[str, tuple], symbols, index, prev_time, task: Dict[str, Any]) -> None:
+    """워커 시작 시 공유 메모리를 읽기 전용 ndarray로 감싸 AlignedBars를 재구성"""
+    blocks = []
+    arrays = {}
+    for field, (name, shape, dtype) in spec.items():
+        shm = _attach(name)
+        blocks.append(shm)
+        arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        arr.flags.writeable = False
+        arrays[field] = arr
+
+    _worker["blocks"] = blocks  # 버퍼가 살아 있도록 참조 유지
+    _worker["prepared"] = AlignedBars(
+        symbols=symbols,
+        index=index,
+        times=list(index),
+        prev_time=prev_time,
+        **arrays,
+    )
+    _worker["task"] = task
+    _worker["strategy_cls"] = get_strategy_cls(task["strategy_name"])
+    _worker["broker"] = Broker(task["market"], task["timeframe"])
+
+
+def _evaluate(job: Tuple[int, Dict[str, float]]) -> Tuple[int, Optional[Dict[str, Any]], str]:
+    """(조합 순번, 결과, 오류 메시지). 예외는 워커에서 잡아 나머지 조합 수집이 끊기지 않게 한다"""
+    i, params = job
+    task = _worker["task"]
+    try:
+        result = evaluate_combination(
+            _worker["strategy_cls"],
+            params,
+            {},
+            _worker["prepared"],
+            _worker["broker"],
+            task["initial_capital"],
+            task["trading_days"],
+        )
+    except Exception as e:
+        return i, None, str(e)
+    return i, result, ""
+
+
+def run_grid_search_parallel(
+    strategy_name: str,
+    combinations: List[Dict[str, float]],
+    data: Dict,
+    market: str,
+    timeframe: str,
+    initial_capital: float,
+    optimization_metric: str = "sharpe_ratio",
+    on_progress: Optional[Callable[[int], None]] = None,
+    top_n: int = 10,
+    n_workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    run_grid_search와 같은 결과를 프로세스 풀로 계산.
+
+    OHLCV 행렬은 공유 메모리에 한 번만 올리고 각 작업에는 파라미터만 전달한다.
+    n_workers가 None이면 CPU 코어 수, 1 이하(또는 조합이 1개)면 직렬 경로를 사용한다.
+    """
+    total = len(combinations)
+    n_workers = min(n_workers or os.cpu_count() or 1, total)
+    if n_workers <= 1:
+        return run_grid_search(
+            strategy_name=strategy_name,
+            combinations=combinations,
+            data=data,
+            market=market,
+            timeframe=timeframe,
+            initial_capital=initial_capital,
+            optimization_metric=optimization_metric,
+            on_progress=on_progress,
+            top_n=top_n,
+        )
+
+    prepared = AlignedBars.from_frames(data)
+    task = {
+        "strategy_name": strategy_name,
+        "market": market,
+        "timeframe": timeframe,
+        "initial_capital": initial_capital,
+        "trading_days": MARKET_CONFIGS[market].trading_days_per_year,
+    }
+    # 완료 순서와 무관하게 조합 순서대로 모아 직렬 실행과 같은 정렬 결과를 보장
+    results: List[Optional[Dict[str, Any]]] = [None] * total
+    last_pct = -1
+
+    shared = _SharedBars(prepared)
+    try:
+        with billiard.Pool(
+            processes=n_workers,
+            initializer=_init_worker,
+            initargs=(shared.spec, prepared.symbols, prepared.index, prepared.prev_time, task),
+        ) as pool:
+            jobs = pool.imap_unordered(_evaluate, enumerate(combinations))
+            for done, (i, result, error) in enumerate(jobs, start=1):
+                if error:
+                    logger.warning(
+                        "조합 %d/%d 실패 (params=%s): %s", i + 1, total, combinations[i], error
+                    )
+                else:
+                    results[i] = result
+                pct = done * 100 // total
+                if on_progress and pct != last_pct:
+                    last_pct = pct
+                    on_progress(pct)
+    finally:
+        shared.close()
+
+    return select_top([r for r in results if r is not None], optimization_metric, top_n)
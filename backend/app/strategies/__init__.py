@@ -1,4 +1,4 @@
-from typing import Any, Dict, Type
+from typing import Any, Dict, List, Type
 
 from .base import Strategy
 from .bollinger_bands import BollingerBandsStrategy
@@ -15,11 +15,21 @@ STRATEGY_REGISTRY: Dict[str, Type[Strategy]] = {
     "macd_crossover": MACDCrossoverStrategy,
 }
 
+# 전략 목록 API 응답용 (레지스트리는 런타임에 바뀌지 않으므로 import 시 한 번만 생성)
+STRATEGY_LIST: List[Dict[str, str]] = [
+    {"name": name, "class": cls.__name__} for name, cls in STRATEGY_REGISTRY.items()
+]
 
-def get_strategy(name: str, parameters: Dict[str, Any] = None) -> Strategy:
-    """전략 이름으로 인스턴스를 생성하여 반환."""
+
+def get_strategy_cls(name: str) -> Type[Strategy]:
+    """전략 이름으로 클래스를 반환 (반복 생성 시 조회를 한 번만 하기 위함)."""
     strategy_cls = STRATEGY_REGISTRY.get(name)
     if strategy_cls is None:
         available = ", ".join(STRATEGY_REGISTRY.keys())
         raise ValueError(f"Unknown strategy: '{name}'. Available: {available}")
-    return strategy_cls(parameters)
+    return strategy_cls
+
+
+def get_strategy(name: str, parameters: Dict[str, Any] = None) -> Strategy:
+    """전략 이름으로 인스턴스를 생성하여 반환."""
+    return get_strategy_cls(name)(parameters)
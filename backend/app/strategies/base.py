@@ -1,16 +1,36 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
 from app.engine.order import PendingOrder
 
+if TYPE_CHECKING:
+    from app.engine.backtest import AlignedBars
+
+
+@dataclass
+class VectorSignals:
+    """
+    전 구간 신호 행렬 (모양은 AlignedBars의 (봉 T, 종목 N)과 같음).
+    봉 t의 신호는 t+1 시가에 체결되며, 미보유 종목은 entries로 weights 비중 매수,
+    보유 종목은 exits로 전량 매도한다.
+    """
+
+    entries: np.ndarray  # bool
+    exits: np.ndarray  # bool
+    weights: np.ndarray  # float
+
 
 class Strategy(ABC):
     """
     전략 베이스 클래스.
 
-    - 다중 종목 지원: bars가 Dict[symbol, pd.Series]로 전달
+    - 다중 종목 지원: bars가 Dict[symbol, Bar]로 전달 (bar.close / bar["close"], pd.Series도 동일).
+      내장 전략은 __getitem__을 거치지 않는 속성 접근(bar.close)을 쓴다
     - 종목별 상태는 self._state[symbol]에 저장
     """
 
@@ -24,8 +44,14 @@ class Strategy(ABC):
             self._state[symbol] = self._init_state()
         return self._state[symbol]
 
+    def _history_window(self) -> Optional[int]:
+        """종목별 가격/거래량 이력에 보관할 최대 봉 수 (None이면 제한 없음). 파라미터로 정한다."""
+        return None
+
     def _init_state(self) -> Dict[str, Any]:
-        return {"price_history": [], "volume_history": []}
+        # deque(maxlen)이면 오래된 값이 자동으로 빠져 이력이 백테스트 길이만큼 자라지 않는다
+        window = self._history_window()
+        return {"price_history": deque(maxlen=window), "volume_history": deque(maxlen=window)}
 
     @abstractmethod
     def on_bar(
@@ -44,3 +70,12 @@ class Strategy(ABC):
             실행할 PendingOrder 리스트.
         """
         pass
+
+    def generate_signals(self, bars: "AlignedBars") -> Optional[VectorSignals]:
+        """
+        on_bar와 같은 결과를 내는 신호 행렬을 한 번에 계산 (선택 구현).
+
+        신호가 보유 여부 외의 포트폴리오 상태에 의존하지 않는 전략만 구현한다.
+        None을 반환하면 엔진은 봉마다 on_bar를 호출하는 기존 경로를 사용한다.
+        """
+        return None
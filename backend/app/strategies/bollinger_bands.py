@@ -1,11 +1,13 @@
 from typing import Any, Dict, List
 
+import numpy as np
 import pandas as pd
-import pandas_ta as ta
+from numpy.lib.stride_tricks import sliding_window_view
 
 from app.engine.order import OrderSide, PendingOrder
 
-from .base import Strategy
+from .base import Strategy, VectorSignals
+from .indicators import RollingStats
 
 
 class BollingerBandsStrategy(Strategy):
@@ -25,44 +27,47 @@ class BollingerBandsStrategy(Strategy):
             defaults.update(parameters)
         super().__init__(defaults)
 
+    def _init_state(self) -> Dict[str, Any]:
+        stats = RollingStats(self.parameters["bb_period"])
+        return {"price_history": stats.values, "stats": stats}
+
     def on_bar(
         self, bars: Dict[str, pd.Series], portfolio: "Portfolio"
     ) -> List[PendingOrder]:
         orders = []
-        bb_period = self.parameters["bb_period"]
         bb_std = self.parameters["bb_std"]
+        position_weight = self.parameters["position_weight"]
 
         for symbol, bar in bars.items():
-            state = self._get_state(symbol)
-            close = float(bar["close"])
-            state["price_history"].append(close)
+            stats = self._get_state(symbol)["stats"]
+            close = float(bar.close)
+            stats.push(close)
 
-            if len(state["price_history"]) < bb_period:
+            if not stats.full:
                 continue
 
-            series = pd.Series(state["price_history"][-bb_period:])
-            bb = ta.bbands(series, length=bb_period, std=bb_std)
-            if bb is None or bb.empty:
+            # 중심선 = 단순이동평균, 폭 = 표본 표준편차(ddof=1, pandas rolling std와 동일) × bb_std
+            mid, std = stats.mean_std(ddof=1)
+            if std == 0:  # 가격이 모두 같아 밴드가 한 점으로 모이면 판단하지 않음
                 continue
+            lower = mid - bb_std * std
+            upper = mid + bb_std * std
 
-            lower = bb.iloc[-1, 0]  # BBL
-            upper = bb.iloc[-1, 2]  # BBU
-
-            position = portfolio.get_position(symbol)
+            has_position = portfolio.get_position(symbol) is not None
 
             # 과매도 → 매수
-            if close <= lower and position is None:
+            if close <= lower and not has_position:
                 orders.append(
                     PendingOrder(
                         symbol=symbol,
                         side=OrderSide.BUY,
-                        weight=self.parameters["position_weight"],
+                        weight=position_weight,
                         reason=f"BB하단돌파: {close:.0f} <= {lower:.0f}",
                     )
                 )
 
             # 과매수 → 매도
-            elif close >= upper and position is not None:
+            elif close >= upper and has_position:
                 orders.append(
                     PendingOrder(
                         symbol=symbol,
@@ -73,3 +78,32 @@ class BollingerBandsStrategy(Strategy):
                 )
 
         return orders
+
+    def generate_signals(self, bars) -> VectorSignals:
+        """
+        on_bar의 밴드 돌파 조건을 모든 종목·봉에 대해 (봉 T, 종목 N) 행렬로 한 번에 계산.
+        가격이 모두 같은 윈도우(표준편차 0)는 on_bar와 같이 신호를 내지 않는다.
+        """
+        bb_period = int(self.parameters["bb_period"])
+        bb_std = self.parameters["bb_std"]
+        close = np.asarray(bars.close, dtype=np.float64)
+        n_bars, n_symbols = close.shape
+
+        entries = np.zeros((n_bars, n_symbols), dtype=np.bool_)
+        exits = np.zeros((n_bars, n_symbols), dtype=np.bool_)
+        if n_bars >= bb_period:
+            # (T - bb_period + 1, N, bb_period) 윈도우 뷰 (복사 없음)
+            windows = sliding_window_view(close, bb_period, axis=0)
+            mid = windows.mean(axis=-1)
+            std = windows.std(axis=-1, ddof=1)
+            # 윈도우 안에서 가격이 한 번이라도 바뀌었는지: 누적 변화 횟수의 차로 O(T·N)에 판정
+            # (윈도우마다 max/min을 훑는 O(T·N·bb_period) 대신)
+            changes = np.zeros((n_bars, n_symbols), dtype=np.int64)
+            np.cumsum(close[1:] != close[:-1], axis=0, out=changes[1:])
+            varying = changes[bb_period - 1 :] != changes[: n_bars - bb_period + 1]
+            current = close[bb_period - 1 :]
+            entries[bb_period - 1 :] = varying & (current <= mid - bb_std * std)
+            exits[bb_period - 1 :] = varying & (current >= mid + bb_std * std)
+
+        weights = np.full((n_bars, n_symbols), self.parameters["position_weight"], dtype=np.float64)
+        return VectorSignals(entries=entries, exits=exits, weights=weights)
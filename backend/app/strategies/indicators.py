@@ -0,0 +1,160 @@
+"""
+전략 공용 증분 지표.
+
+on_bar가 봉마다 전체 이력으로 지표를 다시 계산하지 않도록 종목 상태에 넣어 두고,
+새 봉의 값만 반영해 O(1)로 갱신한다.
+"""
+
+import math
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+
+class RollingStats:
+    """
+    고정 길이 윈도우의 이동 평균/표준편차.
+
+    합과 제곱합은 기준값(shift, 윈도우 첫 값)을 뺀 편차로 누적해 자릿수 손실을 줄이고,
+    윈도우가 한 바퀴 돌 때마다 윈도우 전체로 다시 합산해 오차가 쌓이지 않게 한다.
+    """
+
+    __slots__ = ("length", "values", "_shift", "_sum", "_sumsq", "_pushes")
+
+    # 분산이 편차 제곱 평균의 이 비율 이하이면 반올림 오차로 보고 윈도우를 다시 합산한다
+    _NEAR_ZERO = 1e-9
+
+    def __init__(self, length: int):
+        self.length = int(length)
+        self.values: Deque[float] = deque(maxlen=self.length)
+        self._shift = 0.0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._pushes = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.length
+
+    def push(self, value: float) -> None:
+        """새 값을 넣고, 윈도우가 가득 차 있으면 가장 오래된 값을 합계에서 뺀다."""
+        values = self.values
+        if not values:
+            self._shift = value
+        elif len(values) == self.length:
+            d = values[0] - self._shift
+            self._sum -= d
+            self._sumsq -= d * d
+
+        values.append(value)
+        self._pushes += 1
+        if self._pushes >= self.length:
+            self._resync()
+        else:
+            d = value - self._shift
+            self._sum += d
+            self._sumsq += d * d
+
+    def _resync(self) -> None:
+        """현재 윈도우 첫 값을 새 기준값으로 합/제곱합을 처음부터 다시 계산"""
+        self._pushes = 0
+        shift = self.values[0]
+        total = 0.0
+        total_sq = 0.0
+        for v in self.values:
+            d = v - shift
+            total += d
+            total_sq += d * d
+        self._shift = shift
+        self._sum = total
+        self._sumsq = total_sq
+
+    def mean_std(self, ddof: int = 0) -> Tuple[float, float]:
+        """
+        (평균, 표준편차). ddof는 numpy/pandas와 같은 의미 (분모 n - ddof).
+
+        모든 값이 같은 윈도우에서는 표준편차가 정확히 0, 평균은 그 값이 되도록
+        분산이 0에 가까우면 합계를 다시 계산한 뒤 판정한다.
+        """
+        n = len(self.values)
+        var = (self._sumsq - self._sum * self._sum / n) / (n - ddof)
+        if var <= self._NEAR_ZERO * self._sumsq / n:
+            if self._sumsq != 0.0:
+                self._resync()
+                var = (self._sumsq - self._sum * self._sum / n) / (n - ddof)
+            # 제곱합이 0이면 모든 편차가 0 (= 모든 값이 기준값과 같음)
+            if self._sumsq == 0.0 or var <= 0.0:
+                var = 0.0
+        return self._shift + self._sum / n, math.sqrt(var)
+
+
+class EMA:
+    """
+    단순이동평균으로 시작하는 지수이동평균 (pandas-ta ema(presma=True), TA-Lib EMA와 같은 정의).
+
+    처음 length개 값의 평균을 초기값으로 쓰고, 이후에는 alpha = 2 / (length + 1)로 갱신한다.
+    """
+
+    __slots__ = ("length", "alpha", "value", "_seed_count", "_seed_sum")
+
+    def __init__(self, length: int):
+        self.length = int(length)
+        self.alpha = 2.0 / (self.length + 1)
+        self.value: Optional[float] = None
+        self._seed_count = 0
+        self._seed_sum = 0.0
+
+    def push(self, x: float) -> Optional[float]:
+        """새 값을 반영하고 현재 EMA를 반환 (초기값이 정해지기 전에는 None)"""
+        if self.value is None:
+            self._seed_count += 1
+            self._seed_sum += x
+            if self._seed_count == self.length:
+                self.value = self._seed_sum / self.length
+        else:
+            self.value = self.alpha * x + (1.0 - self.alpha) * self.value
+        return self.value
+
+
+class RSI:
+    """
+    Wilder 평활(alpha = 1 / length) RSI.
+
+    pandas-ta rsi(talib 미사용)와 같게 첫 가격 변화를 초기 평균으로 두고 ewm(adjust=False)로
+    갱신한다. 가격이 length + 1개 모이기 전이나 상승/하락 평균이 모두 0이면 None.
+    """
+
+    __slots__ = ("length", "alpha", "avg_gain", "avg_loss", "_prev_close", "_count")
+
+    def __init__(self, length: int):
+        self.length = int(length)
+        self.alpha = 1.0 / self.length
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self._prev_close: Optional[float] = None
+        self._count = 0
+
+    def push(self, close: float) -> Optional[float]:
+        self._count += 1
+        prev = self._prev_close
+        self._prev_close = close
+        if prev is None:
+            return None
+
+        delta = close - prev
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        if self._count == 2:
+            self.avg_gain = gain
+            self.avg_loss = loss
+        else:
+            decay = 1.0 - self.alpha
+            self.avg_gain = decay * self.avg_gain + self.alpha * gain
+            self.avg_loss = decay * self.avg_loss + self.alpha * loss
+
+        total = self.avg_gain + self.avg_loss
+        if self._count <= self.length or total == 0:
+            return None
+        return 100.0 * self.avg_gain / total
@@ -1,11 +1,11 @@
 from typing import Any, Dict, List
 
 import pandas as pd
-import pandas_ta as ta
 
 from app.engine.order import OrderSide, PendingOrder
 
 from .base import Strategy
+from .indicators import EMA
 
 
 class MACDCrossoverStrategy(Strategy):
@@ -27,9 +27,13 @@ class MACDCrossoverStrategy(Strategy):
         super().__init__(defaults)
 
     def _init_state(self) -> Dict[str, Any]:
+        # 빠른/느린 기간이 뒤바뀌어 들어오면 pandas-ta와 같이 서로 바꿔 쓴다
+        fast, slow = sorted((self.parameters["fast_period"], self.parameters["slow_period"]))
         return {
-            "price_history": [],
-            "volume_history": [],
+            "bar_count": 0,
+            "ema_fast": EMA(fast),
+            "ema_slow": EMA(slow),
+            "ema_signal": EMA(self.parameters["signal_period"]),
             "prev_macd": None,
             "prev_signal": None,
         }
@@ -38,30 +42,24 @@ class MACDCrossoverStrategy(Strategy):
         self, bars: Dict[str, pd.Series], portfolio: "Portfolio"
     ) -> List[PendingOrder]:
         orders = []
-        fast = self.parameters["fast_period"]
-        slow = self.parameters["slow_period"]
-        signal_period = self.parameters["signal_period"]
-        min_bars = slow + signal_period
+        slow = max(self.parameters["fast_period"], self.parameters["slow_period"])
+        min_bars = slow + self.parameters["signal_period"]
+        position_weight = self.parameters["position_weight"]
 
         for symbol, bar in bars.items():
             state = self._get_state(symbol)
-            close = float(bar["close"])
-            state["price_history"].append(close)
+            close = float(bar.close)
+            state["bar_count"] += 1
 
-            if len(state["price_history"]) < min_bars:
+            # MACD = EMA(fast) - EMA(slow), 시그널 = MACD의 EMA (봉마다 O(1) 갱신)
+            fast_val = state["ema_fast"].push(close)
+            slow_val = state["ema_slow"].push(close)
+            if slow_val is None:
                 continue
+            macd_val = fast_val - slow_val
+            signal_val = state["ema_signal"].push(macd_val)
 
-            series = pd.Series(state["price_history"])
-            macd_df = ta.macd(series, fast=fast, slow=slow, signal=signal_period)
-            if macd_df is None or macd_df.empty:
-                continue
-
-            macd_val = macd_df.iloc[-1, 0]  # MACD line
-            signal_val = macd_df.iloc[-1, 2]  # Signal line
-
-            if pd.isna(macd_val) or pd.isna(signal_val):
-                state["prev_macd"] = None
-                state["prev_signal"] = None
+            if state["bar_count"] < min_bars:
                 continue
 
             prev_macd = state["prev_macd"]
@@ -73,21 +71,21 @@ class MACDCrossoverStrategy(Strategy):
             if prev_macd is None or prev_signal is None:
                 continue
 
-            position = portfolio.get_position(symbol)
+            has_position = portfolio.get_position(symbol) is not None
 
             # 골든크로스: MACD가 시그널선을 상향 돌파
-            if prev_macd <= prev_signal and macd_val > signal_val and position is None:
+            if prev_macd <= prev_signal and macd_val > signal_val and not has_position:
                 orders.append(
                     PendingOrder(
                         symbol=symbol,
                         side=OrderSide.BUY,
-                        weight=self.parameters["position_weight"],
+                        weight=position_weight,
                         reason=f"MACD골든크로스: {macd_val:.2f} > {signal_val:.2f}",
                     )
                 )
 
             # 데드크로스: MACD가 시그널선을 하향 돌파
-            elif prev_macd >= prev_signal and macd_val < signal_val and position is not None:
+            elif prev_macd >= prev_signal and macd_val < signal_val and has_position:
                 orders.append(
                     PendingOrder(
                         symbol=symbol,
@@ -2,10 +2,12 @@ from typing import Any, Dict, List
 
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 from app.engine.order import OrderSide, PendingOrder
 
-from .base import Strategy
+from .base import Strategy, VectorSignals
+from .indicators import RollingStats
 
 
 class MeanReversionStrategy(Strategy):
@@ -26,50 +28,88 @@ class MeanReversionStrategy(Strategy):
             defaults.update(parameters)
         super().__init__(defaults)
 
+    def _init_state(self) -> Dict[str, Any]:
+        stats = RollingStats(self.parameters["lookback_period"])
+        return {"price_history": stats.values, "stats": stats}
+
     def on_bar(
         self, bars: Dict[str, pd.Series], portfolio: "Portfolio"
     ) -> List[PendingOrder]:
         orders = []
-        lookback = self.parameters["lookback_period"]
+        entry_threshold = self.parameters["entry_threshold"]
+        exit_threshold = self.parameters["exit_threshold"]
+        position_weight = self.parameters["position_weight"]
 
         for symbol, bar in bars.items():
-            state = self._get_state(symbol)
-            close = float(bar["close"])
-            state["price_history"].append(close)
+            stats = self._get_state(symbol)["stats"]
+            close = float(bar.close)
+            stats.push(close)
 
-            if len(state["price_history"]) < lookback:
+            if not stats.full:
                 continue
 
-            prices = np.array(state["price_history"][-lookback:])
-            mean = np.mean(prices)
-            std = np.std(prices)
+            mean, std = stats.mean_std()
 
             if std == 0:
                 continue
 
             z_score = (close - mean) / std
-            position = portfolio.get_position(symbol)
+            has_position = portfolio.get_position(symbol) is not None
 
             # 과매도 → 매수
-            if z_score < -self.parameters["entry_threshold"] and position is None:
+            if z_score < -entry_threshold and not has_position:
                 orders.append(
                     PendingOrder(
                         symbol=symbol,
                         side=OrderSide.BUY,
-                        weight=self.parameters["position_weight"],
-                        reason=f"Z-Score={z_score:.2f} < -{self.parameters['entry_threshold']}",
+                        weight=position_weight,
+                        reason=f"Z-Score={z_score:.2f} < -{entry_threshold}",
                     )
                 )
 
             # 평균 회귀 → 매도
-            elif position and z_score > -self.parameters["exit_threshold"]:
+            elif has_position and z_score > -exit_threshold:
                 orders.append(
                     PendingOrder(
                         symbol=symbol,
                         side=OrderSide.SELL,
                         weight=1.0,
-                        reason=f"Z-Score={z_score:.2f} > -{self.parameters['exit_threshold']}",
+                        reason=f"Z-Score={z_score:.2f} > -{exit_threshold}",
                     )
                 )
 
         return orders
+
+    def generate_signals(self, bars) -> VectorSignals:
+        """
+        on_bar의 Z-Score 조건을 종목별 슬라이딩 윈도우로 한 번에 계산.
+        평균/표준편차는 np.mean/np.std로 구하므로 on_bar의 증분 계산과 반올림 수준에서만 다르다.
+        가격이 모두 같은 윈도우는 np.std가 0 대신 반올림 오차를 낼 수 있으므로
+        표준편차 대신 가격 변화 여부로 판정해 on_bar와 같이 신호를 내지 않는다.
+        """
+        lookback = int(self.parameters["lookback_period"])
+        entry = self.parameters["entry_threshold"]
+        exit_ = self.parameters["exit_threshold"]
+        close = bars.close
+        n_bars, n_symbols = close.shape
+
+        entries = np.zeros((n_bars, n_symbols), dtype=np.bool_)
+        exits = np.zeros((n_bars, n_symbols), dtype=np.bool_)
+        if n_bars >= lookback:
+            for j in range(n_symbols):
+                col = np.ascontiguousarray(close[:, j], dtype=np.float64)
+                windows = sliding_window_view(col, lookback)
+                mean = windows.mean(axis=1)
+                std = windows.std(axis=1)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    z_score = (col[lookback - 1 :] - mean) / std
+                # 윈도우 안에서 가격이 한 번이라도 바뀌었는지
+                # (BollingerBands와 같은 누적 변화 횟수 판정)
+                changes = np.zeros(n_bars, dtype=np.int64)
+                np.cumsum(col[1:] != col[:-1], out=changes[1:])
+                valid = changes[lookback - 1 :] != changes[: n_bars - lookback + 1]
+                entries[lookback - 1 :, j] = valid & (z_score < -entry)
+                exits[lookback - 1 :, j] = valid & (z_score > -exit_)
+
+        weights = np.full((n_bars, n_symbols), self.parameters["position_weight"], dtype=np.float64)
+        return VectorSignals(entries=entries, exits=exits, weights=weights)
@@ -1,6 +1,6 @@
+from collections import deque
 from typing import Any, Dict, List
 
-import numpy as np
 import pandas as pd
 
 from app.engine.order import OrderSide, PendingOrder
@@ -30,9 +30,10 @@ class MomentumBreakoutStrategy(Strategy):
         super().__init__(defaults)
 
     def _init_state(self) -> Dict[str, Any]:
+        # 이동평균 계산에 필요한 마지막 N봉만 보관
         return {
-            "price_history": [],
-            "volume_history": [],
+            "price_history": deque(maxlen=int(self.parameters["ma_period"])),
+            "volume_history": deque(maxlen=int(self.parameters["volume_ma_period"])),
             "entry_price": None,
         }
 
@@ -45,44 +46,37 @@ class MomentumBreakoutStrategy(Strategy):
         vol_threshold = self.parameters["volume_threshold"]
         stop_loss_pct = self.parameters["stop_loss_pct"]
         take_profit_pct = self.parameters["take_profit_pct"]
+        position_weight = self.parameters["position_weight"]
 
         for symbol, bar in bars.items():
             state = self._get_state(symbol)
-            close = float(bar["close"])
-            volume = float(bar["volume"])
+            close = float(bar.close)
+            volume = float(bar.volume)
 
             state["price_history"].append(close)
             state["volume_history"].append(volume)
 
-            position = portfolio.get_position(symbol)
+            has_position = portfolio.get_position(symbol) is not None
 
             # 보유 중이면 손절/익절 체크
-            if position is not None:
+            if has_position:
                 entry_price = state["entry_price"]
                 if entry_price is not None and entry_price > 0:
                     pnl_pct = (close - entry_price) / entry_price
 
-                    # 손절
-                    if pnl_pct <= -stop_loss_pct:
+                    # 손절/익절: 보유 봉 대부분은 둘 다 아니므로 한 번의 비교로 걸러내고,
+                    # 어느 쪽인지는 실제로 청산할 때만 가린다
+                    if pnl_pct <= -stop_loss_pct or pnl_pct >= take_profit_pct:
+                        if pnl_pct <= -stop_loss_pct:
+                            reason = f"손절: {pnl_pct:.2%} <= -{stop_loss_pct:.0%}"
+                        else:
+                            reason = f"익절: {pnl_pct:.2%} >= +{take_profit_pct:.0%}"
                         orders.append(
                             PendingOrder(
                                 symbol=symbol,
                                 side=OrderSide.SELL,
                                 weight=1.0,
-                                reason=f"손절: {pnl_pct:.2%} <= -{stop_loss_pct:.0%}",
-                            )
-                        )
-                        state["entry_price"] = None
-                        continue
-
-                    # 익절
-                    if pnl_pct >= take_profit_pct:
-                        orders.append(
-                            PendingOrder(
-                                symbol=symbol,
-                                side=OrderSide.SELL,
-                                weight=1.0,
-                                reason=f"익절: {pnl_pct:.2%} >= +{take_profit_pct:.0%}",
+                                reason=reason,
                             )
                         )
                         state["entry_price"] = None
@@ -97,11 +91,12 @@ class MomentumBreakoutStrategy(Strategy):
             if len(state["volume_history"]) < vol_ma_period:
                 continue
 
-            prices = np.array(state["price_history"][-ma_period:])
-            ma = np.mean(prices)
+            # 윈도우가 20봉 안팎이라 배열 변환 없이 deque를 바로 합산하는 편이 가장 빠르다
+            prices = state["price_history"]
+            ma = sum(prices) / len(prices)
 
-            volumes = np.array(state["volume_history"][-vol_ma_period:])
-            vol_ma = np.mean(volumes)
+            volumes = state["volume_history"]
+            vol_ma = sum(volumes) / len(volumes)
 
             # 현재가 > 이동평균 (돌파) & 거래량 > 평균 * threshold
             if vol_ma > 0 and close > ma and volume >= vol_ma * vol_threshold:
@@ -109,7 +104,7 @@ class MomentumBreakoutStrategy(Strategy):
                     PendingOrder(
                         symbol=symbol,
                         side=OrderSide.BUY,
-                        weight=self.parameters["position_weight"],
+                        weight=position_weight,
                         reason=f"MA돌파: {close:.0f}>{ma:.0f}, 거래량 {volume/vol_ma:.1f}x",
                     )
                 )
@@ -1,11 +1,11 @@
 from typing import Any, Dict, List
 
 import pandas as pd
-import pandas_ta as ta
 
 from app.engine.order import OrderSide, PendingOrder
 
 from .base import Strategy
+from .indicators import RSI
 
 
 class RSIStrategy(Strategy):
@@ -26,51 +26,44 @@ class RSIStrategy(Strategy):
             defaults.update(parameters)
         super().__init__(defaults)
 
+    def _init_state(self) -> Dict[str, Any]:
+        return {"rsi": RSI(self.parameters["rsi_period"])}
+
     def on_bar(
         self, bars: Dict[str, pd.Series], portfolio: "Portfolio"
     ) -> List[PendingOrder]:
         orders = []
-        rsi_period = self.parameters["rsi_period"]
+        oversold = self.parameters["oversold_threshold"]
+        overbought = self.parameters["overbought_threshold"]
+        position_weight = self.parameters["position_weight"]
 
         for symbol, bar in bars.items():
-            state = self._get_state(symbol)
-            close = float(bar["close"])
-            state["price_history"].append(close)
-
-            # RSI 계산에 최소 rsi_period + 1개 데이터 필요
-            if len(state["price_history"]) < rsi_period + 1:
-                continue
-
-            series = pd.Series(state["price_history"])
-            rsi_series = ta.rsi(series, length=rsi_period)
-            if rsi_series is None or rsi_series.empty:
-                continue
-
-            rsi_value = rsi_series.iloc[-1]
-            if pd.isna(rsi_value):
+            # RSI는 최소 rsi_period + 1개 가격이 모여야 값이 나온다 (그 전에는 None)
+            rsi_value = self._get_state(symbol)["rsi"].push(float(bar.close))
+            if rsi_value is None:
                 continue
 
-            position = portfolio.get_position(symbol)
+            has_position = portfolio.get_position(symbol) is not None
 
             # 과매도 → 매수
-            if rsi_value < self.parameters["oversold_threshold"] and position is None:
+            if rsi_value < oversold and not has_position:
                 orders.append(
                     PendingOrder(
                         symbol=symbol,
                         side=OrderSide.BUY,
-                        weight=self.parameters["position_weight"],
-                        reason=f"RSI과매도: {rsi_value:.1f} < {self.parameters['oversold_threshold']}",
+                        weight=position_weight,
+                        reason=f"RSI과매도: {rsi_value:.1f} < {oversold}",
                     )
                 )
 
             # 과매수 → 매도
-            elif rsi_value > self.parameters["overbought_threshold"] and position is not None:
+            elif rsi_value > overbought and has_position:
                 orders.append(
                     PendingOrder(
                         symbol=symbol,
                         side=OrderSide.SELL,
                         weight=1.0,
-                        reason=f"RSI과매수: {rsi_value:.1f} > {self.parameters['overbought_threshold']}",
+                        reason=f"RSI과매수: {rsi_value:.1f} > {overbought}",
                     )
                 )
 
@@ -1,37 +1,96 @@
+import atexit
 import logging
+import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from typing import Optional, Tuple
 
 from app.config import settings
 
+_FORMATTER = logging.Formatter(
+    "%(asctime)s | %(levelname)-8s | %(name)s:%(funcName)s:%(lineno)d | %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+
+# 실제 출력(콘솔/파일)은 백그라운드 QueueListener 스레드가 담당 (_start_listener에서 설정)
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+_output_handlers: Tuple[logging.Handler, ...] = ()
+
+
+def _start_listener() -> None:
+    """새 큐로 리스너 스레드를 시작"""
+    global _listener
+    log_queue: queue.Queue = queue.Queue(-1)
+    _queue_handler.queue = log_queue
+    _listener = QueueListener(log_queue, *_output_handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener() -> None:
+    """큐에 남은 레코드를 모두 출력한 뒤 리스너 스레드 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 
 def setup_logger(name: str = "quant_backtest") -> logging.Logger:
-    """애플리케이션 로거 설정"""
+    """
+    애플리케이션 로거 설정.
+
+    로깅 호출 스레드는 레코드를 큐에 넣기만 하고, 콘솔/파일 쓰기는 리스너 스레드가 처리해
+    백테스트 루프가 파일 I/O를 기다리지 않는다.
+    """
+    global _queue_handler, _output_handlers
     logger = logging.getLogger(name)
 
     if logger.handlers:
         return logger
 
     logger.setLevel(getattr(logging, settings.log_level.upper(), logging.INFO))
-
-    formatter = logging.Formatter(
-        "%(asctime)s | %(levelname)-8s | %(name)s:%(funcName)s:%(lineno)d | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
+    formatter = _FORMATTER
 
     # 콘솔 핸들러
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
 
-    # 파일 핸들러
+    # 파일 핸들러 (첫 레코드가 나올 때 파일을 연다)
     log_path = Path(settings.log_file)
     log_path.parent.mkdir(parents=True, exist_ok=True)
-    file_handler = logging.FileHandler(log_path, encoding="utf-8")
+    file_handler = logging.FileHandler(log_path, encoding="utf-8", delay=True)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+
+    _output_handlers = (console_handler, file_handler)
+    _queue_handler = QueueHandler(queue.Queue(-1))
+    logger.addHandler(_queue_handler)
+    _start_listener()
+    atexit.register(_stop_listener)
+    # fork(Celery prefork, 프로세스 풀 워커)로는 스레드가 복제되지 않으므로, 큐를 비우고 멈춘 뒤
+    # 부모/자식 양쪽에서 새 큐로 다시 시작한다 (큐 잠금을 잡은 채 fork되는 것도 방지)
+    os.register_at_fork(
+        before=_stop_listener, after_in_parent=_start_listener, after_in_child=_start_listener
+    )
 
     return logger
 
 
+def setup_sql_logger() -> None:
+    """
+    settings.sql_echo일 때만 SQLAlchemy 엔진 로거(실행 SQL)를 콘솔로 출력.
+    create_engine(echo=...)를 쓰지 않아 꺼져 있을 때는 쿼리마다 로그 문자열을 만들지 않는다.
+    """
+    if not settings.sql_echo:
+        return
+    sql_logger = logging.getLogger("sqlalchemy.engine")
+    if sql_logger.handlers:
+        return
+    sql_logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(_FORMATTER)
+    sql_logger.addHandler(handler)
+
+
 logger = setup_logger()
@@ -0,0 +1,53 @@
+"""numba `njit` 래퍼 (numba 미설치 시 원본 함수를 그대로 반환)"""
+
+import numpy as np
+
+try:
+    from numba import from_dtype as _from_dtype
+    from numba import njit as _numba_njit
+    from numba import types as _types
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - numba는 선택 의존성
+    _numba_njit = None
+    NUMBA_AVAILABLE = False
+
+
+def njit(*args, **kwargs):
+    """
+    `numba.njit`과 동일한 사용법을 지원하는 데코레이터.
+
+    - `@njit`, `@njit(cache=True)`, `@njit("sig", cache=True)` 형태 모두 허용
+    - 시그니처를 넘기면 import 시점에 즉시 컴파일된다 (cache=True면 디스크 캐시에서 로드)
+    - numba가 없으면 순수 Python 함수로 동작한다
+    """
+    if NUMBA_AVAILABLE:
+        return _numba_njit(*args, **kwargs)
+
+    # @njit 형태 (인자 없이 함수가 바로 전달됨)
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+
+    def decorator(func):
+        return func
+
+    return decorator
+
+
+def scalar_type(dtype):
+    """스칼라 인자의 numba 타입 (numba가 없으면 None)"""
+    if not NUMBA_AVAILABLE:
+        return None
+    return _from_dtype(np.dtype(dtype))
+
+
+def readonly_array(dtype, ndim: int):
+    """
+    C 연속 읽기 전용 배열의 numba 타입 (numba가 없으면 None — 어차피 시그니처는 무시됨).
+
+    쓰기 가능한 배열도 그대로 받으므로, 커널 입력을 읽기 전용으로 선언하면 pandas(CoW)가
+    돌려주는 배열이나 워커의 공유 메모리 행렬도 복사 없이 하나의 시그니처로 처리된다.
+    """
+    if not NUMBA_AVAILABLE:
+        return None
+    return _types.Array(scalar_type(dtype), ndim, "C", readonly=True)
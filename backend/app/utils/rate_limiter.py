@@ -0,0 +1,40 @@
+"""비동기 요청 속도 제한기"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Deque
+
+
+class AsyncRateLimiter:
+    """
+    `period`초 동안 최대 `max_rate`회만 통과시키는 슬라이딩 윈도우 제한기.
+
+    Semaphore는 동시 실행 개수만 제한하므로 짧은 요청은 초당 한도를 넘겨 버스트가 발생한다.
+    이 제한기는 최근 통과 시각을 기록해 한도를 넘으면 가장 오래된 기록이 만료될 때까지 대기한다.
+    """
+
+    def __init__(self, max_rate: int, period: float = 1.0):
+        self._max_rate = max_rate
+        self._period = period
+        self._timestamps: Deque[float] = deque()
+        # 대기 순서 보장 (먼저 온 요청이 먼저 통과)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._timestamps and now - self._timestamps[0] >= self._period:
+                    self._timestamps.popleft()
+                if len(self._timestamps) < self._max_rate:
+                    self._timestamps.append(now)
+                    return
+                await asyncio.sleep(self._period - (now - self._timestamps[0]))
+
+    async def __aenter__(self) -> "AsyncRateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
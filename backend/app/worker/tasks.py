@@ -1,16 +1,22 @@
 """Celery 비동기 태스크 정의"""
 
 import asyncio
+import time
 import traceback
 from datetime import datetime
+from typing import Any, Callable, Coroutine, Dict, List, Optional, TypeVar
 
+import numpy as np
 import pandas as pd
+from celery.signals import worker_process_shutdown
+from sqlalchemy.orm import Session
 
 from app.analytics.performance import PerformanceMetrics
-from app.config import MARKET_CONFIGS
+from app.config import settings
 from app.data.cache import CachedDataProvider
 from app.data.kis_api import KISDataProvider
-from app.db.models import Backtest, JobStatus, Trade
+from app.db.models import Backtest, JobStatus, MarketType, TimeframeType
+from app.db.repository import get_backtest, write_trades
 from app.db.session import SessionLocal
 from app.engine.backtest import BacktestEngine
 from app.engine.broker import Broker
@@ -18,13 +24,100 @@ from app.strategies import get_strategy
 from app.utils.logger import logger
 from app.worker.celery_app import celery_app
 
+# 진행률은 표시용이므로 이만큼(퍼센트 포인트) 오르거나 이 시간(초)이 지났을 때만 DB에 커밋한다
+PROGRESS_COMMIT_STEP = 10
+PROGRESS_COMMIT_INTERVAL = 2.0
+
+T = TypeVar("T")
+
+# 워커 프로세스마다 하나씩 유지하는 이벤트 루프와 KIS 클라이언트
+# (prefork: 프로세스당 태스크 1개씩 실행).
+# httpx 연결 풀/토큰/레이트 리미터는 이벤트 루프에 묶이므로 태스크마다 asyncio.run으로 새 루프를
+# 만들지 않고 같은 루프에서 재사용해 keep-alive 연결과 TLS 세션을 태스크 간에 유지한다.
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_kis_client: Optional[KISDataProvider] = None
+
+
+def _run_async(coro: Coroutine[Any, Any, T]) -> T:
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
+
+
+def _get_kis_client() -> KISDataProvider:
+    global _kis_client
+    if _kis_client is None:
+        _kis_client = KISDataProvider()
+    return _kis_client
+
+
+@worker_process_shutdown.connect
+def _close_kis_client(**kwargs) -> None:
+    """워커 프로세스 종료 시 공유 KIS 클라이언트와 이벤트 루프 정리"""
+    global _loop, _kis_client
+    if _loop is None:
+        return
+    if _kis_client is not None:
+        _run_async(_kis_client.close())
+        _kis_client = None
+    _loop.close()
+    _loop = None
+
+
+def _collect_data(
+    db: Session,
+    symbols: List[str],
+    market: MarketType,
+    timeframe: TimeframeType,
+    start: datetime,
+    end: datetime,
+) -> Dict[str, pd.DataFrame]:
+    """
+    종목별 OHLCV 수집. 캐시는 한 번에 조회하고, 미스 종목만 동시에 API 호출한다.
+    KIS 클라이언트와 이벤트 루프는 워커 프로세스 공용을 쓴다 (_run_async, _get_kis_client).
+
+    Returns:
+        {symbol: timestamp 인덱스 DataFrame} (데이터가 없는 종목은 제외)
+    """
+    cached_provider = CachedDataProvider(_get_kis_client(), db)
+    fetched = _run_async(cached_provider.fetch_many(symbols, market, timeframe, start, end))
+
+    data = {}
+    for symbol, df in fetched.items():
+        if not df.empty:
+            if "timestamp" in df.columns:
+                df = df.set_index("timestamp")
+            data[symbol] = df
+    return data
+
+
+def _progress_committer(db: Session, record: Any) -> Callable[[int], None]:
+    """
+    record.progress를 갱신·커밋하는 진행률 콜백.
+    엔진/Grid Search는 퍼센트가 바뀔 때마다(최대 100회) 호출하므로 커밋 횟수를 다시 줄인다.
+    완료 시 progress=100은 호출자가 최종 커밋에서 기록한다.
+    """
+    last = {"pct": -PROGRESS_COMMIT_STEP, "t": 0.0}
+
+    def on_progress(pct: int) -> None:
+        now = time.monotonic()
+        if pct - last["pct"] < PROGRESS_COMMIT_STEP and now - last["t"] < PROGRESS_COMMIT_INTERVAL:
+            return
+        last["pct"] = pct
+        last["t"] = now
+        record.progress = pct
+        db.commit()
+
+    return on_progress
+
 
 @celery_app.task(bind=True, name="run_backtest_task")
 def run_backtest_task(self, backtest_id: str) -> dict:
     """백테스팅 비동기 실행 태스크"""
     db = SessionLocal()
     try:
-        backtest = db.query(Backtest).filter(Backtest.id == backtest_id).first()
+        backtest = get_backtest(db, backtest_id)
         if not backtest:
             logger.error("Backtest not found: %s", backtest_id)
             return {"error": f"Backtest not found: {backtest_id}"}
@@ -38,24 +131,14 @@ def run_backtest_task(self, backtest_id: str) -> dict:
         strategy = get_strategy(backtest.strategy_name, backtest.parameters)
 
         # 데이터 수집
-        kis_client = KISDataProvider()
-        cached_provider = CachedDataProvider(kis_client, db)
-
-        data = {}
-        for symbol in backtest.symbols:
-            df = asyncio.get_event_loop().run_until_complete(
-                cached_provider.fetch_ohlcv(
-                    symbol=symbol,
-                    market=backtest.market,
-                    timeframe=backtest.timeframe,
-                    start=backtest.start_date,
-                    end=backtest.end_date,
-                )
-            )
-            if not df.empty:
-                if "timestamp" in df.columns:
-                    df = df.set_index("timestamp")
-                data[symbol] = df
+        data = _collect_data(
+            db,
+            backtest.symbols,
+            backtest.market,
+            backtest.timeframe,
+            backtest.start_date,
+            backtest.end_date,
+        )
 
         if not data:
             backtest.job_status = JobStatus.FAILED
@@ -66,9 +149,7 @@ def run_backtest_task(self, backtest_id: str) -> dict:
         # 엔진 실행
         broker = Broker(backtest.market.value, backtest.timeframe)
 
-        def on_progress(pct: int):
-            backtest.progress = pct
-            db.commit()
+        on_progress = _progress_committer(db, backtest)
 
         engine = BacktestEngine(
             strategy=strategy,
@@ -84,45 +165,32 @@ def run_backtest_task(self, backtest_id: str) -> dict:
         equity_curve_df = result["equity_curve"]
         if not equity_curve_df.empty:
             equity_series = equity_curve_df["equity"]
-            market_config = MARKET_CONFIGS[backtest.market.value]
-            trading_days = market_config.trading_days_per_year
-
-            backtest.total_return = float(PerformanceMetrics.total_return(equity_series))
-            backtest.annual_return = float(
-                PerformanceMetrics.annual_return(equity_series, trading_days)
-            )
-            backtest.sharpe_ratio = float(
-                PerformanceMetrics.sharpe_ratio(equity_series, trading_days=trading_days)
-            )
-            backtest.sortino_ratio = float(
-                PerformanceMetrics.sortino_ratio(equity_series, trading_days=trading_days)
+            trading_days = broker.config.trading_days_per_year
+
+            summary = PerformanceMetrics.summary(equity_series, trading_days=trading_days)
+            backtest.total_return = float(summary["total_return"])
+            backtest.annual_return = float(summary["annual_return"])
+            backtest.sharpe_ratio = float(summary["sharpe_ratio"])
+            backtest.sortino_ratio = float(summary["sortino_ratio"])
+            backtest.max_drawdown = float(summary["max_drawdown"])
+
+            # equity_curve_data JSON 저장 (iterrows 없이 열 단위로 변환)
+            timestamps = [
+                ts.isoformat() if hasattr(ts, "isoformat") else str(ts)
+                for ts in equity_curve_df["timestamp"].tolist()
+            ]
+            backtest.equity_curve_data = (
+                equity_curve_df[["equity", "cash"]]
+                .astype(np.float64)
+                .assign(timestamp=timestamps)[["timestamp", "equity", "cash"]]
+                .to_dict("records")
             )
-            backtest.max_drawdown = float(PerformanceMetrics.max_drawdown(equity_series))
-
-            # equity_curve_data JSON 저장
-            curve_data = []
-            for _, row in equity_curve_df.iterrows():
-                ts = row["timestamp"]
-                if hasattr(ts, "isoformat"):
-                    ts_str = ts.isoformat()
-                else:
-                    ts_str = str(ts)
-                curve_data.append(
-                    {
-                        "timestamp": ts_str,
-                        "equity": float(row["equity"]),
-                        "cash": float(row["cash"]),
-                    }
-                )
-            backtest.equity_curve_data = curve_data
 
         # trades → Trade 레코드 저장 및 매매 지표 계산
-        engine_trades = result["trades"]
-        _save_trades(db, backtest, engine_trades)
+        trade_rows = write_trades(db, backtest.id, result["trades"])
 
-        # 매매 기반 지표 계산
-        trade_records = db.query(Trade).filter(Trade.backtest_id == backtest_id).all()
-        _calculate_trade_metrics(backtest, trade_records)
+        # 매매 기반 지표 계산 (저장한 행으로 바로 계산, 재조회 없음)
+        _calculate_trade_metrics(backtest, trade_rows)
 
         backtest.job_status = JobStatus.COMPLETED
         backtest.progress = 100
@@ -134,7 +202,7 @@ def run_backtest_task(self, backtest_id: str) -> dict:
     except Exception as e:
         logger.error("백테스트 실패: %s — %s", backtest_id, traceback.format_exc())
         try:
-            backtest = db.query(Backtest).filter(Backtest.id == backtest_id).first()
+            backtest = get_backtest(db, backtest_id)
             if backtest:
                 backtest.job_status = JobStatus.FAILED
                 backtest.job_error = str(e)
@@ -146,102 +214,31 @@ def run_backtest_task(self, backtest_id: str) -> dict:
         db.close()
 
 
-def _to_python_datetime(val):
-    """pandas Timestamp / numpy datetime64 → Python datetime"""
-    if val is None:
-        return None
-    if hasattr(val, "to_pydatetime"):
-        return val.to_pydatetime()
-    return val
-
-
-def _save_trades(db, backtest: Backtest, engine_trades: list) -> None:
-    """엔진 trades를 DB Trade 레코드로 변환·저장"""
-    from app.engine.order import OrderSide as EngineOrderSide
-
-    # BUY/SELL 쌍을 매칭하여 청산 정보도 기록
-    open_positions: dict = {}  # symbol → Trade DB record
-
-    for filled in engine_trades:
-        if filled.side == EngineOrderSide.BUY:
-            trade = Trade(
-                backtest_id=backtest.id,
-                symbol=filled.symbol,
-                side="BUY",
-                quantity=int(filled.quantity),
-                signal_price=float(filled.signal_price),
-                signal_date=_to_python_datetime(filled.signal_date),
-                fill_price=float(filled.fill_price),
-                fill_date=_to_python_datetime(filled.fill_date),
-                commission=float(filled.commission),
-            )
-            db.add(trade)
-            db.flush()
-            open_positions[filled.symbol] = trade
-
-        elif filled.side == EngineOrderSide.SELL:
-            buy_trade = open_positions.pop(filled.symbol, None)
-            if buy_trade:
-                buy_trade.exit_signal_price = float(filled.signal_price)
-                buy_trade.exit_fill_price = float(filled.fill_price)
-                buy_trade.exit_date = _to_python_datetime(filled.fill_date)
-                buy_trade.exit_commission = float(filled.commission)
-                # PnL 계산
-                buy_cost = float(buy_trade.fill_price) * buy_trade.quantity + float(
-                    buy_trade.commission
-                )
-                sell_revenue = (
-                    float(filled.fill_price) * filled.quantity - float(filled.commission)
-                )
-                buy_trade.pnl = float(sell_revenue - buy_cost)
-                buy_trade.pnl_percent = float(buy_trade.pnl / buy_cost) if buy_cost > 0 else 0.0
-                # 보유일수
-                if buy_trade.fill_date and filled.fill_date:
-                    delta = _to_python_datetime(filled.fill_date) - buy_trade.fill_date
-                    buy_trade.holding_days = delta.days
-            else:
-                # 매수 없이 매도만 있는 경우 (비정상)
-                trade = Trade(
-                    backtest_id=backtest.id,
-                    symbol=filled.symbol,
-                    side="SELL",
-                    quantity=int(filled.quantity),
-                    signal_price=float(filled.signal_price),
-                    signal_date=_to_python_datetime(filled.signal_date),
-                    fill_price=float(filled.fill_price),
-                    fill_date=_to_python_datetime(filled.fill_date),
-                    commission=float(filled.commission),
-                )
-                db.add(trade)
-
-    db.flush()
-
-
-def _calculate_trade_metrics(backtest: Backtest, trade_records: list) -> None:
-    """완료된 거래들로 매매 지표 계산"""
-    closed = [t for t in trade_records if t.pnl is not None]
-    backtest.total_trades = len(closed)
-
-    if not closed:
-        return
+def _calculate_trade_metrics(backtest: Backtest, trade_rows: list) -> None:
+    """완료된 거래들(write_trades가 반환한 행)로 매매 지표 계산"""
+    pnls = np.fromiter(
+        (row["pnl"] for row in trade_rows if row["pnl"] is not None), dtype=np.float64
+    )
+    backtest.total_trades = pnls.size
 
-    pnls = pd.DataFrame([{"pnl": float(t.pnl)} for t in closed])
-    backtest.win_rate = float(PerformanceMetrics.win_rate(pnls))
-    backtest.profit_factor = float(PerformanceMetrics.profit_factor(pnls))
-    backtest.max_consecutive_wins = int(PerformanceMetrics.max_consecutive(pnls, win=True))
-    backtest.max_consecutive_losses = int(PerformanceMetrics.max_consecutive(pnls, win=False))
+    if not pnls.size:
+        return
 
-    wins = [float(t.pnl) for t in closed if float(t.pnl) > 0]
-    losses = [float(t.pnl) for t in closed if float(t.pnl) <= 0]
-    backtest.avg_win = sum(wins) / len(wins) if wins else None
-    backtest.avg_loss = sum(losses) / len(losses) if losses else None
+    stats = PerformanceMetrics.trade_stats(pnls)
+    backtest.win_rate = float(stats["win_rate"])
+    backtest.profit_factor = float(stats["profit_factor"])
+    backtest.max_consecutive_wins = stats["max_consecutive_wins"]
+    backtest.max_consecutive_losses = stats["max_consecutive_losses"]
+    backtest.avg_win = stats["avg_win"]
+    backtest.avg_loss = stats["avg_loss"]
 
 
 @celery_app.task(bind=True, name="run_optimization_task")
 def run_optimization_task(self, optimization_id: str) -> dict:
     """파라미터 최적화 태스크"""
     from app.db.models import OptimizationResult
-    from app.optimizer.grid_search import generate_combinations, run_grid_search
+    from app.optimizer.grid_search import generate_combinations
+    from app.optimizer.parallel import run_grid_search_parallel
 
     db = SessionLocal()
     try:
@@ -255,25 +252,10 @@ def run_optimization_task(self, optimization_id: str) -> dict:
         opt.progress = 0
         db.commit()
 
-        # 데이터 수집 (run_backtest_task와 동일 패턴)
-        kis_client = KISDataProvider()
-        cached_provider = CachedDataProvider(kis_client, db)
-
-        data = {}
-        for symbol in opt.symbols:
-            df = asyncio.get_event_loop().run_until_complete(
-                cached_provider.fetch_ohlcv(
-                    symbol=symbol,
-                    market=opt.market,
-                    timeframe=opt.timeframe,
-                    start=opt.start_date,
-                    end=opt.end_date,
-                )
-            )
-            if not df.empty:
-                if "timestamp" in df.columns:
-                    df = df.set_index("timestamp")
-                data[symbol] = df
+        # 데이터 수집 (run_backtest_task와 동일)
+        data = _collect_data(
+            db, opt.symbols, opt.market, opt.timeframe, opt.start_date, opt.end_date
+        )
 
         if not data:
             opt.job_status = JobStatus.FAILED
@@ -284,11 +266,9 @@ def run_optimization_task(self, optimization_id: str) -> dict:
         # 조합 생성 및 Grid Search 실행
         combinations = generate_combinations(opt.parameter_ranges)
 
-        def on_progress(pct: int):
-            opt.progress = pct
-            db.commit()
+        on_progress = _progress_committer(db, opt)
 
-        top_results = run_grid_search(
+        top_results = run_grid_search_parallel(
             strategy_name=opt.strategy_name,
             combinations=combinations,
             data=data,
@@ -297,6 +277,7 @@ def run_optimization_task(self, optimization_id: str) -> dict:
             initial_capital=float(opt.initial_capital),
             optimization_metric=opt.optimization_metric,
             on_progress=on_progress,
+            n_workers=settings.optimizer_workers or None,
         )
 
         # 결과 저장 (float 변환으로 JSON 직렬화 보장)
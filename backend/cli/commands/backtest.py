@@ -1,8 +1,9 @@
 """backtest 명령어 (run / list / show)"""
 
 import asyncio
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional
 
 import numpy as np
 import pandas as pd
@@ -62,19 +63,20 @@ def _generate_sample_data(
 ) -> pd.DataFrame:
     """테스트/데모용 샘플 OHLCV 데이터 생성"""
     dates = pd.bdate_range(start, end)
-    np.random.seed(42)
+    # 전역 난수 상태를 건드리지 않는 독립 생성기, 정규 난수는 한 번에 (수익률, 고가, 저가) 3행
+    rng = np.random.default_rng(42)
     n = len(dates)
     base_price = 70000.0
-    returns = np.random.normal(0, 0.02, n)
-    prices = base_price * np.cumprod(1 + returns)
+    noise = rng.standard_normal((3, n))
+    prices = base_price * np.cumprod(1 + 0.02 * noise[0])
 
     df = pd.DataFrame(
         {
-            "open": prices * (1 + np.random.uniform(-0.01, 0.01, n)),
-            "high": prices * (1 + np.abs(np.random.normal(0, 0.015, n))),
-            "low": prices * (1 - np.abs(np.random.normal(0, 0.015, n))),
+            "open": prices * (1 + rng.uniform(-0.01, 0.01, n)),
+            "high": prices * (1 + 0.015 * np.abs(noise[1])),
+            "low": prices * (1 - 0.015 * np.abs(noise[2])),
             "close": prices,
-            "volume": np.random.randint(500000, 2000000, n),
+            "volume": rng.integers(500000, 2000000, n),
         },
         index=dates,
     )
@@ -166,12 +168,17 @@ def run(
         provider = KISDataProvider()
         cached = CachedDataProvider(provider, db)
 
+        async def _fetch():
+            try:
+                return await cached.fetch_many(symbol_list, market_type, tf, start_dt, end_dt)
+            finally:
+                await provider.close()
+
         data = {}
         with console.status("[bold green]데이터 수집 중..."):
-            for sym in symbol_list:
-                df = asyncio.get_event_loop().run_until_complete(
-                    cached.fetch_ohlcv(sym, market_type, tf, start_dt, end_dt)
-                )
+            # 이벤트 루프 하나에서 동시 조회 후 HTTP 클라이언트까지 닫는다
+            fetched = asyncio.run(_fetch())
+            for sym, df in fetched.items():
                 if not df.empty:
                     if "timestamp" in df.columns:
                         df = df.set_index("timestamp")
@@ -179,7 +186,6 @@ def run(
                     console.log(f"  {sym}: {len(df)}건 로드")
                 else:
                     console.log(f"  [yellow]{sym}: 데이터 없음 (건너뜀)[/yellow]")
-            asyncio.get_event_loop().run_until_complete(provider.close())
             db.close()
 
         if not data:
@@ -216,22 +222,22 @@ def _print_result(result: dict, initial_capital: float) -> None:
 
     # 성과 지표 계산
     if not equity_curve.empty and "equity" in equity_curve.columns:
-        eq = equity_curve["equity"]
-        total_ret = PerformanceMetrics.total_return(eq)
-        annual_ret = PerformanceMetrics.annual_return(eq)
-        sharpe = PerformanceMetrics.sharpe_ratio(eq)
-        sortino = PerformanceMetrics.sortino_ratio(eq)
-        mdd = PerformanceMetrics.max_drawdown(eq)
+        summary = PerformanceMetrics.summary(equity_curve["equity"])
+        total_ret = summary["total_return"]
+        annual_ret = summary["annual_return"]
+        sharpe = summary["sharpe_ratio"]
+        sortino = summary["sortino_ratio"]
+        mdd = summary["max_drawdown"]
     else:
         total_ret = annual_ret = sharpe = sortino = mdd = 0.0
 
     # 거래 통계
     if trades:
-        trades_df = _trades_to_df(trades)
-        wr = PerformanceMetrics.win_rate(trades_df)
-        pf = PerformanceMetrics.profit_factor(trades_df)
-        max_wins = PerformanceMetrics.max_consecutive(trades_df, win=True)
-        max_losses = PerformanceMetrics.max_consecutive(trades_df, win=False)
+        stats = PerformanceMetrics.trade_stats(_paired_pnls(trades))
+        wr = stats["win_rate"]
+        pf = stats["profit_factor"]
+        max_wins = stats["max_consecutive_wins"]
+        max_losses = stats["max_consecutive_losses"]
     else:
         wr = pf = 0.0
         max_wins = max_losses = 0
@@ -275,7 +281,7 @@ def _print_recent_trades(trades: list, limit: int = 10) -> None:
     for trade in trades[-limit:]:
         side_str = "[green]매수[/green]" if trade.side == OrderSide.BUY else "[red]매도[/red]"
         table.add_row(
-            str(trade.fill_date.date()) if hasattr(trade.fill_date, "date") else str(trade.fill_date)[:10],
+            _fmt_date(trade.fill_date),
             trade.symbol,
             side_str,
             str(trade.quantity),
@@ -287,20 +293,29 @@ def _print_recent_trades(trades: list, limit: int = 10) -> None:
     console.print(table)
 
 
-def _trades_to_df(trades: list) -> pd.DataFrame:
-    """FilledOrder 리스트를 거래 쌍(매수→매도) PnL DataFrame으로 변환"""
-    paired = []
-    buys = {}  # symbol -> list of buy trades
+def _paired_pnls(trades: list) -> np.ndarray:
+    """FilledOrder 리스트를 거래 쌍(매수→매도)별 PnL 배열로 변환 (종목별 FIFO 매칭)"""
+    # 쌍마다 매수/매도 체결이 하나씩 필요하므로 len(trades) // 2가 쌍 개수의 상한
+    pnls = np.empty(len(trades) // 2, dtype=np.float64)
+    n = 0
+    buys: Dict[str, Deque[FilledOrder]] = {}  # symbol -> 매수 체결 FIFO
 
     for t in trades:
         if t.side == OrderSide.BUY:
-            buys.setdefault(t.symbol, []).append(t)
+            buys.setdefault(t.symbol, deque()).append(t)
         elif t.side == OrderSide.SELL and buys.get(t.symbol):
-            buy = buys[t.symbol].pop(0)
-            pnl = (t.fill_price - buy.fill_price) * t.quantity - buy.commission - t.commission
-            paired.append({"pnl": pnl})
+            buy = buys[t.symbol].popleft()
+            pnls[n] = (t.fill_price - buy.fill_price) * t.quantity - buy.commission - t.commission
+            n += 1
+
+    return pnls[:n]
+
 
-    return pd.DataFrame(paired) if paired else pd.DataFrame(columns=["pnl"])
+def _fmt_date(value) -> str:
+    """YYYY-MM-DD 문자열 (datetime/pd.Timestamp는 날짜 부분, 그 외는 문자열 앞 10자)"""
+    if isinstance(value, datetime):
+        return str(value.date())
+    return str(value)[:10]
 
 
 def _color_pct(value: float) -> str:
@@ -344,7 +359,7 @@ def list_backtests(
                 ", ".join(bt.symbols) if bt.symbols else "-",
                 ret_str,
                 bt.job_status.value if bt.job_status else "-",
-                str(bt.created_at.date()) if bt.created_at else "-",
+                _fmt_date(bt.created_at) if bt.created_at else "-",
             )
 
         console.print(table)
@@ -1,14 +1,27 @@
 """FastAPI API 통합 테스트"""
 
+from datetime import datetime, timedelta
 from unittest.mock import MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, event
+from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.db.models import Base, Backtest, JobStatus, MarketType, TimeframeType
+from app.db.models import (
+    Backtest,
+    Base,
+    JobStatus,
+    MarketType,
+    OrderSide,
+    TimeframeType,
+    Trade,
+)
+from app.db.repository import get_backtest, get_backtest_with_trades, write_trades
+from app.engine.order import FilledOrder
+from app.engine.order import OrderSide as EngineOrderSide
 from app.db.session import get_db
 from app.main import app
 
@@ -76,6 +89,41 @@ VALID_BACKTEST = {
 }
 
 
+def _add_backtest_with_trades(session, n_trades: int = 2) -> str:
+    base = datetime(2024, 1, 1)
+    backtest = Backtest(
+        name="거래 포함",
+        strategy_name="mean_reversion",
+        parameters={},
+        market=MarketType.KR,
+        symbols=["005930"],
+        timeframe=TimeframeType.D1,
+        start_date=base,
+        end_date=base,
+        initial_capital=10_000_000,
+    )
+    session.add(backtest)
+    session.flush()
+    for i in range(n_trades):
+        session.add(
+            Trade(
+                backtest_id=backtest.id,
+                symbol="005930",
+                side=OrderSide.BUY,
+                quantity=10,
+                signal_price=70000,
+                signal_date=base + timedelta(days=i),
+                fill_price=70100,
+                fill_date=base + timedelta(days=i + 1),
+                commission=10,
+            )
+        )
+    session.commit()
+    backtest_id = backtest.id
+    session.expunge_all()
+    return backtest_id
+
+
 # ── POST /api/backtest ──
 
 
@@ -169,6 +217,72 @@ class TestListBacktests:
         assert len(body["data"]) == 2
         assert body["meta"]["page"] == 1
 
+    def test_list_keyset_pagination(self, client, test_session):
+        base = datetime(2024, 1, 1)
+        for i in range(5):
+            test_session.add(
+                Backtest(
+                    name=f"테스트 {i}",
+                    strategy_name="mean_reversion",
+                    parameters={},
+                    market=MarketType.KR,
+                    symbols=["005930"],
+                    timeframe=TimeframeType.D1,
+                    start_date=base,
+                    end_date=base,
+                    initial_capital=10_000_000,
+                    created_at=base + timedelta(days=i),
+                )
+            )
+        test_session.commit()
+
+        body = client.get("/api/backtest?limit=2").json()
+        assert [b["name"] for b in body["data"]] == ["테스트 4", "테스트 3"]
+
+        body = client.get(f"/api/backtest?limit=2&before={body['meta']['next_before']}").json()
+        assert [b["name"] for b in body["data"]] == ["테스트 2", "테스트 1"]
+
+        body = client.get(f"/api/backtest?limit=2&before={body['meta']['next_before']}").json()
+        assert [b["name"] for b in body["data"]] == ["테스트 0"]
+        assert body["meta"]["next_before"] is None
+        assert body["meta"]["next_before_id"] is None
+
+    def test_list_keyset_pagination_ties(self, client, test_session):
+        """created_at이 같은 행(일괄 생성)도 (created_at, id) 커서로 빠짐없이 한 번씩 조회"""
+        base = datetime(2024, 1, 1)
+        for i in range(5):
+            test_session.add(
+                Backtest(
+                    name=f"테스트 {i}",
+                    strategy_name="mean_reversion",
+                    parameters={},
+                    market=MarketType.KR,
+                    symbols=["005930"],
+                    timeframe=TimeframeType.D1,
+                    start_date=base,
+                    end_date=base,
+                    initial_capital=10_000_000,
+                    created_at=base,
+                )
+            )
+        test_session.commit()
+
+        seen = []
+        url = "/api/backtest?limit=2"
+        while True:
+            body = client.get(url).json()
+            seen.extend(b["id"] for b in body["data"])
+            meta = body["meta"]
+            if meta["next_before"] is None:
+                break
+            url = (
+                f"/api/backtest?limit=2&before={meta['next_before']}"
+                f"&before_id={meta['next_before_id']}"
+            )
+
+        assert len(seen) == 5
+        assert seen == sorted(set(seen), reverse=True)
+
 
 # ── GET /api/backtest/{id} ──
 
@@ -232,6 +346,105 @@ class TestDeleteBacktest:
         resp = client.delete("/api/backtest/nonexistent-id")
         assert resp.status_code == 404
 
+    def test_delete_cascades_trades(self, client, test_session):
+        backtest_id = _add_backtest_with_trades(test_session)
+
+        resp = client.delete(f"/api/backtest/{backtest_id}")
+        assert resp.status_code == 200
+        # 컬렉션을 읽지 않고 FK ON DELETE CASCADE로 거래 내역까지 삭제
+        assert test_session.query(Trade).count() == 0
+
+
+# ── 저장소 헬퍼 ──
+
+
+class TestRepository:
+    def test_get_backtest_with_trades(self, test_session):
+        backtest_id = _add_backtest_with_trades(test_session, n_trades=3)
+
+        backtest = get_backtest_with_trades(test_session, backtest_id)
+        assert backtest is not None
+        assert len(backtest.trades) == 3
+
+    def test_trade_prices_load_as_float(self, test_session):
+        """엔진/분석용 가격 컬럼은 Decimal이 아닌 float로 조회"""
+        backtest_id = _add_backtest_with_trades(test_session, n_trades=1)
+
+        trade = get_backtest_with_trades(test_session, backtest_id).trades[0]
+        assert type(trade.fill_price) is float
+        assert type(trade.commission) is float
+
+    def test_get_backtest_with_trades_not_found(self, test_session):
+        assert get_backtest_with_trades(test_session, "nonexistent-id") is None
+
+    def test_trades_lazy_load_raises(self, test_session):
+        backtest_id = _add_backtest_with_trades(test_session)
+
+        backtest = get_backtest(test_session, backtest_id)
+        with pytest.raises(InvalidRequestError):
+            backtest.trades
+
+    def test_get_backtest_with_trades_two_queries(self, test_engine, test_session):
+        backtest_id = _add_backtest_with_trades(test_session, n_trades=3)
+        statements = []
+
+        @event.listens_for(test_engine, "before_cursor_execute")
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        backtest = get_backtest_with_trades(test_session, backtest_id)
+        [t.symbol for t in backtest.trades]
+        event.remove(test_engine, "before_cursor_execute", count)
+        assert len(statements) == 2
+
+    def test_write_trades_pairs_and_chunks(self, test_engine, test_session):
+        backtest_id = _add_backtest_with_trades(test_session, n_trades=0)
+        base = datetime(2024, 1, 1)
+
+        def filled(symbol, side, day, price):
+            return FilledOrder(
+                symbol=symbol,
+                side=side,
+                signal_price=price,
+                signal_date=base + timedelta(days=day),
+                fill_price=price,
+                fill_date=base + timedelta(days=day + 1),
+                quantity=10,
+                commission=0.0,
+            )
+
+        orders = [
+            filled("A", EngineOrderSide.BUY, 0, 100.0),
+            filled("B", EngineOrderSide.BUY, 0, 50.0),
+            filled("A", EngineOrderSide.SELL, 4, 110.0),
+            filled("C", EngineOrderSide.SELL, 5, 10.0),  # 매수 없는 매도
+            filled("B", EngineOrderSide.BUY, 6, 60.0),
+        ]
+        inserts = []
+
+        @event.listens_for(test_engine, "before_cursor_execute")
+        def count(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("INSERT INTO trades"):
+                inserts.append(statement)
+
+        rows = write_trades(test_session, backtest_id, orders, chunk_size=2)
+        event.remove(test_engine, "before_cursor_execute", count)
+        test_session.commit()
+
+        assert len(rows) == 4
+        assert len(inserts) == 2  # 2행씩 청크
+        assert rows[0]["pnl"] == pytest.approx(100.0)
+        assert rows[0]["holding_days"] == 4
+
+        backtest = get_backtest_with_trades(test_session, backtest_id)
+        by_symbol = sorted((t.symbol, t.side.value, t.pnl is None) for t in backtest.trades)
+        assert by_symbol == [
+            ("A", "BUY", False),
+            ("B", "BUY", True),
+            ("B", "BUY", True),
+            ("C", "SELL", True),
+        ]
+
 
 # ── GET /api/strategies ──
 
@@ -279,6 +492,50 @@ class TestExportCSV:
         assert resp.status_code == 200
         assert "text/csv" in resp.headers["content-type"]
 
+    @patch("app.api.backtest.run_backtest_task")
+    def test_export_csv_header_only_without_trades(self, mock_task, client):
+        mock_task.delay = MagicMock()
+        resp = client.post("/api/backtest", json=VALID_BACKTEST)
+        job_id = resp.json()["data"]["job_id"]
+
+        resp = client.get(f"/api/backtest/{job_id}/export")
+        lines = resp.text.splitlines()
+        assert len(lines) == 1
+        assert lines[0].startswith("symbol,side,quantity")
+
+    def test_export_streams_trades_in_fill_order(self, client, test_session):
+        """yield_per(500) 배치 경계를 넘는 거래도 빠짐없이 체결 시각 순서로 스트리밍"""
+        backtest_id = _add_backtest_with_trades(test_session, n_trades=0)
+        base = datetime(2024, 1, 1)
+        orders = [
+            FilledOrder(
+                symbol="A",
+                side=EngineOrderSide.BUY if k % 2 == 0 else EngineOrderSide.SELL,
+                signal_price=100.0 + k,
+                signal_date=base + timedelta(days=k),
+                fill_price=100.0 + k,
+                fill_date=base + timedelta(days=k + 1),
+                quantity=10,
+                commission=0.0,
+            )
+            for k in range(1_200)
+        ]
+        write_trades(test_session, backtest_id, orders)
+        test_session.commit()
+
+        resp = client.get(f"/api/backtest/{backtest_id}/export")
+        lines = resp.text.splitlines()
+
+        assert len(lines) == 1 + 600
+        fill_dates = [line.split(",")[6] for line in lines[1:]]
+        assert fill_dates == sorted(fill_dates)
+        assert fill_dates[0].startswith("2024-01-02")
+        assert lines[-1].split(",")[5] == "1298.0"
+
+    def test_export_not_found(self, client):
+        resp = client.get("/api/backtest/nonexistent-id/export")
+        assert resp.status_code == 404
+
 
 # ── POST /api/backtest/compare ──
 
@@ -298,10 +555,9 @@ VALID_COMPARE = {
 
 
 class TestCreateComparison:
+    @patch("app.api.compare.group")
     @patch("app.api.compare.run_backtest_task")
-    def test_create_success(self, mock_task, client):
-        mock_task.delay = MagicMock()
-
+    def test_create_success(self, mock_task, mock_group, client):
         resp = client.post("/api/backtest/compare", json=VALID_COMPARE)
         assert resp.status_code == 200
 
@@ -309,8 +565,9 @@ class TestCreateComparison:
         assert body["success"] is True
         assert body["data"]["status"] == "RUNNING"
         assert "job_id" in body["data"]
-        # 2개 전략이므로 2번 호출
-        assert mock_task.delay.call_count == 2
+        # 2개 전략이므로 2개 시그니처를 하나의 group으로 발행
+        assert mock_task.s.call_count == 2
+        mock_group.return_value.apply_async.assert_called_once()
 
     @patch("app.api.compare.run_backtest_task")
     def test_create_invalid_strategy(self, mock_task, client):
@@ -346,9 +603,9 @@ class TestCreateComparison:
 
 
 class TestGetComparison:
+    @patch("app.api.compare.group")
     @patch("app.api.compare.run_backtest_task")
-    def test_get_existing(self, mock_task, client):
-        mock_task.delay = MagicMock()
+    def test_get_existing(self, mock_task, mock_group, client):
         resp = client.post("/api/backtest/compare", json=VALID_COMPARE)
         comparison_id = resp.json()["data"]["job_id"]
 
@@ -360,15 +617,30 @@ class TestGetComparison:
         assert body["data"]["name"] == "전략 비교 테스트"
         assert len(body["data"]["results"]) == 2
 
+    @patch("app.api.compare.group")
+    @patch("app.api.compare.run_backtest_task")
+    def test_get_equity_curve_opt_in(self, mock_task, mock_group, client, test_session):
+        resp = client.post("/api/backtest/compare", json=VALID_COMPARE)
+        comparison_id = resp.json()["data"]["job_id"]
+        for b in test_session.query(Backtest).all():
+            b.equity_curve_data = [{"timestamp": "2024-01-02T00:00:00", "equity": 1.0}]
+        test_session.commit()
+
+        body = client.get(f"/api/backtest/compare/{comparison_id}").json()
+        assert all(r["equity_curve_data"] is None for r in body["data"]["results"])
+
+        body = client.get(f"/api/backtest/compare/{comparison_id}?include=equity_curve").json()
+        assert all(len(r["equity_curve_data"]) == 1 for r in body["data"]["results"])
+
     def test_get_not_found(self, client):
         resp = client.get("/api/backtest/compare/nonexistent-id")
         assert resp.status_code == 404
 
 
 class TestGetComparisonStatus:
+    @patch("app.api.compare.group")
     @patch("app.api.compare.run_backtest_task")
-    def test_status(self, mock_task, client):
-        mock_task.delay = MagicMock()
+    def test_status(self, mock_task, mock_group, client):
         resp = client.post("/api/backtest/compare", json=VALID_COMPARE)
         comparison_id = resp.json()["data"]["job_id"]
 
@@ -377,6 +649,25 @@ class TestGetComparisonStatus:
         body = resp.json()
         assert body["data"]["status"] in ["PENDING", "RUNNING"]
 
+    @patch("app.api.compare.group")
+    @patch("app.api.compare.run_backtest_task")
+    def test_status_aggregation(self, mock_task, mock_group, client, test_session):
+        resp = client.post("/api/backtest/compare", json=VALID_COMPARE)
+        comparison_id = resp.json()["data"]["job_id"]
+
+        # 1개 완료 → RUNNING 50%
+        backtests = test_session.query(Backtest).order_by(Backtest.strategy_name).all()
+        backtests[0].job_status = JobStatus.COMPLETED
+        test_session.commit()
+        body = client.get(f"/api/backtest/compare/{comparison_id}/status").json()
+        assert body["data"] == {"status": "RUNNING", "progress": 50}
+
+        # 1개 실패 → FAILED
+        backtests[1].job_status = JobStatus.FAILED
+        test_session.commit()
+        body = client.get(f"/api/backtest/compare/{comparison_id}/status").json()
+        assert body["data"] == {"status": "FAILED", "progress": 0}
+
 
 # ── Health Check ──
 
@@ -102,8 +102,12 @@ class TestBacktestRun:
         async def _fake_close():
             pass
 
+        async def _fake_fetch_many(symbols, *a, **kw):
+            return {sym: sample_df for sym in symbols}
+
         mock_cached = MagicMock()
         mock_cached.fetch_ohlcv = _fake_fetch
+        mock_cached.fetch_many = _fake_fetch_many
 
         mock_provider = MagicMock()
         mock_provider.close = _fake_close
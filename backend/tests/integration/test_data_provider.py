@@ -1,14 +1,17 @@
 """데이터 프로바이더 통합 테스트 (respx Mock 기반)"""
 
-import uuid
+import asyncio
+import os
 from datetime import datetime, timedelta
 
+import numpy as np
 import pandas as pd
 import pytest
 import respx
 from httpx import Response
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from app.data.cache import CachedDataProvider
 from app.data.kis_api import (
@@ -35,14 +38,44 @@ def kis_provider():
         app_key="test_key",
         app_secret="test_secret",
         base_url=KIS_BASE_URL,
+        use_token_cache=False,
     )
     return provider
 
 
+def _recent_day(days_ago=0):
+    """TTL이 적용되는 최근 구간의 날짜 (자정 기준)"""
+    day = datetime.utcnow() - timedelta(days=days_ago)
+    return day.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class _FakeTokenStore:
+    """Redis get/setex만 흉내내는 인메모리 저장소"""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+        self.ttls[key] = ttl
+
+    async def aclose(self):
+        pass
+
+
 @pytest.fixture
 def db_session():
     """인메모리 SQLite 세션"""
-    engine = create_engine("sqlite:///:memory:")
+    # 캐시 DB 호출은 asyncio.to_thread로 실행되므로 스레드 간 같은 연결을 공유
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
     Base.metadata.create_all(engine)
     Session = sessionmaker(bind=engine)
     session = Session()
@@ -142,6 +175,43 @@ class TestKISDataProvider:
         assert route.call_count == 1
         await kis_provider.close()
 
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_concurrent_token_single_issue(self, kis_provider):
+        """동시 첫 호출이 몰려도 토큰 발급 요청은 1회"""
+        route = respx.post(f"{KIS_BASE_URL}{TOKEN_URL}").mock(
+            return_value=_token_response()
+        )
+
+        tokens = await asyncio.gather(*(kis_provider._ensure_token() for _ in range(20)))
+
+        assert set(tokens) == {"mock_token_12345"}
+        assert route.call_count == 1
+        await kis_provider.close()
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_token_shared_across_instances(self):
+        """Redis에 저장된 토큰은 다른 인스턴스(프로세스 재시작)에서도 재사용"""
+        route = respx.post(f"{KIS_BASE_URL}{TOKEN_URL}").mock(
+            return_value=_token_response()
+        )
+        store = _FakeTokenStore()
+
+        first = KISDataProvider(app_key="k", app_secret="s", base_url=KIS_BASE_URL)
+        first._redis = store
+        await first._ensure_token()
+        assert store.ttls["kis_token"] == 86400 - 300
+
+        second = KISDataProvider(app_key="k", app_secret="s", base_url=KIS_BASE_URL)
+        second._redis = store
+        token = await second._ensure_token()
+
+        assert token == "mock_token_12345"
+        assert route.call_count == 1
+        await first.close()
+        await second.close()
+
     @pytest.mark.asyncio
     @respx.mock
     async def test_fetch_daily_ohlcv(self, kis_provider):
@@ -171,8 +241,69 @@ class TestKISDataProvider:
         assert list(df.columns) == ["timestamp", "open", "high", "low", "close", "volume"]
         assert df.iloc[0]["open"] == 70000.0
         assert df.iloc[2]["close"] == 73000.0
+        # 원화 가격은 float32로 손실 없이 저장
+        assert df["close"].dtype == np.float32
+        await kis_provider.close()
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_fetch_daily_windows_concurrent(self, kis_provider):
+        """긴 기간은 100일 구간으로 나눠 구간마다 한 번씩 요청하고 결과를 합침"""
+        respx.post(f"{KIS_BASE_URL}{TOKEN_URL}").mock(return_value=_token_response())
+
+        def _window_response(request):
+            # 각 구간의 시작/끝 날짜 2건 반환
+            d1 = request.url.params["FID_INPUT_DATE_1"]
+            d2 = request.url.params["FID_INPUT_DATE_2"]
+            return _daily_ohlcv_response(
+                [(d2, 100, 110, 90, 105, 1000), (d1, 100, 110, 90, 105, 1000)]
+            )
+
+        route = respx.get(f"{KIS_BASE_URL}{KR_DAILY_PRICE_URL}").mock(
+            side_effect=_window_response
+        )
+
+        df = await kis_provider.fetch_ohlcv(
+            symbol="005930",
+            market=MarketType.KR,
+            timeframe=TimeframeType.D1,
+            start=datetime(2024, 1, 1),
+            end=datetime(2024, 9, 1),
+        )
+
+        # 2024-01-01 ~ 2024-09-01 = 245일 → 3개 구간
+        assert route.call_count == 3
+        assert len(df) == 6
+        assert df["timestamp"].is_monotonic_increasing
+        assert df["timestamp"].iloc[0] == pd.Timestamp("2024-01-01")
+        assert df["timestamp"].iloc[-1] == pd.Timestamp("2024-09-01")
         await kis_provider.close()
 
+    @pytest.mark.parametrize(
+        "dates",
+        [
+            ["20240101", "20240102", "20240103"],  # 오름차순: 정렬 생략
+            ["20240103", "20240102", "20240101"],  # 내림차순: 뒤집기
+            ["20240102", "20240101", "20240103"],  # 뒤섞임: 정렬
+        ],
+    )
+    def test_to_dataframe_ascending(self, kis_provider, dates):
+        """입력 순서와 무관하게 timestamp 오름차순으로 반환"""
+        cols = {
+            "timestamp": dates,
+            "open": [d[-1] for d in dates],
+            "high": [d[-1] for d in dates],
+            "low": [d[-1] for d in dates],
+            "close": [d[-1] for d in dates],
+            "volume": ["1", "2", "3"],
+        }
+        df = kis_provider._to_dataframe(
+            cols, "%Y%m%d", datetime(2024, 1, 1), datetime(2024, 1, 3)
+        )
+
+        assert list(df["timestamp"].dt.day) == [1, 2, 3]
+        assert list(df["close"]) == [1.0, 2.0, 3.0]
+
     @pytest.mark.asyncio
     @respx.mock
     async def test_fetch_hourly_ohlcv(self, kis_provider):
@@ -345,6 +476,8 @@ class TestKISDataProviderUS:
         assert df.iloc[0]["open"] == 185.0
         assert df.iloc[2]["close"] == 188.5
         assert df.iloc[0]["volume"] == 5000000
+        # 달러 가격은 소수점 정밀도를 위해 float64 유지
+        assert df["close"].dtype == np.float64
         await kis_provider.close()
 
     @pytest.mark.asyncio
@@ -539,22 +672,22 @@ class TestCachedDataProvider:
     @pytest.mark.asyncio
     @respx.mock
     async def test_cache_expired(self, kis_provider, db_session):
-        """TTL 만료된 캐시는 무시하고 API 재호출"""
+        """최근 구간의 TTL 만료된 캐시는 무시하고 API 재호출"""
+        today = _recent_day()
         respx.post(f"{KIS_BASE_URL}{TOKEN_URL}").mock(return_value=_token_response())
 
         api_route = respx.get(f"{KIS_BASE_URL}{KR_DAILY_PRICE_URL}").mock(
             return_value=_daily_ohlcv_response(
-                [("20240101", 70000, 72000, 69000, 71000, 1000000)]
+                [(today.strftime("%Y%m%d"), 70000, 72000, 69000, 71000, 1000000)]
             )
         )
 
         # 만료된 캐시 데이터 수동 삽입
         expired_record = MarketData(
-            id=str(uuid.uuid4()),
             symbol="005930",
             market=MarketType.KR,
             timeframe=TimeframeType.D1,
-            timestamp=datetime(2024, 1, 1),
+            timestamp=today,
             open=70000,
             high=72000,
             low=69000,
@@ -571,8 +704,8 @@ class TestCachedDataProvider:
             symbol="005930",
             market=MarketType.KR,
             timeframe=TimeframeType.D1,
-            start=datetime(2024, 1, 1),
-            end=datetime(2024, 1, 1),
+            start=today,
+            end=today,
         )
 
         assert len(df) == 1
@@ -583,15 +716,15 @@ class TestCachedDataProvider:
     @respx.mock
     async def test_cache_upsert(self, kis_provider, db_session):
         """캐시 upsert: 동일 데이터는 업데이트"""
+        today = _recent_day()
         respx.post(f"{KIS_BASE_URL}{TOKEN_URL}").mock(return_value=_token_response())
 
         # 기존 캐시 삽입
         old_record = MarketData(
-            id=str(uuid.uuid4()),
             symbol="005930",
             market=MarketType.KR,
             timeframe=TimeframeType.D1,
-            timestamp=datetime(2024, 1, 1),
+            timestamp=today,
             open=70000,
             high=72000,
             low=69000,
@@ -605,7 +738,8 @@ class TestCachedDataProvider:
 
         respx.get(f"{KIS_BASE_URL}{KR_DAILY_PRICE_URL}").mock(
             return_value=_daily_ohlcv_response(
-                [("20240101", 70000, 72000, 69000, 71500, 1100000)]  # close, volume 변경
+                # close, volume 변경
+                [(today.strftime("%Y%m%d"), 70000, 72000, 69000, 71500, 1100000)]
             )
         )
 
@@ -614,8 +748,8 @@ class TestCachedDataProvider:
             symbol="005930",
             market=MarketType.KR,
             timeframe=TimeframeType.D1,
-            start=datetime(2024, 1, 1),
-            end=datetime(2024, 1, 1),
+            start=today,
+            end=today,
         )
 
         # 레코드 수는 여전히 1개 (upsert)
@@ -627,6 +761,222 @@ class TestCachedDataProvider:
         assert float(updated.close) == 71500.0  # 값 업데이트됨
         await kis_provider.close()
 
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_historical_cache_ignores_ttl(self, kis_provider, db_session):
+        """확정된 과거 구간은 fetched_at이 오래돼도 캐시 히트"""
+        api_route = respx.get(f"{KIS_BASE_URL}{KR_DAILY_PRICE_URL}").mock(
+            return_value=_daily_ohlcv_response([])
+        )
+        db_session.add(
+            MarketData(
+                symbol="005930",
+                market=MarketType.KR,
+                timeframe=TimeframeType.D1,
+                timestamp=datetime(2024, 1, 1),
+                open=70000,
+                high=72000,
+                low=69000,
+                close=71000,
+                volume=1000000,
+                fetched_at=datetime.utcnow() - timedelta(days=30),
+            )
+        )
+        db_session.commit()
+
+        cached = CachedDataProvider(kis_provider, db_session)
+        df = await cached.fetch_ohlcv(
+            symbol="005930",
+            market=MarketType.KR,
+            timeframe=TimeframeType.D1,
+            start=datetime(2024, 1, 1),
+            end=datetime(2024, 1, 1),
+        )
+
+        assert len(df) == 1
+        assert api_route.call_count == 0
+        await kis_provider.close()
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_trailing_edge_fetched_separately(self, kis_provider, db_session):
+        """캐시가 edge까지 닿지 않으면 마지막 캐시 봉 다음부터 API로 보충해 공백 없이 이어 붙임"""
+        respx.post(f"{KIS_BASE_URL}{TOKEN_URL}").mock(return_value=_token_response())
+        today = _recent_day()
+        old_day = _recent_day(10)
+        api_route = respx.get(f"{KIS_BASE_URL}{KR_DAILY_PRICE_URL}").mock(
+            return_value=_daily_ohlcv_response(
+                [
+                    (today.strftime("%Y%m%d"), 71000, 73000, 70000, 72500, 1200000),
+                    (_recent_day(3).strftime("%Y%m%d"), 71000, 72000, 70000, 71800, 1100000),
+                    (_recent_day(9).strftime("%Y%m%d"), 71000, 72000, 70000, 71200, 1000000),
+                ]
+            )
+        )
+        db_session.add(
+            MarketData(
+                symbol="005930",
+                market=MarketType.KR,
+                timeframe=TimeframeType.D1,
+                timestamp=old_day,
+                open=70000,
+                high=72000,
+                low=69000,
+                close=71000,
+                volume=1000000,
+                fetched_at=datetime.utcnow() - timedelta(days=5),
+            )
+        )
+        db_session.commit()
+
+        cached = CachedDataProvider(kis_provider, db_session)
+        df = await cached.fetch_ohlcv(
+            symbol="005930",
+            market=MarketType.KR,
+            timeframe=TimeframeType.D1,
+            start=old_day,
+            end=today,
+        )
+
+        # T-9..T-3 구간도 빠지지 않음
+        assert list(df["close"]) == [71000.0, 71200.0, 71800.0, 72500.0]
+        assert api_route.call_count == 1
+        # 마지막 캐시 봉(T-10) 다음 날부터 요청
+        params = api_route.calls.last.request.url.params
+        assert params["FID_INPUT_DATE_1"] == _recent_day(9).strftime("%Y%m%d")
+        assert params["FID_INPUT_DATE_2"] == today.strftime("%Y%m%d")
+        await kis_provider.close()
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_fetch_many_single_cache_query(self, kis_provider, db_session):
+        """fetch_many는 캐시를 한 번에 조회하고 미스 종목만 API 호출"""
+        respx.post(f"{KIS_BASE_URL}{TOKEN_URL}").mock(return_value=_token_response())
+        api_route = respx.get(f"{KIS_BASE_URL}{KR_DAILY_PRICE_URL}").mock(
+            return_value=_daily_ohlcv_response(
+                [("20240102", 50000, 51000, 49000, 50500, 500000)]
+            )
+        )
+        db_session.add(
+            MarketData(
+                symbol="005930",
+                market=MarketType.KR,
+                timeframe=TimeframeType.D1,
+                timestamp=datetime(2024, 1, 2),
+                open=70000,
+                high=72000,
+                low=69000,
+                close=71000,
+                volume=1000000,
+                fetched_at=datetime.utcnow(),
+            )
+        )
+        db_session.commit()
+
+        statements = []
+        engine = db_session.get_bind()
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        cached = CachedDataProvider(kis_provider, db_session)
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            result = await cached.fetch_many(
+                ["005930", "000660"],
+                MarketType.KR,
+                TimeframeType.D1,
+                datetime(2024, 1, 1),
+                datetime(2024, 1, 3),
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+        assert list(result) == ["005930", "000660"]
+        assert list(result["005930"]["close"]) == [71000.0]
+        assert list(result["000660"]["close"]) == [50500.0]
+        assert len([st for st in statements if st.startswith("SELECT")]) == 1
+        assert api_route.call_count == 1
+        assert api_route.calls.last.request.url.params["FID_INPUT_ISCD"] == "000660"
+        await kis_provider.close()
+
+    def test_upsert_single_statement(self, kis_provider, db_session):
+        """upsert는 행 수와 무관하게 INSERT … ON CONFLICT 한 번으로 처리 (행별 SELECT 없음)"""
+        timestamps = pd.date_range("2024-01-01", periods=250, freq="D")
+        df = pd.DataFrame(
+            {
+                "timestamp": timestamps,
+                "open": 100.0,
+                "high": 110.0,
+                "low": 90.0,
+                "close": 105.0,
+                "volume": 1000,
+            }
+        )
+        cached = CachedDataProvider(kis_provider, db_session)
+        # 절반은 기존 행 → 업데이트 대상
+        cached._upsert_cache(df.iloc[:125], "005930", MarketType.KR, TimeframeType.D1)
+
+        statements = []
+        engine = db_session.get_bind()
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            cached._upsert_cache(
+                df.assign(close=106.0), "005930", MarketType.KR, TimeframeType.D1
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+        assert len([st for st in statements if st.startswith("INSERT")]) == 1
+        assert not [st for st in statements if st.startswith("SELECT")]
+        assert db_session.query(MarketData).count() == 250
+        assert {float(r.close) for r in db_session.query(MarketData).all()} == {106.0}
+
+    @pytest.mark.asyncio
+    async def test_bulk_backfill_fallback_upsert(self, kis_provider, db_session):
+        """PostgreSQL이 아니면 bulk_backfill은 일반 upsert로 저장"""
+        df = pd.DataFrame(
+            {
+                "timestamp": pd.date_range("2024-01-01", periods=3, freq="D"),
+                "open": 100.0,
+                "high": 110.0,
+                "low": 90.0,
+                "close": 105.0,
+                "volume": 1000,
+            }
+        )
+        cached = CachedDataProvider(kis_provider, db_session)
+
+        assert await cached.bulk_backfill(df, "005930", MarketType.KR, TimeframeType.D1) == 3
+        assert await cached.bulk_backfill(df, "005930", MarketType.KR, TimeframeType.D1) == 3
+        assert db_session.query(MarketData).count() == 3
+
+    def test_copy_buffer_format(self):
+        """COPY CSV는 _COPY_COLUMNS 순서이며 Enum은 멤버 이름으로 기록"""
+        df = pd.DataFrame(
+            {
+                "timestamp": [pd.Timestamp("2024-01-02 09:00:00")],
+                "open": [185.25],
+                "high": [186.0],
+                "low": [184.5],
+                "close": [185.75],
+                "volume": [5000000],
+            }
+        )
+        buf = CachedDataProvider._copy_buffer(
+            df, "AAPL", MarketType.US, TimeframeType.H1, datetime(2024, 1, 3)
+        )
+        fields = buf.getvalue().strip().split(",")
+
+        assert len(fields) == 10
+        assert fields[:4] == ["AAPL", "US", "H1", "2024-01-02 09:00:00.000000"]
+        assert fields[4:9] == ["185.25", "186.0", "184.5", "185.75", "5000000"]
+        assert fields[9] == "2024-01-03 00:00:00.000000"
+
     @pytest.mark.asyncio
     @respx.mock
     async def test_search_symbols_delegates(self, kis_provider, db_session):
@@ -641,3 +991,104 @@ class TestCachedDataProvider:
         assert len(results) == 1
         assert results[0].symbol == "AAPL"
         await kis_provider.close()
+
+
+# ── ParquetCache 테스트 ──
+
+
+class _CountingProvider(DataProvider):
+    """요청 구간의 일봉을 생성하고 호출 구간을 기록하는 프로바이더"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def fetch_ohlcv(self, symbol, market, timeframe, start, end):
+        self.calls.append((start, end))
+        days = pd.date_range(start.date(), end.date(), freq="D")
+        return pd.DataFrame(
+            {
+                "timestamp": days,
+                "open": 100.0,
+                "high": 110.0,
+                "low": 90.0,
+                "close": 105.0,
+                "volume": 1000,
+            }
+        )
+
+    async def search_symbols(self, market, query):
+        return []
+
+
+class TestParquetCache:
+    @pytest.fixture(autouse=True)
+    def _require_pyarrow(self):
+        pytest.importorskip("pyarrow")
+
+    @pytest.mark.asyncio
+    async def test_miss_then_hit(self, tmp_path):
+        """미스 시 Parquet 파일 저장 → 같은 구간 재조회는 API 미호출"""
+        from app.data.parquet_cache import ParquetCache
+
+        upstream = _CountingProvider()
+        cache = ParquetCache(upstream, root=tmp_path)
+        args = (
+            "005930",
+            MarketType.KR,
+            TimeframeType.D1,
+            datetime(2024, 1, 1),
+            datetime(2024, 1, 10),
+        )
+
+        df1 = await cache.fetch_ohlcv(*args)
+        df2 = await cache.fetch_ohlcv(*args)
+
+        assert len(df1) == len(df2) == 10
+        assert len(upstream.calls) == 1
+        assert (tmp_path / "KR" / "005930" / "1d.parquet").exists()
+
+    @pytest.mark.asyncio
+    async def test_range_filter_and_merge(self, tmp_path):
+        """구간 필터 푸시다운 + 새 구간은 기존 파일에 병합"""
+        from app.data.parquet_cache import ParquetCache
+
+        upstream = _CountingProvider()
+        cache = ParquetCache(upstream, root=tmp_path)
+        await cache.fetch_ohlcv(
+            "005930", MarketType.KR, TimeframeType.D1, datetime(2024, 1, 1), datetime(2024, 1, 10)
+        )
+        await cache.fetch_ohlcv(
+            "005930", MarketType.KR, TimeframeType.D1, datetime(2024, 2, 1), datetime(2024, 2, 5)
+        )
+
+        df = await cache.fetch_ohlcv(
+            "005930", MarketType.KR, TimeframeType.D1, datetime(2024, 1, 5), datetime(2024, 1, 7)
+        )
+        assert list(df["timestamp"].dt.day) == [5, 6, 7]
+        assert len(upstream.calls) == 2
+        stored = pd.read_parquet(tmp_path / "KR" / "005930" / "1d.parquet")
+        assert len(stored) == 15
+        assert stored["timestamp"].is_monotonic_increasing
+
+    @pytest.mark.asyncio
+    async def test_stale_file_backfills_from_last_cached_bar(self, tmp_path):
+        """TTL이 지난 파일이 edge까지 닿지 않으면 마지막 캐시 봉 다음 날부터 보충"""
+        from app.data.parquet_cache import ParquetCache
+
+        upstream = _CountingProvider()
+        cache = ParquetCache(upstream, root=tmp_path)
+        await cache.fetch_ohlcv(
+            "005930", MarketType.KR, TimeframeType.D1, _recent_day(12), _recent_day(10)
+        )
+        # 파일 수정 시각을 TTL 밖으로 돌림
+        path = tmp_path / "KR" / "005930" / "1d.parquet"
+        stale = path.stat().st_mtime - 30 * 86400
+        os.utime(path, (stale, stale))
+
+        df = await cache.fetch_ohlcv(
+            "005930", MarketType.KR, TimeframeType.D1, _recent_day(12), _recent_day()
+        )
+
+        assert upstream.calls[-1] == (_recent_day(9), _recent_day())
+        assert len(df) == 13
+        assert df["timestamp"].is_monotonic_increasing
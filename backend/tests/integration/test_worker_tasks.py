@@ -0,0 +1,76 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import billiard
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Base, JobStatus, MarketType, OptimizationResult, TimeframeType
+from app.worker import tasks
+
+
+def _sample_data():
+    rng = np.random.default_rng(7)
+    dates = pd.date_range("2023-01-01", periods=120, freq="B")
+    data = {}
+    for symbol in ("005930", "000660"):
+        prices = 70_000 + np.cumsum(rng.normal(0, 700, 120))
+        data[symbol] = pd.DataFrame(
+            {
+                "open": prices,
+                "high": prices * 1.01,
+                "low": prices * 0.99,
+                "close": prices,
+                "volume": rng.integers(1000, 10000, 120),
+            },
+            index=dates,
+        )
+    return data
+
+
+class TestRunOptimizationTask:
+    def test_parallel_inside_prefork_child(self, tmp_path):
+        """Celery prefork 자식(daemonic 프로세스)에서 optimizer_workers > 1로 실행해도 완료"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'opt.db'}")
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+        with session_factory() as db:
+            opt = OptimizationResult(
+                strategy_name="mean_reversion",
+                market=MarketType.KR,
+                symbols=["005930", "000660"],
+                timeframe=TimeframeType.D1,
+                start_date=datetime(2023, 1, 1),
+                end_date=datetime(2023, 6, 30),
+                initial_capital=10_000_000,
+                optimization_metric="sharpe_ratio",
+                total_combinations=3,
+                parameter_ranges={"lookback_period": {"min": 10, "max": 20, "step": 5}},
+            )
+            db.add(opt)
+            db.commit()
+            optimization_id = opt.id
+
+        def child():
+            # fork로 시작하므로 패치한 세션 팩토리/설정이 자식 프로세스에도 그대로 적용됨
+            with (
+                patch.object(tasks, "SessionLocal", session_factory),
+                patch.object(tasks, "_collect_data", return_value=_sample_data()),
+                patch.object(tasks.settings, "optimizer_workers", 2),
+            ):
+                tasks.run_optimization_task(optimization_id)
+
+        proc = billiard.Process(target=child, daemon=True)
+        proc.start()
+        proc.join(timeout=120)
+
+        assert proc.exitcode == 0
+        with session_factory() as db:
+            opt = db.get(OptimizationResult, optimization_id)
+            assert opt.job_status == JobStatus.COMPLETED, opt.job_error
+            assert opt.progress == 100
+            assert len(opt.top_results) == 3
+        engine.dispose()
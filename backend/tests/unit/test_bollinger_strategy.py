@@ -82,6 +82,23 @@ class TestBollingerNoSignal:
         assert len(orders) == 0
 
 
+class TestBollingerBandWidth:
+    def test_bb_std_controls_band_width(self, portfolio):
+        # 같은 가격 경로라도 밴드 폭(bb_std)이 넓으면 하단 돌파가 아님
+        prices = [10000 + (i % 5 - 2) * 50 for i in range(19)] + [9850]
+        narrow = feed_prices(BollingerBandsStrategy({"bb_std": 1.0}), portfolio, "005930", prices)
+        wide = feed_prices(BollingerBandsStrategy({"bb_std": 3.0}), portfolio, "005930", prices)
+
+        assert len(narrow) == 1
+        assert narrow[0].side == OrderSide.BUY
+        assert wide == []
+
+    def test_no_signal_when_prices_flat(self, strategy, portfolio):
+        # 밴드가 한 점으로 모이면 (표준편차 0) 시그널 없음
+        orders = feed_prices(strategy, portfolio, "005930", [10000] * 25)
+        assert orders == []
+
+
 class TestBollingerDefaultParams:
     def test_defaults(self):
         s = BollingerBandsStrategy()
@@ -2,6 +2,7 @@ import pytest
 
 from app.db.models import TimeframeType
 from app.engine.broker import Broker
+from app.engine.order import OrderSide
 
 
 class TestBrokerCommission:
@@ -70,6 +71,14 @@ class TestBrokerSlippage:
         # 70,000 × (1 - 0.001) = 69,930
         assert fill == pytest.approx(69_930.0)
 
+    def test_fill_price_accepts_order_side_enum(self):
+        """엔진 OrderSide(str Enum)도 문자열과 같은 체결가"""
+        broker = Broker("KR", TimeframeType.H1)
+        assert broker.calculate_fill_price(70_000, OrderSide.BUY) == broker.calculate_fill_price(
+            70_000, "BUY"
+        )
+        assert broker.calculate_fill_price(70_000, OrderSide.SELL) == pytest.approx(69_965.0)
+
 
 class TestBrokerQuantity:
     """수량 계산 + 포지션 한도 테스트"""
@@ -145,3 +154,32 @@ class TestBrokerValidation:
         valid, reason = broker.validate_order(10_000_000, 10_000_000, 70_000, 1)
         assert valid is False
         assert reason == "BELOW_MIN_ORDER"
+
+
+class TestBrokerVectorized:
+    """배열 버전 체결가/수수료가 스칼라 버전과 동일한지 검증"""
+
+    @pytest.mark.parametrize("market", ["KR", "US"])
+    def test_matches_scalar(self, market):
+        import numpy as np
+
+        broker = Broker(market, TimeframeType.D1)
+        opens = np.array([70_000.0, 185.25, 1.37, 52_100.0])
+        sides = ["BUY", "SELL", "BUY", "SELL"]
+        quantities = np.array([10, 3, 500, 1])
+
+        fills = broker.calculate_fill_prices(opens, sides)
+        commissions = broker.calculate_commissions(fills, quantities)
+
+        assert fills.tolist() == [
+            broker.calculate_fill_price(o, s) for o, s in zip(opens.tolist(), sides)
+        ]
+        assert commissions.tolist() == [
+            broker.calculate_commission(f, q) for f, q in zip(fills.tolist(), quantities.tolist())
+        ]
+
+    def test_empty(self):
+        import numpy as np
+
+        broker = Broker("KR", TimeframeType.D1)
+        assert broker.calculate_fill_prices(np.array([]), []).shape == (0,)
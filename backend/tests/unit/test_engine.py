@@ -1,10 +1,11 @@
 from typing import Dict, List
 
+import numpy as np
 import pandas as pd
 import pytest
 
 from app.db.models import TimeframeType
-from app.engine.backtest import BacktestEngine
+from app.engine.backtest import Bar, BacktestEngine
 from app.engine.broker import Broker
 from app.engine.order import OrderSide, PendingOrder
 from app.engine.portfolio import Portfolio
@@ -171,6 +172,115 @@ class TestBacktestEngineBasic:
         # 최종 equity는 초기 자본과 다를 것 (수수료/슬리피지 반영)
         assert result["final_equity"] != initial
 
+    def test_float32_prices_upcast(self):
+        """float32 가격(원화 캐시 데이터)도 float64와 동일한 체결/자산 결과"""
+        data64 = make_ohlcv([70_000, 71_000, 72_000])
+        data32 = {
+            sym: df.astype({c: "float32" for c in ("open", "high", "low", "close")})
+            for sym, df in data64.items()
+        }
+
+        results = []
+        for data in (data64, data32):
+            engine = BacktestEngine(
+                strategy=BuyThenSellStrategy({}),
+                data=data,
+                broker=Broker("KR", TimeframeType.D1),
+                initial_capital=10_000_000,
+            )
+            assert engine.data["005930"]["close"].dtype == "float64"
+            results.append(engine.run())
+
+        assert results[1]["final_equity"] == results[0]["final_equity"]
+        assert type(results[1]["final_equity"]) is type(results[0]["final_equity"])
+
+    def test_fp32_precision(self):
+        """fp32 행렬을 써도 체결가/현금은 Python float로 계산 (원화 정수 가격은 결과 동일)"""
+        data = make_ohlcv([70_000, 71_000, 72_000])
+        results = {}
+        for precision in ("fp64", "fp32"):
+            engine = BacktestEngine(
+                strategy=BuyThenSellStrategy({}),
+                data=data,
+                broker=Broker("KR", TimeframeType.D1),
+                initial_capital=10_000_000,
+                precision=precision,
+            )
+            results[precision] = engine.run()
+
+        assert engine._bars.close.dtype == np.float32
+        assert results["fp32"]["final_equity"] == results["fp64"]["final_equity"]
+        assert type(results["fp32"]["final_equity"]) is float
+        assert all(type(t.fill_price) is float for t in results["fp32"]["trades"])
+
+    def test_unknown_precision_rejected(self):
+        with pytest.raises(ValueError):
+            BacktestEngine(
+                strategy=BuyThenSellStrategy({}),
+                data=make_ohlcv([70_000, 71_000]),
+                broker=Broker("KR", TimeframeType.D1),
+                initial_capital=10_000_000,
+                precision="fp16",
+            )
+
+
+class TestBacktestEngineBars:
+    """전략에 전달되는 봉 데이터 검증"""
+
+    def test_bars_aligned_on_common_index(self):
+        """공통 봉만 전달되며 값은 각 종목 DataFrame의 해당 행과 일치"""
+        data = {
+            **make_ohlcv([(100, 110, 90, 105, 10), (106, 111, 101, 107, 20)], symbol="A"),
+            **make_ohlcv([200, 201, 202], symbol="B"),
+        }
+        seen = []
+
+        class Recorder(NoOpStrategy):
+            def on_bar(self, bars, portfolio):
+                seen.append({s: (b.name, b["open"], b.close, b["volume"]) for s, b in bars.items()})
+                return []
+
+        BacktestEngine(
+            strategy=Recorder({}),
+            data=data,
+            broker=Broker("KR", TimeframeType.D1),
+            initial_capital=1_000_000,
+        ).run()
+
+        # 공통 봉 2개 중 마지막 봉은 전략 호출 없음
+        assert seen == [
+            {
+                "A": (pd.Timestamp("2024-01-01"), 100.0, 105.0, 10.0),
+                "B": (pd.Timestamp("2024-01-01"), 200.0, 200.0, 1000.0),
+            }
+        ]
+
+    def test_signal_price_uses_own_previous_bar(self):
+        """시그널 가격은 종목 자신의 직전 봉 종가 (공통 봉에 없는 봉 포함)"""
+        data = make_ohlcv([100, 101, 102, 103], symbol="A")
+        data.update(make_ohlcv([200, 201, 202, 203], symbol="B"))
+        # B에서 2024-01-02 봉 제거 → 공통 봉은 01-01, 01-03, 01-04
+        data["B"] = data["B"].drop(pd.Timestamp("2024-01-02"))
+
+        engine = BacktestEngine(
+            strategy=BuyEveryBarStrategy({}),
+            data={"A": data["A"], "B": data["B"]},
+            broker=Broker("KR", TimeframeType.D1),
+            initial_capital=10_000_000,
+        )
+        trades = engine.run()["trades"]
+
+        a_first = next(t for t in trades if t.symbol == "A")
+        # 01-03 체결 → A의 직전 봉(01-02) 종가 101, 시그널 시각은 첫 종목 기준 01-02
+        assert a_first.fill_date == pd.Timestamp("2024-01-03")
+        assert a_first.signal_price == 101
+        assert a_first.signal_date == pd.Timestamp("2024-01-02")
+
+    def test_bar_unknown_key(self):
+        bar = Bar(pd.Timestamp("2024-01-01"), 1.0, 2.0, 0.5, 1.5, 100.0)
+        with pytest.raises(KeyError):
+            bar["vwap"]
+
 
 class TestBacktestEngineEdgeCases:
     """엣지 케이스"""
@@ -266,3 +376,99 @@ class TestBacktestEngineProgress:
         # 증가하는 순서
         for i in range(1, len(progress_values)):
             assert progress_values[i] >= progress_values[i - 1]
+
+    def test_progress_callback_throttled(self):
+        """봉이 많아도 퍼센트 값이 바뀔 때만 호출 (중복 값 없음)"""
+        data = make_ohlcv([70_000 + i for i in range(1_000)])
+        progress_values = []
+
+        engine = BacktestEngine(
+            strategy=NoOpStrategy({}),
+            data=data,
+            broker=Broker("KR", TimeframeType.D1),
+            initial_capital=10_000_000,
+            on_progress=lambda pct: progress_values.append(pct),
+        )
+        engine.run()
+
+        assert len(progress_values) <= 101
+        assert len(progress_values) == len(set(progress_values))
+        assert progress_values[-1] == 100
+
+
+class TestBacktestEngineVectorized:
+    """generate_signals를 구현한 전략의 커널 경로 == 이벤트 루프 경로"""
+
+    @staticmethod
+    def _random_walk(n: int, seed: int, market: str = "KR") -> pd.DataFrame:
+        rng = np.random.default_rng(seed)
+        # KR은 원 단위 정수 가격, US는 센트 단위 소수 가격
+        base, decimals = (70_000, 0) if market == "KR" else (60.0, 2)
+        close = np.round(base * np.exp(np.cumsum(rng.normal(0, 0.02, n))), decimals)
+        open_ = np.round(close * (1 + rng.normal(0, 0.003, n)), decimals)
+        if market == "US":
+            # 거래 정지 등으로 가격이 멈춘 구간 (소수 가격이라 np.std가 정확히 0이 아닐 수 있음)
+            close[150:190] = open_[150:190] = 59.7
+        df = pd.DataFrame(
+            {
+                "open": open_,
+                "high": np.maximum(open_, close) * 1.01,
+                "low": np.minimum(open_, close) * 0.99,
+                "close": close,
+                "volume": 1000,
+            }
+        )
+        df.index = pd.date_range("2020-01-01", periods=n, freq="B")
+        return df
+
+    def _run(self, strategy_cls, params, data, vectorized: bool, market: str = "KR"):
+        class EventOnly(strategy_cls):
+            def generate_signals(self, bars):
+                return None
+
+        cls = strategy_cls if vectorized else EventOnly
+        engine = BacktestEngine(
+            strategy=cls(params),
+            data=data,
+            broker=Broker(market, TimeframeType.D1),
+            initial_capital=100_000_000,
+        )
+        return engine, engine.run()
+
+    @pytest.mark.parametrize(
+        "strategy_name, params, market",
+        [
+            (
+                "mean_reversion",
+                {"lookback_period": 10, "entry_threshold": 1.5, "exit_threshold": 0.3},
+                "KR",
+            ),
+            ("bollinger_bands", {"bb_period": 10, "bb_std": 1.5}, "KR"),
+            # 가격이 멈춘 소수 구간: np.std 반올림 오차로 |z|=1이 나와도 진입하지 않아야 함
+            (
+                "mean_reversion",
+                {"lookback_period": 20, "entry_threshold": 0.5, "exit_threshold": 0.3},
+                "US",
+            ),
+            ("bollinger_bands", {"bb_period": 20, "bb_std": 0.5}, "US"),
+        ],
+    )
+    def test_matches_event_loop(self, strategy_name, params, market):
+        from app.strategies import get_strategy_cls
+
+        strategy_cls = get_strategy_cls(strategy_name)
+        data = {f"S{k}": self._random_walk(400, seed=k, market=market) for k in range(3)}
+        vec_engine, vec = self._run(strategy_cls, params, data, vectorized=True, market=market)
+        evt_engine, evt = self._run(strategy_cls, params, data, vectorized=False, market=market)
+
+        def key(t):
+            return (t.symbol, t.side, t.quantity, t.fill_price, t.commission, t.signal_date)
+
+        assert len(evt["trades"]) > 0
+        assert [key(t) for t in vec["trades"]] == [key(t) for t in evt["trades"]]
+        np.testing.assert_allclose(
+            vec["equity_curve"]["equity"], evt["equity_curve"]["equity"], rtol=1e-12
+        )
+        assert list(vec["equity_curve"].columns) == list(evt["equity_curve"].columns)
+        assert vec["final_equity"] == pytest.approx(evt["final_equity"])
+        assert vec_engine.portfolio.positions.keys() == evt_engine.portfolio.positions.keys()
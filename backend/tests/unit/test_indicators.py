@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pandas_ta as ta
+import pytest
+
+from app.strategies.indicators import EMA, RSI, RollingStats
+
+
+class TestRollingStats:
+    def test_not_full_until_length(self):
+        stats = RollingStats(3)
+        stats.push(1.0)
+        stats.push(2.0)
+        assert not stats.full
+        stats.push(3.0)
+        assert stats.full
+        assert len(stats) == 3
+
+    @pytest.mark.parametrize("ddof", [0, 1])
+    def test_matches_numpy_over_long_series(self, ddof):
+        """윈도우가 여러 번 돌아도 numpy 전체 재계산과 같은 값"""
+        rng = np.random.default_rng(0)
+        prices = 70_000 * np.exp(np.cumsum(rng.normal(0, 0.02, 2_000)))
+        stats = RollingStats(20)
+        for i, price in enumerate(prices):
+            stats.push(float(price))
+            if stats.full:
+                window = prices[i - 19 : i + 1]
+                mean, std = stats.mean_std(ddof=ddof)
+                assert mean == pytest.approx(window.mean(), rel=1e-12)
+                assert std == pytest.approx(window.std(ddof=ddof), rel=1e-9)
+
+    def test_constant_window_is_exact(self):
+        """가격이 모두 같은 윈도우 → 표준편차 정확히 0, 평균은 그 가격"""
+        stats = RollingStats(5)
+        for price in [101.37, 99.12, 100.05] + [100.01] * 5:
+            stats.push(price)
+        assert stats.mean_std(ddof=1) == (100.01, 0.0)
+        assert stats.mean_std() == (100.01, 0.0)
+
+
+class TestEMA:
+    def test_none_until_seeded_with_sma(self):
+        ema = EMA(3)
+        assert ema.push(1.0) is None
+        assert ema.push(2.0) is None
+        assert ema.push(3.0) == pytest.approx(2.0)
+        # alpha = 2 / (3 + 1) = 0.5
+        assert ema.push(6.0) == pytest.approx(4.0)
+
+    def test_matches_pandas_ta(self):
+        rng = np.random.default_rng(1)
+        prices = 70_000 * np.exp(np.cumsum(rng.normal(0, 0.02, 500)))
+        expected = ta.ema(pd.Series(prices), length=12).to_numpy()
+
+        ema = EMA(12)
+        actual = [ema.push(float(p)) for p in prices]
+
+        assert actual[:11] == [None] * 11
+        np.testing.assert_allclose(actual[11:], expected[11:], rtol=1e-12)
+
+
+class TestRSI:
+    def test_none_until_length_plus_one_prices(self):
+        rsi = RSI(3)
+        assert [rsi.push(p) for p in [10.0, 9.0, 8.0]] == [None, None, None]
+        assert rsi.push(7.0) == 0.0
+
+    def test_none_when_prices_flat(self):
+        rsi = RSI(3)
+        assert [rsi.push(10.0) for _ in range(6)] == [None] * 6
+
+    def test_matches_pandas_ta(self):
+        rng = np.random.default_rng(2)
+        prices = 70_000 * np.exp(np.cumsum(rng.normal(0, 0.02, 500)))
+        expected = ta.rsi(pd.Series(prices), length=14).to_numpy()
+
+        rsi = RSI(14)
+        actual = [rsi.push(float(p)) for p in prices]
+
+        assert actual[:14] == [None] * 14
+        np.testing.assert_allclose(actual[14:], expected[14:], rtol=1e-12)
+
+
+class TestPandasTaEquivalence:
+    """전략이 쓰는 지표 조합이 5,000봉 전체에서 pandas-ta 전체 재계산과 일치"""
+
+    @pytest.fixture
+    def prices(self):
+        rng = np.random.default_rng(3)
+        return 70_000 * np.exp(np.cumsum(rng.normal(0, 0.02, 5_000)))
+
+    def test_macd(self, prices):
+        expected = ta.macd(pd.Series(prices), fast=12, slow=26, signal=9)
+        fast, slow, signal = EMA(12), EMA(26), EMA(9)
+        macd, signal_line = [], []
+        for p in prices:
+            fast_val = fast.push(float(p))
+            slow_val = slow.push(float(p))
+            if slow_val is None:
+                continue
+            macd.append(fast_val - slow_val)
+            signal_line.append(signal.push(macd[-1]))
+
+        np.testing.assert_allclose(macd, expected.iloc[25:, 0], rtol=1e-12)
+        np.testing.assert_allclose(signal_line[8:], expected.iloc[33:, 2], rtol=1e-12)
+
+    def test_bbands(self, prices):
+        # 볼린저 전략과 같은 표본 표준편차(ddof=1) 밴드
+        expected = ta.bbands(pd.Series(prices), length=20, lower_std=2.0, upper_std=2.0)
+        stats = RollingStats(20)
+        lower, mid, upper = [], [], []
+        for p in prices:
+            stats.push(float(p))
+            if stats.full:
+                mean, std = stats.mean_std(ddof=1)
+                lower.append(mean - 2.0 * std)
+                mid.append(mean)
+                upper.append(mean + 2.0 * std)
+
+        np.testing.assert_allclose(lower, expected.iloc[19:, 0], rtol=1e-9)
+        np.testing.assert_allclose(mid, expected.iloc[19:, 1], rtol=1e-12)
+        np.testing.assert_allclose(upper, expected.iloc[19:, 2], rtol=1e-9)
@@ -153,6 +153,18 @@ class TestMomentumMultiSymbol:
         assert orders[0].side == OrderSide.BUY
 
 
+class TestMomentumHistoryBounded:
+    """이력은 이동평균 기간만큼만 보관"""
+
+    def test_history_capped_at_ma_periods(self, portfolio):
+        strategy = MomentumBreakoutStrategy({"ma_period": 5, "volume_ma_period": 3})
+        feed_bars(strategy, portfolio, "005930", [10000.0 + i for i in range(50)], [1000] * 50)
+
+        state = strategy._get_state("005930")
+        assert list(state["price_history"]) == [10045.0, 10046.0, 10047.0, 10048.0, 10049.0]
+        assert len(state["volume_history"]) == 3
+
+
 class TestMomentumCustomParameters:
     """커스텀 파라미터 동작 검증"""
 
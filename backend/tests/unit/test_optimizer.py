@@ -158,3 +158,172 @@ class TestTopNSelection:
 
         assert len(progress_values) > 0
         assert progress_values[-1] == 100
+
+    def test_aligned_bars_built_once(self):
+        """조합 수와 관계없이 데이터 정렬(AlignedBars)은 한 번만 수행"""
+        from unittest.mock import patch
+
+        import numpy as np
+        import pandas as pd
+
+        from app.engine.backtest import AlignedBars
+
+        dates = pd.date_range("2023-01-01", periods=50, freq="B")
+        prices = 100 + np.cumsum(np.random.randn(50) * 0.5)
+        df = pd.DataFrame(
+            {
+                "open": prices,
+                "high": prices + 1,
+                "low": prices - 1,
+                "close": prices,
+                "volume": np.random.randint(1000, 10000, 50),
+            },
+            index=dates,
+        )
+        combos = [
+            {
+                "lookback_period": n,
+                "entry_threshold": 2.0,
+                "exit_threshold": 0.5,
+                "position_weight": 0.3,
+            }
+            for n in (10, 15, 20)
+        ]
+
+        with patch.object(
+            AlignedBars, "from_frames", wraps=AlignedBars.from_frames
+        ) as from_frames:
+            results = run_grid_search(
+                strategy_name="mean_reversion",
+                combinations=combos,
+                data={"TEST": df},
+                market="KR",
+                timeframe="1d",
+                initial_capital=10_000_000,
+            )
+
+        assert from_frames.call_count == 1
+        assert len(results) == 3
+
+    def test_unknown_strategy_fails_fast(self):
+        """전략 이름은 루프 전에 한 번만 조회 → 알 수 없는 이름은 즉시 ValueError"""
+        import pandas as pd
+
+        prices = [1.0, 2.0]
+        df = pd.DataFrame(
+            {"open": prices, "high": prices, "low": prices, "close": prices, "volume": [1, 1]},
+            index=pd.date_range("2023-01-01", periods=2, freq="B"),
+        )
+        with pytest.raises(ValueError, match="Unknown strategy"):
+            run_grid_search(
+                strategy_name="nope",
+                combinations=[{}, {}],
+                data={"TEST": df},
+                market="KR",
+                timeframe="1d",
+                initial_capital=10_000_000,
+            )
+
+
+class TestParallelGridSearch:
+    @staticmethod
+    def _data():
+        import numpy as np
+        import pandas as pd
+
+        rng = np.random.default_rng(7)
+        dates = pd.date_range("2023-01-01", periods=120, freq="B")
+        data = {}
+        for symbol in ("A", "B"):
+            prices = 100 + np.cumsum(rng.normal(0, 1, 120))
+            data[symbol] = pd.DataFrame(
+                {
+                    "open": prices,
+                    "high": prices + 1,
+                    "low": prices - 1,
+                    "close": prices,
+                    "volume": rng.integers(1000, 10000, 120),
+                },
+                index=dates,
+            )
+        return data
+
+    def test_matches_serial(self):
+        from app.optimizer.parallel import run_grid_search_parallel
+
+        combos = generate_combinations(
+            {"lookback_period": {"min": 10, "max": 30, "step": 5}}
+        )
+        kwargs = dict(
+            strategy_name="mean_reversion",
+            combinations=combos,
+            data=self._data(),
+            market="KR",
+            timeframe="1d",
+            initial_capital=10_000_000,
+            top_n=5,
+        )
+        progress = []
+
+        serial = run_grid_search(**kwargs)
+        parallel = run_grid_search_parallel(
+            **kwargs, n_workers=2, on_progress=progress.append
+        )
+
+        assert [r["parameters"] for r in parallel] == [r["parameters"] for r in serial]
+        assert [r["final_equity"] for r in parallel] == pytest.approx(
+            [r["final_equity"] for r in serial]
+        )
+        assert progress[-1] == 100
+
+    def test_single_worker_uses_serial_path(self):
+        from unittest.mock import patch
+
+        from app.optimizer import parallel
+
+        with patch.object(parallel, "run_grid_search", return_value=[]) as serial:
+            parallel.run_grid_search_parallel(
+                strategy_name="mean_reversion",
+                combinations=[{}],
+                data=self._data(),
+                market="KR",
+                timeframe="1d",
+                initial_capital=10_000_000,
+                n_workers=4,
+            )
+
+        serial.assert_called_once()
+
+    def test_runs_inside_daemonic_process(self):
+        """Celery prefork 자식처럼 daemonic 프로세스 안에서도 풀을 띄워 직렬과 같은 결과"""
+        import billiard
+
+        from app.optimizer.parallel import run_grid_search_parallel
+
+        kwargs = dict(
+            strategy_name="mean_reversion",
+            combinations=generate_combinations(
+                {"lookback_period": {"min": 10, "max": 20, "step": 5}}
+            ),
+            data=self._data(),
+            market="KR",
+            timeframe="1d",
+            initial_capital=10_000_000,
+            top_n=3,
+        )
+        serial = run_grid_search(**kwargs)
+        queue = billiard.Queue()
+
+        def child():
+            try:
+                results = run_grid_search_parallel(**kwargs, n_workers=2)
+                queue.put([r["parameters"] for r in results])
+            except Exception as e:
+                queue.put(repr(e))
+
+        proc = billiard.Process(target=child, daemon=True)
+        proc.start()
+        outcome = queue.get(timeout=60)
+        proc.join(timeout=10)
+
+        assert outcome == [r["parameters"] for r in serial]
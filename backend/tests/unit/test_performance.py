@@ -4,8 +4,17 @@ import numpy as np
 import pandas as pd
 import pytest
 
-from app.analytics.performance import PerformanceMetrics
+from app.analytics.performance import (
+    PerformanceMetrics,
+    _max_drawdown_array,
+    _max_streak_loop,
+    _max_streak_vectorized,
+    _metrics_kernel,
+    _sharpe_from_returns,
+    _sortino_from_returns,
+)
 from app.analytics.risk import RiskMetrics
+from app.utils.njit import NUMBA_AVAILABLE
 
 
 # ── Fixtures ──
@@ -128,6 +137,14 @@ class TestSortinoRatio:
         # 하방 변동성 존재하고 전체적으로 상승 → 양수
         assert sortino > 0
 
+    def test_known_sortino(self):
+        # 하방 편차 = sqrt(mean(min(r, 0)^2)), 전체 수익률 개수로 나눔
+        eq = pd.Series([100.0, 101.0, 102.0, 101.5, 103.0])
+        returns = eq.pct_change().fillna(0).to_numpy()
+        down_dev = np.sqrt(np.mean(np.minimum(returns, 0) ** 2))
+        expected = np.sqrt(252) * (returns.mean() - 0.02 / 252) / down_dev
+        assert pytest.approx(PerformanceMetrics.sortino_ratio(eq), rel=1e-9) == expected
+
     def test_no_downside_returns_zero(self):
         # 모든 수익률이 양수 또는 0
         eq = pd.Series([100.0, 100.0, 101.0, 102.0])
@@ -155,6 +172,60 @@ class TestMaxDrawdown:
         assert pytest.approx(PerformanceMetrics.max_drawdown(eq), rel=1e-6) == 0.25
 
 
+# ── summary ──
+
+
+class TestSummary:
+    def test_matches_individual_metrics(self):
+        eq = pd.Series([100, 105, 102, 108, 103, 110, 96, 115], dtype=float)
+        summary = PerformanceMetrics.summary(eq, trading_days=245)
+        assert pytest.approx(summary["total_return"]) == PerformanceMetrics.total_return(eq)
+        assert pytest.approx(summary["annual_return"]) == PerformanceMetrics.annual_return(eq, 245)
+        assert pytest.approx(summary["sharpe_ratio"]) == PerformanceMetrics.sharpe_ratio(
+            eq, trading_days=245
+        )
+        assert pytest.approx(summary["sortino_ratio"]) == PerformanceMetrics.sortino_ratio(
+            eq, trading_days=245
+        )
+        assert pytest.approx(summary["max_drawdown"]) == PerformanceMetrics.max_drawdown(eq)
+
+    def test_returns_array_matches_series(self, simple_equity):
+        expected = PerformanceMetrics.calculate_returns(simple_equity).to_numpy()
+        result = PerformanceMetrics.calculate_returns_array(simple_equity)
+        np.testing.assert_allclose(result, expected)
+
+    def test_kernel_matches_numpy(self):
+        # 단일 패스 커널의 누적 통계가 NumPy 벡터 연산 결과와 동일
+        rng = np.random.default_rng(1)
+        eq = 100 * np.cumprod(1 + rng.normal(0.0005, 0.02, 500))
+        n, mean, m2, down_sq, max_dd = _metrics_kernel(eq)
+        returns = PerformanceMetrics.calculate_returns_array(eq)
+
+        assert n == len(eq)
+        assert pytest.approx(mean, rel=1e-9) == returns.mean()
+        assert pytest.approx(np.sqrt(m2 / (n - 1)), rel=1e-9) == returns.std(ddof=1)
+        assert pytest.approx(down_sq, rel=1e-9) == (returns[returns < 0] ** 2).sum()
+        assert pytest.approx(max_dd, rel=1e-9) == _max_drawdown_array(eq)
+
+        summary = PerformanceMetrics.summary(pd.Series(eq))
+        assert pytest.approx(summary["sharpe_ratio"], rel=1e-9) == _sharpe_from_returns(
+            returns, 0.02, 252
+        )
+        assert pytest.approx(summary["sortino_ratio"], rel=1e-9) == _sortino_from_returns(
+            returns, 0.02, 252
+        )
+
+    @pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba 미설치")
+    def test_kernel_compiled_at_import_accepts_readonly(self):
+        # import 시 시그니처로 미리 컴파일되고, 읽기 전용 배열도 추가 컴파일 없이 처리
+        assert len(_metrics_kernel.signatures) == 1
+        eq = np.linspace(100.0, 110.0, 11)
+        readonly = eq.copy()
+        readonly.flags.writeable = False
+        assert _metrics_kernel(readonly) == _metrics_kernel(eq)
+        assert len(_metrics_kernel.signatures) == 1
+
+
 # ── win_rate ──
 
 
@@ -225,6 +296,48 @@ class TestMaxConsecutive:
         assert PerformanceMetrics.max_consecutive(trades_empty, win=True) == 0
         assert PerformanceMetrics.max_consecutive(trades_empty, win=False) == 0
 
+    def test_vectorized_matches_loop(self):
+        # numba 미설치 시 사용하는 run-length 구현이 루프 구현과 동일한 결과
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            arr = rng.random(rng.integers(0, 50)) > 0.4
+            assert _max_streak_vectorized(arr) == _max_streak_loop(arr)
+
+
+# ── trade_stats ──
+
+
+class TestTradeStats:
+    def test_matches_individual_metrics(self, trades_mixed):
+        stats = PerformanceMetrics.trade_stats(trades_mixed)
+        assert pytest.approx(stats["win_rate"]) == PerformanceMetrics.win_rate(trades_mixed)
+        assert pytest.approx(stats["profit_factor"]) == PerformanceMetrics.profit_factor(
+            trades_mixed
+        )
+        assert stats["max_consecutive_wins"] == 3
+        assert stats["max_consecutive_losses"] == 2
+        # 승: 100, 200, 50, 80 / 패: -30, -10
+        assert pytest.approx(stats["avg_win"]) == 430 / 4
+        assert pytest.approx(stats["avg_loss"]) == -40 / 2
+
+    def test_accepts_pnl_array(self, trades_mixed):
+        # DataFrame 없이 pnl 배열을 바로 넘겨도 같은 결과
+        pnl = trades_mixed["pnl"].to_numpy()
+        assert PerformanceMetrics.trade_stats(pnl) == PerformanceMetrics.trade_stats(trades_mixed)
+        assert PerformanceMetrics.trade_stats(np.empty(0))["win_rate"] == 0
+
+    def test_all_wins(self, trades_all_win):
+        stats = PerformanceMetrics.trade_stats(trades_all_win)
+        assert stats["profit_factor"] == float("inf")
+        assert stats["avg_loss"] is None
+
+    def test_empty_trades(self, trades_empty):
+        stats = PerformanceMetrics.trade_stats(trades_empty)
+        assert stats["win_rate"] == 0
+        assert stats["profit_factor"] == 0
+        assert stats["avg_win"] is None
+        assert stats["max_consecutive_wins"] == 0
+
 
 # ── RiskMetrics: calmar_ratio ──
 
@@ -263,6 +376,14 @@ class TestValueAtRisk:
         expected = abs(np.percentile(calc_returns, 5))
         assert pytest.approx(var, rel=1e-6) == expected
 
+    @pytest.mark.parametrize("confidence", [0.9, 0.95, 0.99, 0.999])
+    def test_var_matches_percentile(self, confidence):
+        rng = np.random.default_rng(7)
+        equity = pd.Series(100 * np.cumprod(1 + rng.normal(0, 0.01, 257)))
+        returns = PerformanceMetrics.calculate_returns_array(equity)
+        expected = abs(np.percentile(returns, (1 - confidence) * 100))
+        assert pytest.approx(RiskMetrics.value_at_risk(equity, confidence), rel=1e-12) == expected
+
     def test_var_no_volatility(self):
         eq = pd.Series([100.0] * 10)
         assert RiskMetrics.value_at_risk(eq) == 0
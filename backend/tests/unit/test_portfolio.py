@@ -122,3 +122,27 @@ class TestPortfolio:
         pos = pf.get_position("005930")
         assert pos.quantity == 20
         assert pos.avg_price == pytest.approx(71_000)
+
+    def test_equity_tracks_incremental_updates(self):
+        """시가평가를 여러 번 갱신해도 평가액 합계가 포지션 합계와 일치"""
+        pf = Portfolio(10_000_000)
+        pf.execute_buy("005930", 10, 70_000, 105)
+        pf.execute_buy("000660", 5, 120_000, 90)
+
+        for price_a, price_b in [(71_000, 119_000), (69_500, 125_000), (70_250, 118_500)]:
+            pf.update_market_prices({"005930": price_a, "000660": price_b, "035720": 50_000})
+            expected = pf.cash + sum(p.market_value for p in pf.positions.values())
+            assert pf.equity == pytest.approx(expected)
+
+        pf.execute_sell("005930", 10, 70_000, 105)
+        assert pf.equity == pytest.approx(pf.cash + 5 * 118_500)
+        pf.execute_sell("000660", 5, 118_000, 90)
+        assert pf.equity == pf.cash
+
+    def test_mark_to_market_row(self):
+        """종가 행 + 종목 인덱스로 갱신한 결과가 딕셔너리 갱신과 동일"""
+        pf = Portfolio(10_000_000)
+        pf.execute_buy("005930", 10, 70_000, 105)
+        pf.mark_to_market([50_000.0, 75_000.0], {"035720": 0, "005930": 1})
+        assert pf.get_position("005930").current_price == 75_000
+        assert pf.equity == pytest.approx(10_049_895)
@@ -0,0 +1,36 @@
+import asyncio
+import time
+
+import pytest
+
+from app.utils.rate_limiter import AsyncRateLimiter
+
+
+class TestAsyncRateLimiter:
+    @pytest.mark.asyncio
+    async def test_within_limit_no_wait(self):
+        limiter = AsyncRateLimiter(5, period=1.0)
+        started = time.monotonic()
+        for _ in range(5):
+            async with limiter:
+                pass
+        assert time.monotonic() - started < 0.1
+
+    @pytest.mark.asyncio
+    async def test_burst_is_spread_over_period(self):
+        # 0.2초당 5회 → 동시 12회는 최소 2개 구간(0.4초)을 기다려야 함
+        limiter = AsyncRateLimiter(5, period=0.2)
+        passed = []
+
+        async def worker():
+            async with limiter:
+                passed.append(time.monotonic())
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker() for _ in range(12)))
+
+        assert len(passed) == 12
+        assert passed[-1] - started >= 0.4
+        # 어떤 0.2초 구간에도 5회를 넘지 않음
+        for i in range(len(passed) - 5):
+            assert passed[i + 5] - passed[i] >= 0.2 - 1e-3
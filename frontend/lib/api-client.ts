@@ -138,7 +138,7 @@ export async function createComparison(data: CompareCreate): Promise<JobResponse
 }
 
 export async function getComparison(id: string): Promise<CompareResponse> {
-  return request<CompareResponse>(`/api/backtest/compare/${id}`);
+  return request<CompareResponse>(`/api/backtest/compare/${id}?include=equity_curve`);
 }
 
 export async function getComparisonStatus(id: string): Promise<JobStatusResponse> {